@@ -2,7 +2,8 @@ from flask import request, jsonify, make_response
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
 
-from sqlalchemy import or_, func
+from sqlalchemy import func
+from utils.search import apply_search
 from utils.auth import role_required
 from executors.extensions import db
 from executors.models import (
@@ -68,15 +69,7 @@ def get_def_access_models():
 
         # Case 2: Search by model_name
         if model_name:
-            search_underscore = model_name.replace(' ', '_')
-            search_space = model_name.replace('_', ' ')
-            query = query.filter(
-                or_(
-                    DefAccessModel.model_name.ilike(f'%{model_name}%'),
-                    DefAccessModel.model_name.ilike(f'%{search_underscore}%'),
-                    DefAccessModel.model_name.ilike(f'%{search_space}%')
-                )
-            )
+            query = apply_search(query, model_name, DefAccessModel.model_name)
 
         # Order by ID descending
         query = query.order_by(DefAccessModel.def_access_model_id.desc())
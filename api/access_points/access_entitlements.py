@@ -2,7 +2,7 @@ from flask import request, jsonify, make_response
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
 
-from sqlalchemy import or_
+from utils.search import apply_search
 from utils.auth import role_required
 from executors.extensions import db
 from executors.models import (
@@ -34,16 +34,7 @@ def get_access_entitlements():
 
         # Case 2: Search
         if entitlement_name:
-            search_query = entitlement_name.strip()
-            search_underscore = search_query.replace(' ', '_')
-            search_space = search_query.replace('_', ' ')
-            query = query.filter(
-                or_(
-                    DefAccessEntitlement.entitlement_name.ilike(f'%{search_query}%'),
-                    DefAccessEntitlement.entitlement_name.ilike(f'%{search_underscore}%'),
-                    DefAccessEntitlement.entitlement_name.ilike(f'%{search_space}%')
-                )
-            )
+            query = apply_search(query, entitlement_name, DefAccessEntitlement.entitlement_name)
 
         # Case 3: Pagination (Search or just List)
         if page and limit:
@@ -4,6 +4,9 @@ from datetime import datetime
 
 from sqlalchemy import or_, func
 from utils.auth import role_required
+from utils.projection import requested_fields, project, projected_json
+from utils.pagination import paginate_rows
+from utils.rows import RowSerializer
 from executors.extensions import db
 from executors.models import (
     DefAccessPoint,
@@ -13,6 +16,9 @@ from executors.models import (
 )
 from . import access_points_bp
 
+# def_access_points_v rows straight to dicts (no ORM instances) for the read-only view listing
+ACCESS_POINTS_VIEW_ROWS = RowSerializer(DefAccessPointsV)
+
 
 #def_access_points
 
@@ -86,7 +92,8 @@ def get_access_points():
         page = request.args.get("page", type=int)
         limit = request.args.get("limit", type=int)
 
-        query = DefAccessPoint.query
+        fields = requested_fields(DefAccessPoint)
+        query = project(DefAccessPoint.query, DefAccessPoint, fields)
 
         # Filter by access_point_name if provided
         if access_point_name:
@@ -99,14 +106,14 @@ def get_access_points():
                 return make_response(jsonify({
                     "message": "Access point not found"
                 }), 404)
-            return jsonify(access_point.json())
+            return jsonify(projected_json(access_point, fields))
 
         if page and limit:
             pagination = query.order_by(DefAccessPoint.creation_date.desc()).paginate(
                 page=page, per_page=limit, error_out=False
             )
             access_points = pagination.items
-            results = [ap.json() for ap in access_points]
+            results = [projected_json(ap, fields) for ap in access_points]
             return jsonify({
                 "items": results,
                 "page": pagination.page,
@@ -115,9 +122,11 @@ def get_access_points():
             })
         else:
             access_points = query.order_by(DefAccessPoint.creation_date.desc()).all()
-            results = [ap.json() for ap in access_points]
+            results = [projected_json(ap, fields) for ap in access_points]
             return jsonify(results)
 
+    except ValueError as e:
+        return make_response(jsonify({"message": "Invalid fields", "error": str(e)}), 400)
     except Exception as e:
         return make_response(jsonify({"message": "Error fetching access points", "error": str(e)}), 500)
 
@@ -133,40 +142,39 @@ def get_access_point_view():
         page = request.args.get("page", type=int)
         limit = request.args.get("limit", type=int)
 
-        query = DefAccessPointsV.query
+        fields = requested_fields(DefAccessPointsV)
+        query = ACCESS_POINTS_VIEW_ROWS.select(fields)
 
         
         if access_point_name:
-            query = query.filter(DefAccessPointsV.access_point_name.ilike(f"%{access_point_name}%"))
+            query = query.where(DefAccessPointsV.access_point_name.ilike(f"%{access_point_name}%"))
 
         if unlinked and unlinked.lower() == "true":
-            query = query.filter(DefAccessPointsV.def_entitlement_id.is_(None))
+            query = query.where(DefAccessPointsV.def_entitlement_id.is_(None))
 
         # Fetch single access point
         if def_access_point_id:
-            access_point = query.filter_by(def_access_point_id=def_access_point_id).first()
+            stmt = query.where(DefAccessPointsV.def_access_point_id == def_access_point_id).limit(1)
+            access_point = ACCESS_POINTS_VIEW_ROWS.dicts(db.session.execute(stmt), fields)
             if not access_point:
                 return make_response(jsonify({
                     "message": "Access point not found"
                 }), 404)
-            return jsonify(access_point.json())
+            return jsonify(access_point[0])
 
 
         if def_entitlement_id:
-            entitlement = query.filter_by(def_entitlement_id=def_entitlement_id).all()
-            if not entitlement:
+            stmt = query.where(DefAccessPointsV.def_entitlement_id == def_entitlement_id)
+            results = ACCESS_POINTS_VIEW_ROWS.dicts(db.session.execute(stmt), fields)
+            if not results:
                 return make_response(jsonify({
                     "message":  "No access point found"
                 }), 404)
-            results = [ent.json() for ent in entitlement]
             return jsonify(results)
 
         if page and limit:
-            pagination = query.order_by(DefAccessPointsV.creation_date.desc()).paginate(
-                page=page, per_page=limit, error_out=False
-            )
-            access_points = pagination.items
-            results = [ap.json() for ap in access_points]
+            pagination = paginate_rows(query.order_by(DefAccessPointsV.creation_date.desc()), page, limit)
+            results = ACCESS_POINTS_VIEW_ROWS.dicts(pagination.items, fields)
             return jsonify({
                 "items": results,
                 "page": pagination.page,
@@ -174,10 +182,12 @@ def get_access_point_view():
                 "total": pagination.total
             })
         else:
-            access_points = query.order_by(DefAccessPointsV.creation_date.desc()).all()
-            results = [ap.json() for ap in access_points]
+            stmt = query.order_by(DefAccessPointsV.creation_date.desc())
+            results = ACCESS_POINTS_VIEW_ROWS.dicts(db.session.execute(stmt), fields)
             return jsonify(results)
 
+    except ValueError as e:
+        return make_response(jsonify({"message": "Invalid fields", "error": str(e)}), 400)
     except Exception as e:
         return make_response(jsonify({"message": "Error fetching access points", "error": str(e)}), 500)
     
@@ -1,7 +1,10 @@
 from flask import request, jsonify, make_response
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
-from sqlalchemy import or_, func
+from sqlalchemy import func
+from utils.search import apply_search
+from utils.pagination import paginate_rows
+from utils.rows import RowSerializer
 
 from utils.auth import role_required
 from executors.extensions import db
@@ -14,6 +17,9 @@ from executors.models import (
 )
 from . import action_items_bp
 
+# def_action_items_v rows straight to dicts (no ORM instances) for the read-only listing
+ACTION_ITEMS_VIEW_ROWS = RowSerializer(DefActionItemsV, isoformat=("creation_date", "last_update_date"))
+
 
 # Create a DefActionItem
 
@@ -43,47 +49,40 @@ def get_action_items():
         # 2. List Items (User View or Admin/General View)
         if user_id:
             # User View: Filter by user_id and notification_status='sent'
-            query = DefActionItemsV.query.filter_by(user_id=user_id).filter(
+            query = ACTION_ITEMS_VIEW_ROWS.select().where(
+                DefActionItemsV.user_id == user_id,
                 func.lower(func.trim(DefActionItemsV.notification_status)) == "sent"
             )
             
             # Additional filters for User View
             if status:
-                query = query.filter(
+                query = query.where(
                     func.lower(func.trim(DefActionItemsV.status)) == func.lower(func.trim(status))
                 )
 
             if action_item_name:
-                search_underscore = action_item_name.replace(' ', '_')
-                search_space = action_item_name.replace('_', ' ')
-                query = query.filter(
-                    or_(
-                        DefActionItemsV.action_item_name.ilike(f'%{action_item_name}%'),
-                        DefActionItemsV.action_item_name.ilike(f'%{search_underscore}%'),
-                        DefActionItemsV.action_item_name.ilike(f'%{search_space}%')
-                    )
-                )
+                query = apply_search(query, action_item_name, DefActionItemsV.action_item_name)
             
             query = query.order_by(DefActionItemsV.action_item_id.desc())
             
         else:
             # General View (Admin or all items)
-            query = DefActionItemsV.query.order_by(DefActionItemsV.action_item_id.desc())
+            query = ACTION_ITEMS_VIEW_ROWS.select().order_by(DefActionItemsV.action_item_id.desc())
 
         # 3. Pagination
         if page and limit:
-            paginated = query.paginate(page=page, per_page=limit, error_out=False)
+            paginated = paginate_rows(query, page, limit)
             return make_response(jsonify({
-                "result": [item.json() for item in paginated.items],
+                "result": ACTION_ITEMS_VIEW_ROWS.dicts(paginated.items),
                 "total": paginated.total,
                 "pages": paginated.pages,
                 "page": paginated.page
             }), 200)
 
         # 4. Return All (No Pagination)
-        items = query.all()
+        items = ACTION_ITEMS_VIEW_ROWS.dicts(db.session.execute(query))
         return make_response(jsonify({
-            "result": [item.json() for item in items]
+            "result": items
         }), 200)
 
     except Exception as e:
@@ -7,4 +7,6 @@ from .task_parametes import *
 from .task_schedules import *
 from .task import *
 from .view_requests import *
+from .executor_stats import *
 
+from .workflows import *
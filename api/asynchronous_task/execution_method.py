@@ -2,10 +2,12 @@ from flask import request, jsonify, make_response
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
 
-from sqlalchemy import or_
+from utils.search import apply_search
 from utils.auth import role_required
+from utils.response_cache import cached_response, invalidate_responses
 from executors.extensions import db
 from executors.models import DefAsyncExecutionMethods
+from executors.routing import invalidate as invalidate_routes, route_error
 
 
 
@@ -22,10 +24,15 @@ def Create_ExecutionMethod():
         internal_execution_method = request.json.get('internal_execution_method')
         executor = request.json.get('executor')
         description = request.json.get('description')
+        queue = request.json.get('queue')
+        priority = request.json.get('priority')
 
         # Validate required fields
         if not execution_method or not internal_execution_method:
             return jsonify({"error": "Missing required fields: execution_method or internal_execution_method"}), 400
+        error = route_error(queue, priority)
+        if error:
+            return jsonify({"error": error}), 400
 
         # Check if the execution method already exists
         existing_method = DefAsyncExecutionMethods.query.filter_by(internal_execution_method=internal_execution_method).first()
@@ -38,6 +45,8 @@ def Create_ExecutionMethod():
             internal_execution_method = internal_execution_method,
             executor = executor,
             description = description,
+            queue = queue,
+            priority = priority,
             created_by = get_jwt_identity(),
             creation_date = datetime.utcnow(),
             last_updated_by = get_jwt_identity(),
@@ -47,6 +56,8 @@ def Create_ExecutionMethod():
         # Add to session and commit
         db.session.add(new_method)
         db.session.commit()
+        invalidate_responses("execution_methods")
+        invalidate_routes()
 
         return jsonify({"message": "Added successfully", "data": new_method.json()}), 201
 
@@ -57,6 +68,7 @@ def Create_ExecutionMethod():
 
 @async_task_bp.route('/Show_ExecutionMethods', methods=['GET'])
 @jwt_required()
+@cached_response("execution_methods")
 def Show_ExecutionMethods():
     try:
         methods = DefAsyncExecutionMethods.query.order_by(DefAsyncExecutionMethods.internal_execution_method.desc()).all()
@@ -68,6 +80,7 @@ def Show_ExecutionMethods():
 
 
 @async_task_bp.route('/Show_ExecutionMethods/v1', methods=['GET'])
+@cached_response("execution_methods")
 def Show_ExecutionMethods_v1():
     try:
         methods = DefAsyncExecutionMethods.query.order_by(DefAsyncExecutionMethods.internal_execution_method.desc()).all()
@@ -80,6 +93,7 @@ def Show_ExecutionMethods_v1():
 
 @async_task_bp.route('/Show_ExecutionMethods/<int:page>/<int:limit>', methods=['GET'])
 @jwt_required()
+@cached_response("execution_methods")
 def paginated_execution_methods(page, limit):
     try:
         paginated = DefAsyncExecutionMethods.query.order_by(DefAsyncExecutionMethods.creation_date.desc()).paginate(page=page, per_page=limit, error_out=False)
@@ -101,21 +115,12 @@ def paginated_execution_methods(page, limit):
 
 @async_task_bp.route('/def_async_execution_methods/search/<int:page>/<int:limit>', methods=['GET'])
 @jwt_required()
+@cached_response("execution_methods")
 def search_execution_methods(page, limit):
     try:
         search_query = request.args.get('internal_execution_method', '').strip().lower()
-        search_underscore = search_query.replace(' ', '_')
-        search_space = search_query.replace('_', ' ')
-        query = DefAsyncExecutionMethods.query
-
-        if search_query:
-            query = query.filter(
-                or_(
-                    DefAsyncExecutionMethods.internal_execution_method.ilike(f'%{search_query}%'),
-                    DefAsyncExecutionMethods.internal_execution_method.ilike(f'%{search_underscore}%'),
-                    DefAsyncExecutionMethods.internal_execution_method.ilike(f'%{search_space}%')
-                )
-            )
+        query = apply_search(DefAsyncExecutionMethods.query, search_query,
+                             DefAsyncExecutionMethods.internal_execution_method)
 
         paginated = query.order_by(DefAsyncExecutionMethods.creation_date.desc()).paginate(
             page=page, per_page=limit, error_out=False
@@ -138,6 +143,7 @@ def search_execution_methods(page, limit):
 
 @async_task_bp.route('/Show_ExecutionMethod/<string:internal_execution_method>', methods=['GET'])
 @jwt_required()
+@cached_response("execution_methods")
 def Show_ExecutionMethod(internal_execution_method):
     try:
         method = db.session.query(DefAsyncExecutionMethods).filter_by(internal_execution_method=internal_execution_method).first()
@@ -155,6 +161,10 @@ def Update_ExecutionMethod(internal_execution_method):
         execution_method = DefAsyncExecutionMethods.query.filter_by(internal_execution_method=internal_execution_method).first()
 
         if execution_method:
+            error = route_error(request.json.get('queue'), request.json.get('priority'))
+            if error:
+                return make_response(jsonify({"error": error}), 400)
+
             # Only update fields that are provided in the request
             if 'execution_method' in request.json:
                 execution_method.execution_method = request.json.get('execution_method')
@@ -162,6 +172,10 @@ def Update_ExecutionMethod(internal_execution_method):
                 execution_method.executor = request.json.get('executor')
             if 'description' in request.json:
                 execution_method.description = request.json.get('description')
+            if 'queue' in request.json:
+                execution_method.queue = request.json.get('queue')
+            if 'priority' in request.json:
+                execution_method.priority = request.json.get('priority')
 
             execution_method.last_updated_by = get_jwt_identity()
 
@@ -169,6 +183,8 @@ def Update_ExecutionMethod(internal_execution_method):
             execution_method.last_update_date = datetime.utcnow()
 
             db.session.commit()
+            invalidate_responses("execution_methods")
+            invalidate_routes()
             return make_response(jsonify({"message": "Edited successfully"}), 200)
 
         return make_response(jsonify({"message": f"Execution method with internal_execution_method '{internal_execution_method}' not found"}), 404)
@@ -191,6 +207,7 @@ def Delete_ExecutionMethod(internal_execution_method):
         # Delete the execution method from the database
         db.session.delete(execution_method)
         db.session.commit()
+        invalidate_responses("execution_methods")
 
         return jsonify({"message": f"Deleted successfully"}), 200
 
@@ -0,0 +1,45 @@
+import json
+from flask import jsonify, make_response
+from flask_jwt_extended import jwt_required
+
+from executors.extensions import redis_client
+from executors.script_cache import STATS_KEY_PREFIX
+from executors.routing import queue_depths
+from . import async_task_bp
+
+
+@async_task_bp.route('/executors/script_cache_stats', methods=['GET'])
+@jwt_required()
+def Show_ScriptCacheStats():
+    try:
+        keys = list(redis_client.scan_iter(match=f"{STATS_KEY_PREFIX}:*", count=500))
+        workers = []
+        for key, raw in zip(keys, redis_client.mget(keys) if keys else []):
+            if not raw:
+                continue
+            _, _, hostname, pid = key.rsplit(':', 3)
+            workers.append({"hostname": hostname, **json.loads(raw)})
+
+        totals = {
+            name: sum(worker.get(name, 0) for worker in workers)
+            for name in ("hits", "misses", "recompiles", "evictions")
+        }
+
+        return make_response(jsonify({"totals": totals, "workers": workers}), 200)
+
+    except Exception as e:
+        return make_response(jsonify({"message": "Error retrieving script cache stats", "error": str(e)}), 500)
+
+
+@async_task_bp.route('/executors/queue_depths', methods=['GET'])
+@jwt_required()
+def Show_QueueDepths():
+    try:
+        depths = queue_depths(redis_client)
+        return make_response(jsonify({
+            "total": sum(queue["total"] for queue in depths.values()),
+            "queues": depths
+        }), 200)
+
+    except Exception as e:
+        return make_response(jsonify({"message": "Error retrieving queue depths", "error": str(e)}), 500)
@@ -2,13 +2,21 @@ from flask import request, jsonify, make_response
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
 
-from sqlalchemy import or_
+from utils.search import apply_search
 from utils.auth import role_required
+from utils.projection import requested_fields, project, projected_json
 from executors.extensions import db
 from executors.models import (
     DefAsyncTask
 
 )
+from executors.routing import invalidate as invalidate_routes, route_error
+from executors.overlap import (
+    POLICIES as OVERLAP_POLICIES,
+    invalidate as invalidate_overlap_policies,
+    is_valid_max_concurrency
+)
+from executors.task_definitions import invalidate as invalidate_task_definitions
 from . import async_task_bp
 
 
@@ -27,6 +35,18 @@ def Create_Task():
         description = request.json.get('description')
         srs = request.json.get('srs')
         sf  = request.json.get('sf')
+        queue = request.json.get('queue')
+        priority = request.json.get('priority')
+        overlap_policy = request.json.get('overlap_policy')
+        max_concurrency = request.json.get('max_concurrency')
+
+        if overlap_policy and overlap_policy not in OVERLAP_POLICIES:
+            return {"message": f"overlap_policy must be one of: {', '.join(OVERLAP_POLICIES)}"}, 400
+        if not is_valid_max_concurrency(max_concurrency):
+            return {"message": "max_concurrency must be a positive integer"}, 400
+        error = route_error(queue, priority)
+        if error:
+            return {"message": error}, 400
 
         new_task = DefAsyncTask(
             user_task_name = user_task_name,
@@ -40,6 +60,10 @@ def Create_Task():
             cancelled_yn = 'N',
             srs = srs,
             sf  = sf,
+            queue = queue,
+            priority = priority,
+            overlap_policy = overlap_policy,
+            max_concurrency = max_concurrency,
             created_by = get_jwt_identity(),
             last_updated_by = get_jwt_identity(),
             creation_date = datetime.utcnow(),
@@ -48,6 +72,9 @@ def Create_Task():
         )
         db.session.add(new_task)
         db.session.commit()
+        invalidate_routes()
+        invalidate_overlap_policies()
+        invalidate_task_definitions()
 
         return {"message": "Added successfully"}, 201
 
@@ -59,8 +86,11 @@ def Create_Task():
 @jwt_required()
 def Show_Tasks():
     try:
-        tasks = DefAsyncTask.query.order_by(DefAsyncTask.def_task_id.desc()).all()
-        return make_response(jsonify([task.json() for task in tasks]))
+        fields = requested_fields(DefAsyncTask)
+        tasks = project(DefAsyncTask.query, DefAsyncTask, fields).order_by(DefAsyncTask.def_task_id.desc()).all()
+        return make_response(jsonify([projected_json(task, fields) for task in tasks]))
+    except ValueError as e:
+        return make_response(jsonify({"message": "Invalid fields", "error": str(e)}), 400)
     except Exception as e:
         return make_response(jsonify({"message": "Error getting async Tasks", "error": str(e)}), 500)
 
@@ -68,8 +98,11 @@ def Show_Tasks():
 @async_task_bp.route('/def_async_tasks/v1', methods=['GET'])
 def Show_Tasks_v1():
     try:
-        tasks = DefAsyncTask.query.order_by(DefAsyncTask.def_task_id.desc()).all()
-        return make_response(jsonify([task.json() for task in tasks]))
+        fields = requested_fields(DefAsyncTask)
+        tasks = project(DefAsyncTask.query, DefAsyncTask, fields).order_by(DefAsyncTask.def_task_id.desc()).all()
+        return make_response(jsonify([projected_json(task, fields) for task in tasks]))
+    except ValueError as e:
+        return make_response(jsonify({"message": "Invalid fields", "error": str(e)}), 400)
     except Exception as e:
         return make_response(jsonify({"message": "Error getting async Tasks", "error": str(e)}), 500)
 
@@ -78,15 +111,18 @@ def Show_Tasks_v1():
 @jwt_required()
 def Show_Tasks_Paginated(page, limit):
     try:
-        tasks = DefAsyncTask.query.order_by(DefAsyncTask.creation_date.desc())
+        fields = requested_fields(DefAsyncTask)
+        tasks = project(DefAsyncTask.query, DefAsyncTask, fields).order_by(DefAsyncTask.creation_date.desc())
         paginated = tasks.paginate(page=page, per_page=limit, error_out=False)
 
         return make_response(jsonify({
-            "items": [model.json() for model in paginated.items],
+            "items": [projected_json(model, fields) for model in paginated.items],
             "total": paginated.total,
             "pages": paginated.pages,
             "page":  1 if paginated.total == 0 else paginated.page
         }), 200)
+    except ValueError as e:
+        return make_response(jsonify({"message": "Invalid fields", "error": str(e)}), 400)
     except Exception as e:
         return make_response(jsonify({"message": "Error getting async Tasks", "error": str(e)}), 500)
 
@@ -96,23 +132,17 @@ def Show_Tasks_Paginated(page, limit):
 def def_async_tasks_show_tasks(page, limit):
     try:
         search_query = request.args.get('user_task_name', '').strip().lower()
-        search_underscore = search_query.replace(' ', '_')
-        search_space = search_query.replace('_', ' ')
-        query = DefAsyncTask.query
-        if search_query:
-            
-            query = query.filter(or_(
-                DefAsyncTask.user_task_name.ilike(f'%{search_query}%'),
-                DefAsyncTask.user_task_name.ilike(f'%{search_underscore}%'),
-                DefAsyncTask.user_task_name.ilike(f'%{search_space}%')
-            ))
+        fields = requested_fields(DefAsyncTask)
+        query = apply_search(project(DefAsyncTask.query, DefAsyncTask, fields), search_query, DefAsyncTask.user_task_name)
         paginated = query.order_by(DefAsyncTask.def_task_id.desc()).paginate(page=page, per_page=limit, error_out=False)
         return make_response(jsonify({
-            "items": [task.json() for task in paginated.items],
+            "items": [projected_json(task, fields) for task in paginated.items],
             "total": paginated.total,
             "pages": 1 if paginated.total == 0 else paginated.pages,
             "page":  paginated.page
         }), 200)
+    except ValueError as e:
+        return make_response(jsonify({"message": "Invalid fields", "error": str(e)}), 400)
     except Exception as e:
         return make_response(jsonify({"message": "Error fetching tasks", "error": str(e)}), 500)
 
@@ -139,6 +169,10 @@ def Update_Task(task_name):
     try:
         task = DefAsyncTask.query.filter_by(task_name=task_name).first()
         if task:
+            error = route_error(request.json.get('queue'), request.json.get('priority'))
+            if error:
+                return make_response(jsonify({"message": error}), 400)
+
             # Only update fields that are provided in the request
             if 'user_task_name' in request.json:
                 task.user_task_name = request.json.get('user_task_name')
@@ -152,10 +186,27 @@ def Update_Task(task_name):
                 task.srs = request.json.get('srs')
             if 'sf' in request.json:
                 task.sf = request.json.get('sf')
+            if 'queue' in request.json:
+                task.queue = request.json.get('queue')
+            if 'priority' in request.json:
+                task.priority = request.json.get('priority')
+            if 'overlap_policy' in request.json:
+                overlap_policy = request.json.get('overlap_policy')
+                if overlap_policy and overlap_policy not in OVERLAP_POLICIES:
+                    return make_response(jsonify({"message": f"overlap_policy must be one of: {', '.join(OVERLAP_POLICIES)}"}), 400)
+                task.overlap_policy = overlap_policy
+            if 'max_concurrency' in request.json:
+                max_concurrency = request.json.get('max_concurrency')
+                if not is_valid_max_concurrency(max_concurrency):
+                    return make_response(jsonify({"message": "max_concurrency must be a positive integer"}), 400)
+                task.max_concurrency = max_concurrency
             task.last_updated_by = get_jwt_identity()
             task.last_update_date = datetime.utcnow()
 
             db.session.commit()
+            invalidate_routes()
+            invalidate_overlap_policies()
+            invalidate_task_definitions()
             return make_response(jsonify({"message": "Edited successfully"}), 200)
 
         return make_response(jsonify({"message": f"Async Task with name '{task_name}' not found"}), 404)
@@ -176,6 +227,7 @@ def Cancel_Task(task_name):
             task.cancelled_yn = 'Y'
 
             db.session.commit()
+            invalidate_task_definitions()
 
             # return make_response(jsonify({"message": f"Task {task_name} has been cancelled successfully"}), 200)
             return make_response(jsonify({"message": "Cancelled successfully"}), 200)
@@ -5,6 +5,7 @@ from datetime import datetime
 
 from utils.auth import role_required
 from executors.extensions import db
+from executors.task_definitions import invalidate as invalidate_task_definitions
 from executors.models import (
     DefAsyncTask,
     DefAsyncTaskParam
@@ -56,6 +57,7 @@ def Add_TaskParams(task_name):
         # Add all new parameters to the session and commit
         db.session.add_all(new_params)
         db.session.commit()
+        invalidate_task_definitions()
 
         # return make_response(jsonify({
         #     "message": "Parameters Created successfully",
@@ -134,6 +136,7 @@ def Update_TaskParams(task_name, def_param_id):
 
         # Commit the changes to the database
         db.session.commit()
+        invalidate_task_definitions()
 
         # return jsonify({"message": "Task parameter updated successfully", 
         #                  "task_param": param.json()}), 200
@@ -158,6 +161,7 @@ def Delete_TaskParams(task_name, def_param_id):
         # Delete the parameter from the database
         db.session.delete(param)
         db.session.commit()
+        invalidate_task_definitions()
 
         # return jsonify({"message": f"Parameter with def_param_id '{def_param_id}' successfully deleted from task '{task_name}'"}), 200
         return jsonify({"message": "Deleted successfully"}), 200
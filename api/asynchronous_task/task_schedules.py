@@ -1,11 +1,14 @@
 
 from flask import request, jsonify, make_response
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from datetime import datetime
+from datetime import datetime, timezone
+import os
+import json
 import uuid
 import logging
-from celery.schedules import crontab     
-from sqlalchemy import or_
+from utils.search import apply_search
+from utils.pagination import paginate_rows
+from utils.rows import RowSerializer
 from datetime import datetime
 from flask import request, jsonify, make_response       # Flask utilities for handling requests and responses
 
@@ -14,15 +17,25 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 
 from executors.extensions import db
 from celery import current_app as celery  # Access the current Celery app
-from redbeat_s.red_functions import create_redbeat_schedule, update_redbeat_schedule, delete_schedule_from_redis
+from redbeat_s.red_functions import (
+    create_redbeat_schedule,
+    update_redbeat_schedule,
+    delete_schedule_from_redis,
+    create_redbeat_schedules_bulk,
+    delete_redbeat_schedules_bulk
+)
+from redbeat_s.schedule_spec import ScheduleSpec, ScheduleSpecError
+from redbeat_s.reconcile import reconcile_schedules, get_report as get_drift_report
+from redbeat.schedulers import get_redis
+from redbeat.decoder import RedBeatJSONDecoder
+from redbeat_s.maintenance import entry_key
 from ad_hoc.ad_hoc_functions import execute_ad_hoc_task_v1
+from executors.task_definitions import get_definition as get_task_definition
 
 
 from utils.auth import role_required
 from executors.extensions import db
 from executors.models import (
-    DefAsyncTask,
-    DefAsyncTaskParam,
     DefAsyncTaskSchedule,
     DefAsyncTaskScheduleNew,
     DefAsyncTaskSchedulesV
@@ -44,13 +57,13 @@ def Create_TaskSchedule():
         if not task_name:
             return jsonify({'error': 'Task name is required'}), 400
 
-        # Fetch task details from the database
-        task = DefAsyncTask.query.filter_by(task_name=task_name).first()
+        # Task definition from the process-local cache (executors/task_definitions.py)
+        task = get_task_definition(task_name)
         if not task:
             return jsonify({'error': f'No task found with task_name: {task_name}'}), 400
 
         # Prevent scheduling if the task is cancelled
-        if getattr(task, 'cancelled_yn', 'N') == 'Y':
+        if task.cancelled_yn == 'Y':
             return jsonify({'error': f"Task '{task_name}' is cancelled and cannot be scheduled."}), 400
 
         user_task_name = task.user_task_name
@@ -64,154 +77,14 @@ def Create_TaskSchedule():
             redbeat_schedule_name = f"{user_schedule_name}_{schedule_name}"
 
         args = [script_name, user_task_name, task_name, user_schedule_name, redbeat_schedule_name, schedule_type, schedule_data]
-        kwargs = {}
 
         # Validate task parameters
-        task_params = DefAsyncTaskParam.query.filter_by(task_name=task_name).all()
-        for param in task_params:
-            param_name = param.parameter_name
-            if param_name in parameters:
-                kwargs[param_name] = parameters[param_name]
-            else:
-                return jsonify({'error': f'Missing value for parameter: {param_name}'}), 400
-
-        # Handle scheduling based on schedule type
-        cron_schedule = None
-        schedule_minutes = None
-
-        if schedule_type == "WEEKLY_SPECIFIC_DAYS":
-            values = schedule_data.get('VALUES', [])  # e.g., ["Monday", "Wednesday"]
-            day_map = {
-                "SUN": 0, "MON": 1, "TUE": 2, "WED": 3,
-                "THU": 4, "FRI": 5, "SAT": 6
-            }
-            days_of_week = ",".join(str(day_map[day.upper()]) for day in values if day.upper() in day_map)
-            cron_schedule = crontab(minute=0, hour=0, day_of_week=days_of_week)
-
-        elif schedule_type == "MONTHLY_SPECIFIC_DATES":
-            values = schedule_data.get('VALUES', [])  # e.g., ["5", "15"]
-            dates_of_month = ",".join(values)
-            cron_schedule = crontab(minute=0, hour=0, day_of_month=dates_of_month)
-
-        elif schedule_type == "ONCE":
-            one_time_date = schedule_data.get('VALUES')  # e.g., {"date": "2025-03-01 14:30"}
-            if not one_time_date:
-                return jsonify({'error': 'Date is required for one-time execution'}), 400
-            dt = datetime.strptime(one_time_date, "%Y-%m-%d %H:%M")
-            cron_schedule = crontab(minute=dt.minute, hour=dt.hour, day_of_month=dt.day, month_of_year=dt.month)
-
-        elif schedule_type == "PERIODIC":
-            # Extract frequency type and frequency value from schedule_data
-            frequency_type_raw = schedule_data.get('FREQUENCY_TYPE', 'MINUTES')
-            frequency_type = frequency_type_raw.upper().strip().rstrip('s').replace('(', '').replace(')', '')
-            frequency = schedule_data.get('FREQUENCY', 1)
-
-            # Log frequency values to help with debugging
-            print(f"Frequency Type: {frequency_type}")
-            print(f"Frequency: {frequency}")
-           
-            # Handle different frequency types
-            if frequency_type == 'MONTHS':
-               schedule_minutes = frequency * 30 * 24 * 60  # Approximate calculation: 1 month = 30 days
-            elif frequency_type == 'WEEKS':
-               schedule_minutes = frequency * 7 * 24 * 60  # 7 days * 24 hours * 60 minutes
-            elif frequency_type == 'DAYS':
-               schedule_minutes = frequency * 24 * 60  # 1 day = 24 hours = 1440 minutes
-            elif frequency_type == 'HOURS':
-               schedule_minutes = frequency * 60  # 1 hour = 60 minutes
-            elif frequency_type == 'MINUTES':
-               schedule_minutes = frequency  # Frequency is already in minutes
-            else:
-               return jsonify({'error': f'Invalid frequency type: {frequency_type}'}), 400
-
-        # elif schedule_type == "MONTHLY_LAST_DAY":
-
-        #     try:
-        #         today = datetime.today()
-        #         start_year = today.year
-        #         start_month = today.month
-
-        #         # Calculate how many months left in the year including current month
-        #         months_left = 12 - start_month + 1  # +1 to include the current month itself
-
-        #         for i in range(months_left):
-        #             # Calculate the target year and month
-        #             year = start_year  # same year, no spanning next year
-        #             month = start_month + i
-
-        #             # Find the first day of the next month
-        #             if month == 12:
-        #                 next_month = datetime(year + 1, 1, 1)
-        #             else:
-        #                 next_month = datetime(year, month + 1, 1)
-
-        #             # Calculate the last day of the current month
-        #             last_day_dt = next_month - timedelta(days=1)
-        #             last_day = last_day_dt.day
-
-        #             # Create a cron schedule for the last day of this month at midnight
-        #             cron_schedule = crontab(
-        #                 minute=0,
-        #                 hour=0,
-        #                 day_of_month=last_day,
-        #                 month_of_year=month
-        #             )
-
-        #             redbeat_schedule_name = f"{user_schedule_name}_{uuid.uuid4()}"
-
-        #             args_with_schedule = [
-        #                 script_name,
-        #                 user_task_name,
-        #                 task_name,
-        #                 user_schedule_name,
-        #                 redbeat_schedule_name,
-        #                 schedule_type,
-        #                 schedule_data
-        #             ]
-
-        #             # Create Redis schedule entry via RedBeat
-        #             create_redbeat_schedule(
-        #                 schedule_name=redbeat_schedule_name,
-        #                 executor=executor,
-        #                 cron_schedule=cron_schedule,
-        #                 args=args_with_schedule,
-        #                 kwargs=kwargs,
-        #                 celery_app=celery
-        #             )
-
-        #             # Create database record for the schedule
-        #             new_schedule = DefAsyncTaskScheduleNew(
-        #                 user_schedule_name=user_schedule_name,
-        #                 redbeat_schedule_name=redbeat_schedule_name,
-        #                 task_name=task_name,
-        #                 args=args_with_schedule,
-        #                 kwargs=kwargs,
-        #                 parameters=kwargs,
-        #                 schedule_type=schedule_type,
-        #                 schedule={"scheduled_for": f"{year}-{month:02}-{last_day} 00:00"},
-        #                 cancelled_yn='N',
-        #                 created_by=101
-        #             )
-
-        #             db.session.add(new_schedule)
-
-        #         db.session.commit()
-
-        #         return jsonify({
-        #             "message": f"Monthly last-day tasks scheduled for the remaining {months_left} months of {start_year}"
-        #         }), 201
-
-        #     except Exception as e:
-        #         db.session.rollback()
-        #         return jsonify({
-        #             "error": "Failed to schedule monthly last-day tasks",
-        #             "details": str(e)
-        #         }), 500
-
-
-        
+        kwargs, errors = task.validate(parameters)
+        if errors:
+            return jsonify({'error': errors[0], 'details': errors}), 400
+
         # Handle Ad-hoc Requests
-        elif schedule_type == "IMMEDIATE":
+        if schedule_type == "IMMEDIATE":
             try:
                 result = execute_ad_hoc_task_v1(
                     user_schedule_name = user_schedule_name,
@@ -230,15 +103,19 @@ def Create_TaskSchedule():
             except Exception as e:
                 return jsonify({"error": "Failed to execute ad-hoc task", "details": str(e)}), 500
 
-        else:
-            return jsonify({'error': 'Invalid schedule type'}), 400
+        # One compiled schedule per RedBeat entry (see redbeat_s/schedule_spec.py)
+        try:
+            spec = ScheduleSpec(schedule_type, schedule_data)
+        except ScheduleSpecError as e:
+            return jsonify({'error': str(e)}), 400
+        creation_date = datetime.utcnow()
+
         # Handle Scheduled Tasks
         try:
             create_redbeat_schedule(
                 schedule_name=redbeat_schedule_name,
                 executor=executor,
-                schedule_minutes=schedule_minutes if schedule_minutes else None,
-                cron_schedule=cron_schedule if cron_schedule else None,
+                schedule=spec.compile(anchor=creation_date),
                 args=args,
                 kwargs=kwargs,
                 celery_app=celery
@@ -259,7 +136,7 @@ def Create_TaskSchedule():
             schedule = schedule_data,
             cancelled_yn = 'N',
             created_by = get_jwt_identity(),
-            creation_date = datetime.utcnow(),
+            creation_date = creation_date,
             last_updated_by = get_jwt_identity(),
             last_update_date = datetime.utcnow()
         )
@@ -278,6 +155,247 @@ def Create_TaskSchedule():
         return jsonify({"error": "Failed to add task schedule", "details": str(e)}), 500
 
 
+# Upper bound on entries per bulk request
+BULK_SCHEDULE_MAX = int(os.getenv("BULK_SCHEDULE_MAX", 1000))
+
+
+@async_task_bp.route('/Create_TaskSchedules/bulk', methods=['POST'])
+@jwt_required()
+def Create_TaskSchedules_Bulk():
+    """
+    Create many recurring schedules at once: {"schedules": [{task_name,
+    user_schedule_name, parameters, schedule_type, schedule}, ...]}.
+    Every entry is validated before anything is written; the RedBeat entries
+    go to Redis in one pipeline and the rows to the DB in one commit, so
+    either all schedules are created or none are.
+    """
+    try:
+        entries = request.json.get('schedules') or []
+        if not entries:
+            return make_response(jsonify({"error": "schedules must be a non-empty list"}), 400)
+        if len(entries) > BULK_SCHEDULE_MAX:
+            return make_response(jsonify({"error": f"At most {BULK_SCHEDULE_MAX} schedules per request"}), 400)
+
+        task_names = {entry.get('task_name') for entry in entries}
+        tasks = {name: get_task_definition(name) for name in task_names}
+
+        errors, redbeat_entries, rows = [], [], []
+        user_id = get_jwt_identity()
+        creation_date = datetime.utcnow()
+        for index, entry in enumerate(entries):
+            task_name = entry.get('task_name')
+            user_schedule_name = entry.get('user_schedule_name', 'Immediate')
+            parameters = entry.get('parameters') or {}
+            schedule_type = entry.get('schedule_type')
+            schedule_data = entry.get('schedule') or {}
+
+            task = tasks.get(task_name)
+            if not task_name:
+                errors.append({"index": index, "error": "Task name is required"})
+                continue
+            if not task:
+                errors.append({"index": index, "error": f"No task found with task_name: {task_name}"})
+                continue
+            if task.cancelled_yn == 'Y':
+                errors.append({"index": index, "error": f"Task '{task_name}' is cancelled and cannot be scheduled."})
+                continue
+            if schedule_type == "IMMEDIATE":
+                errors.append({"index": index, "error": "IMMEDIATE runs are not supported in bulk; use Create_TaskSchedule"})
+                continue
+
+            kwargs, param_errors = task.validate(parameters)
+            if param_errors:
+                errors.append({"index": index, "error": "; ".join(param_errors)})
+                continue
+
+            try:
+                spec = ScheduleSpec(schedule_type, schedule_data)
+            except ScheduleSpecError as e:
+                errors.append({"index": index, "error": str(e)})
+                continue
+
+            redbeat_schedule_name = f"{user_schedule_name}_{uuid.uuid4()}"
+            args = [task.script_name, task.user_task_name, task_name, user_schedule_name,
+                    redbeat_schedule_name, schedule_type, schedule_data]
+
+            redbeat_entries.append({
+                "schedule_name": redbeat_schedule_name,
+                "executor": task.executor,
+                "schedule": spec.compile(anchor=creation_date),
+                "args": args,
+                "kwargs": kwargs
+            })
+            rows.append({
+                "user_schedule_name": user_schedule_name,
+                "redbeat_schedule_name": redbeat_schedule_name,
+                "task_name": task_name,
+                "args": args,
+                "kwargs": kwargs,
+                "parameters": kwargs,
+                "schedule_type": schedule_type,
+                "schedule": schedule_data,
+                "cancelled_yn": 'N',
+                "created_by": user_id,
+                "creation_date": creation_date,
+                "last_updated_by": user_id,
+                "last_update_date": datetime.utcnow()
+            })
+
+        if errors:
+            return make_response(jsonify({"error": "Validation failed; nothing was created", "details": errors}), 400)
+
+        # One multi-row INSERT; flushed (not committed) so DB errors surface before Redis is touched
+        db.session.bulk_insert_mappings(DefAsyncTaskScheduleNew, rows)
+        db.session.flush()
+
+        try:
+            create_redbeat_schedules_bulk(redbeat_entries, celery_app=celery)
+        except Exception as e:
+            db.session.rollback()
+            return make_response(jsonify({"error": "Failed to create RedBeat schedules", "details": str(e)}), 500)
+
+        try:
+            db.session.commit()
+        except Exception:
+            # Keep Redis in line with the DB: drop the entries just written
+            delete_redbeat_schedules_bulk([entry["schedule_name"] for entry in redbeat_entries], celery_app=celery)
+            raise
+
+        return make_response(jsonify({
+            "message": "Added successfully",
+            "redbeat_schedule_names": [entry["schedule_name"] for entry in redbeat_entries]
+        }), 201)
+
+    except Exception as e:
+        db.session.rollback()
+        return make_response(jsonify({"error": "Failed to add task schedules", "details": str(e)}), 500)
+
+
+@async_task_bp.route('/Cancel_TaskSchedules/bulk', methods=['PUT'])
+@jwt_required()
+def Cancel_TaskSchedules_Bulk():
+    """
+    Cancel many schedules at once: {"redbeat_schedule_names": [...]}.
+    All names must exist and be active; the rows are updated in one
+    statement and the RedBeat entries removed in one pipeline.
+    """
+    try:
+        names = request.json.get('redbeat_schedule_names') or []
+        if not names:
+            return make_response(jsonify({"message": "redbeat_schedule_names must be a non-empty list"}), 400)
+        if len(names) > BULK_SCHEDULE_MAX:
+            return make_response(jsonify({"message": f"At most {BULK_SCHEDULE_MAX} schedules per request"}), 400)
+
+        names = list(dict.fromkeys(names))
+        active = {
+            name for (name,) in db.session.query(DefAsyncTaskScheduleNew.redbeat_schedule_name).filter(
+                DefAsyncTaskScheduleNew.redbeat_schedule_name.in_(names),
+                DefAsyncTaskScheduleNew.cancelled_yn != 'Y'
+            )
+        }
+        missing = [name for name in names if name not in active]
+        if missing:
+            return make_response(jsonify({
+                "message": "Some schedules were not found or are already cancelled; nothing was cancelled",
+                "not_found": missing
+            }), 404)
+
+        DefAsyncTaskScheduleNew.query.filter(
+            DefAsyncTaskScheduleNew.redbeat_schedule_name.in_(names)
+        ).update({
+            DefAsyncTaskScheduleNew.cancelled_yn: 'Y',
+            DefAsyncTaskScheduleNew.last_updated_by: get_jwt_identity(),
+            DefAsyncTaskScheduleNew.last_update_date: datetime.utcnow()
+        }, synchronize_session=False)
+        db.session.flush()
+
+        try:
+            delete_redbeat_schedules_bulk(names, celery_app=celery)
+        except Exception as e:
+            db.session.rollback()
+            return make_response(jsonify({"message": "Failed to delete schedules from Redis; nothing was cancelled", "error": str(e)}), 500)
+
+        db.session.commit()
+        return make_response(jsonify({"message": "Cancelled successfully", "cancelled": len(names)}), 200)
+
+    except Exception as e:
+        db.session.rollback()
+        return make_response(jsonify({"message": "Error cancelling task schedules", "error": str(e)}), 500)
+
+
+# Most fire times returned by one next_runs call
+SCHEDULE_PREVIEW_MAX = int(os.getenv("SCHEDULE_PREVIEW_MAX", 500))
+
+
+def _last_run_at(redbeat_schedule_name):
+    """last_run_at of a RedBeat entry as naive UTC, None if it never ran."""
+    meta = get_redis(celery).hget(entry_key(redbeat_schedule_name), 'meta')
+    last_run_at = json.loads(meta, cls=RedBeatJSONDecoder).get('last_run_at') if meta else None
+    if last_run_at and last_run_at.tzinfo:
+        last_run_at = last_run_at.astimezone(timezone.utc).replace(tzinfo=None)
+    return last_run_at
+
+
+@async_task_bp.route('/schedules/<int:def_task_sche_id>/next_runs', methods=['GET'])
+@jwt_required()
+def Show_ScheduleNextRuns(def_task_sche_id):
+    try:
+        n = min(max(request.args.get('n', 10, type=int), 1), SCHEDULE_PREVIEW_MAX)
+        schedule = DefAsyncTaskScheduleNew.query.get(def_task_sche_id)
+        if not schedule:
+            return make_response(jsonify({"message": "Task schedule not found"}), 404)
+
+        result = {
+            "def_task_sche_id": schedule.def_task_sche_id,
+            "redbeat_schedule_name": schedule.redbeat_schedule_name,
+            "schedule_type": schedule.schedule_type,
+            "cancelled_yn": schedule.cancelled_yn,
+            "next_runs": []
+        }
+        if schedule.cancelled_yn == 'Y' or schedule.schedule_type == "IMMEDIATE":
+            return make_response(jsonify(result), 200)
+
+        try:
+            spec = ScheduleSpec(schedule.schedule_type, schedule.schedule)
+        except ScheduleSpecError as e:
+            return make_response(jsonify({"message": "Schedule cannot be compiled", "error": str(e)}), 422)
+
+        last_run_at = _last_run_at(schedule.redbeat_schedule_name) if spec.every else None
+        runs = spec.next_runs(n, anchor=schedule.creation_date, last_run_at=last_run_at)
+        result["next_runs"] = [run.isoformat() for run in runs]
+        return make_response(jsonify(result), 200)
+
+    except Exception as e:
+        return make_response(jsonify({"message": "Error computing next runs", "error": str(e)}), 500)
+
+
+@async_task_bp.route('/schedules/drift_report', methods=['GET'])
+@jwt_required()
+def Show_ScheduleDriftReport():
+    try:
+        report = get_drift_report(get_redis(celery))
+        if not report:
+            return make_response(jsonify({"message": "No reconciliation has run yet"}), 404)
+        return make_response(jsonify(report), 200)
+    except Exception as e:
+        return make_response(jsonify({"message": "Error getting drift report", "error": str(e)}), 500)
+
+
+@async_task_bp.route('/schedules/reconcile', methods=['POST'])
+@jwt_required()
+def Run_ScheduleReconcile():
+    try:
+        repair = (request.get_json(silent=True) or {}).get('repair')
+        result = reconcile_schedules.delay(repair=repair)
+        return make_response(jsonify({"message": "Reconciliation started", "task_id": result.id}), 202)
+    except Exception as e:
+        return make_response(jsonify({"message": "Error starting reconciliation", "error": str(e)}), 500)
+
+
+# def_async_task_schedules_v rows straight to dicts (no ORM instances) for the read-only listings
+SCHEDULES_VIEW_ROWS = RowSerializer(DefAsyncTaskSchedulesV)
+
+
 @async_task_bp.route('/Show_TaskSchedules', methods=['GET'])
 @jwt_required()
 def Show_TaskSchedules():
@@ -286,9 +404,9 @@ def Show_TaskSchedules():
     # .filter(DefAsyncTaskSchedulesV.ready_for_redbeat != 'Y') \
     # .order_by(desc(DefAsyncTaskSchedulesV.def_task_sche_id)) \
     # .all()
-        schedules = DefAsyncTaskSchedulesV.query.order_by(DefAsyncTaskSchedulesV.def_task_sche_id.desc()).all()
+        stmt = SCHEDULES_VIEW_ROWS.select().order_by(DefAsyncTaskSchedulesV.def_task_sche_id.desc())
         # Return the schedules as a JSON response
-        return jsonify([schedule.json() for schedule in schedules])
+        return jsonify(SCHEDULES_VIEW_ROWS.dicts(db.session.execute(stmt)))
 
     except Exception as e:
         # Handle any errors and return them as a JSON response
@@ -300,12 +418,12 @@ def Show_TaskSchedules():
 @jwt_required()
 def paginated_task_schedules(page, limit):
     try:
-        paginated = DefAsyncTaskSchedulesV.query.order_by(
+        paginated = paginate_rows(SCHEDULES_VIEW_ROWS.select().order_by(
             DefAsyncTaskSchedulesV.def_task_sche_id.desc()
-        ).paginate(page=page, per_page=limit, error_out=False)
+        ), page, limit)
 
         return jsonify({
-            "items": [schedule.json() for schedule in paginated.items],
+            "items": SCHEDULES_VIEW_ROWS.dicts(paginated.items),
             "total": paginated.total,
             "pages": paginated.pages,
             "page":  1 if paginated.total == 0 else paginated.page
@@ -319,25 +437,12 @@ def paginated_task_schedules(page, limit):
 def search_task_schedules(page, limit):
     try:
         search_query = request.args.get('task_name', '').strip().lower()
-        search_underscore = search_query.replace(' ', '_')
-        search_space = search_query.replace('_', ' ')
-        query = DefAsyncTaskSchedulesV.query
-
-        if search_query:
-            query = query.filter(
-                or_(
-                    DefAsyncTaskSchedulesV.task_name.ilike(f'%{search_query}%'),
-                    DefAsyncTaskSchedulesV.task_name.ilike(f'%{search_underscore}%'),
-                    DefAsyncTaskSchedulesV.task_name.ilike(f'%{search_space}%')
-                )
-            )
+        query = apply_search(SCHEDULES_VIEW_ROWS.select(), search_query, DefAsyncTaskSchedulesV.task_name)
 
-        paginated = query.order_by(DefAsyncTaskSchedulesV.def_task_sche_id.desc()).paginate(
-            page=page, per_page=limit, error_out=False
-        )
+        paginated = paginate_rows(query.order_by(DefAsyncTaskSchedulesV.def_task_sche_id.desc()), page, limit)
 
         return jsonify({
-            "items": [schedule.json() for schedule in paginated.items],
+            "items": SCHEDULES_VIEW_ROWS.dicts(paginated.items),
             "total": paginated.total,
             "pages": 1 if paginated.total == 0 else paginated.pages,
             "page":  paginated.page
@@ -377,10 +482,12 @@ def Update_TaskSchedule(task_name):
         schedule = DefAsyncTaskScheduleNew.query.filter_by(
             task_name=task_name, redbeat_schedule_name=redbeat_schedule_name
         ).first()
-        executors = DefAsyncTask.query.filter_by(task_name=task_name).first()
+        task = get_task_definition(task_name)
 
         if not schedule:
             return jsonify({"message": f"Task Periodic Schedule for {redbeat_schedule_name} not found"}), 404
+        if not task:
+            return jsonify({"message": f"No task found with task_name: {task_name}"}), 404
 
         # if schedule.ready_for_redbeat != 'N':
         #     return jsonify({
@@ -388,57 +495,30 @@ def Update_TaskSchedule(task_name):
         #     }), 400
 
         # Update fields
-        schedule.parameters = request.json.get('parameters', schedule.parameters)
-        schedule.kwargs = request.json.get('parameters', schedule.kwargs)
+        if 'parameters' in request.json:
+            kwargs, errors = task.validate(request.json.get('parameters'))
+            if errors:
+                return jsonify({"message": errors[0], "details": errors}), 400
+            schedule.parameters = kwargs
+            schedule.kwargs = kwargs
         schedule.schedule_type = request.json.get('schedule_type', schedule.schedule_type)
         schedule.schedule = request.json.get('schedule', schedule.schedule)
         schedule.last_updated_by = get_jwt_identity()
         schedule.last_update_date = datetime.utcnow()
 
         # Handle scheduling logic
-        cron_schedule = None
-        schedule_minutes = None
-
-        if schedule.schedule_type == "WEEKLY_SPECIFIC_DAYS":
-            values = schedule.schedule.get('VALUES', [])
-            day_map = {"SUN": 0, "MON": 1, "TUE": 2, "WED": 3, "THU": 4, "FRI": 5, "SAT": 6}
-            days_of_week = ",".join(str(day_map[day.upper()]) for day in values if day.upper() in day_map)
-            cron_schedule = crontab(minute=0, hour=0, day_of_week=days_of_week)
-
-        elif schedule.schedule_type == "MONTHLY_SPECIFIC_DATES":
-            values = schedule.schedule.get('VALUES', [])
-            dates_of_month = ",".join(values)
-            cron_schedule = crontab(minute=0, hour=0, day_of_month=dates_of_month)
-
-        elif schedule.schedule_type == "ONCE":
-            one_time_date = schedule.schedule.get('VALUES')
-            dt = datetime.strptime(one_time_date, "%Y-%m-%d %H:%M")
-            cron_schedule = crontab(minute=dt.minute, hour=dt.hour, day_of_month=dt.day, month_of_year=dt.month)
-
-        elif schedule.schedule_type == "PERIODIC":
-            frequency_type = schedule.schedule.get('FREQUENCY_TYPE', 'minutes').lower()
-            frequency = schedule.schedule.get('FREQUENCY', 1)
-            
-            if frequency_type == 'months':
-                schedule_minutes = frequency * 30 * 24 * 60
-            elif frequency_type == 'days':
-                schedule_minutes = frequency * 24 * 60
-            elif frequency_type == 'hours':
-                schedule_minutes = frequency * 60
-            else:
-                schedule_minutes = frequency  # Default to minutes
-
-        # Ensure at least one scheduling method is provided
-        if not schedule_minutes and not cron_schedule:
-            return jsonify({"message": "Either 'schedule_minutes' or 'cron_schedule' must be provided."}), 400
+        try:
+            spec = ScheduleSpec(schedule.schedule_type, schedule.schedule)
+        except ScheduleSpecError as e:
+            db.session.rollback()
+            return jsonify({"message": str(e)}), 400
 
         # Update RedBeat schedule
         try:
             update_redbeat_schedule(
                 schedule_name = redbeat_schedule_name,
-                task = executors.executor,
-                schedule_minutes = schedule_minutes,
-                cron_schedule = cron_schedule,
+                task = task.executor,
+                schedule = spec.compile(anchor=schedule.creation_date),
                 args = schedule.args,
                 kwargs = schedule.kwargs,
                 celery_app = celery
@@ -518,53 +598,12 @@ def Reschedule_TaskSchedule(task_name):
         if not schedule:
             return make_response(jsonify({'error': 'Cancelled schedule not found'}), 404)
 
-        # Determine cron or periodic schedule
-        cron_schedule = None
-        schedule_minutes = None
-        schedule_data = schedule.schedule
-        schedule_type = schedule.schedule_type
-
-        if schedule_type == "WEEKLY_SPECIFIC_DAYS":
-            values = schedule_data.get('VALUES', [])
-            day_map = {
-                "SUN": 0, "MON": 1, "TUE": 2, "WED": 3,
-                "THU": 4, "FRI": 5, "SAT": 6
-            }
-            days_of_week = ",".join(str(day_map[day.upper()]) for day in values if day.upper() in day_map)
-            cron_schedule = crontab(minute=0, hour=0, day_of_week=days_of_week)
-
-        elif schedule_type == "MONTHLY_SPECIFIC_DATES":
-            values = schedule_data.get('VALUES', [])
-            dates_of_month = ",".join(values)
-            cron_schedule = crontab(minute=0, hour=0, day_of_month=dates_of_month)
-
-        elif schedule_type == "ONCE":
-            one_time_date = schedule_data.get('VALUES')
-            dt = datetime.strptime(one_time_date, "%Y-%m-%d %H:%M")
-            cron_schedule = crontab(minute=dt.minute, hour=dt.hour, day_of_month=dt.day, month_of_year=dt.month)
-
-        elif schedule_type == "PERIODIC":
-            frequency_type_raw = schedule_data.get('FREQUENCY_TYPE', 'MINUTES')
-            frequency_type = frequency_type_raw.upper().strip().rstrip('s').replace('(', '').replace(')', '')
-            frequency = schedule_data.get('FREQUENCY', 1)
-
-            if frequency_type == 'MONTHS':
-                schedule_minutes = frequency * 30 * 24 * 60
-            elif frequency_type == 'WEEKS':
-                schedule_minutes = frequency * 7 * 24 * 60
-            elif frequency_type == 'DAYS':
-                schedule_minutes = frequency * 24 * 60
-            elif frequency_type == 'HOURS':
-                schedule_minutes = frequency * 60
-            elif frequency_type == 'MINUTES':
-                schedule_minutes = frequency
-            else:
-                return make_response(jsonify({'error': f'Invalid frequency type: {frequency_type}'}), 400)
-
-        else:
-            return make_response(jsonify({'error': f'Cannot reschedule type: {schedule_type}'}), 400)
-        
-        executor = DefAsyncTask.query.filter_by(task_name=task_name).first()
+        try:
+            spec = ScheduleSpec(schedule.schedule_type, schedule.schedule)
+        except ScheduleSpecError as e:
+            return make_response(jsonify({'error': f'Cannot reschedule: {e}'}), 400)
+
+        executor = get_task_definition(task_name)
         if not executor:
             return make_response(jsonify({'error': f'Executor not found for task {task_name}'}),404)
         # Restore schedule in Redis
@@ -572,8 +611,7 @@ def Reschedule_TaskSchedule(task_name):
             create_redbeat_schedule(
                 schedule_name=redbeat_schedule_name,
                 executor=executor.executor,     
-                schedule_minutes=schedule_minutes,
-                cron_schedule=cron_schedule,
+                schedule=spec.compile(anchor=schedule.creation_date),
                 args=schedule.args,
                 kwargs=schedule.kwargs,
                 celery_app=celery
@@ -1,31 +1,112 @@
-import ast
-from flask import request, jsonify, make_response
+import os
+from flask import request, jsonify, make_response, Response, stream_with_context
 from flask_jwt_extended import jwt_required
+from sqlalchemy import select
 from datetime import datetime
 from datetime import datetime, timedelta
-import requests
-from sqlalchemy import or_
+from utils.search import apply_search
 from utils.auth import role_required
 from executors.extensions import db
 from executors.models import (
     DefAsyncTaskRequest
 
 )
-from config import FLOWER_URL
+from executors.task_state_index import get_states, get_active
+from executors import result_store
+from utils.pagination import keyset_paginate
+from utils.export import EXPORT_FORMATS, stream_rows
+from utils.projection import requested_fields, project, projected_json
 from . import async_task_bp
 
 # flower_url = flask_app.config["FLOWER_URL"]
 
+# Rows fetched per round trip from the server-side cursor during exports
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", 1000))
+EXPORT_DEFAULT_DAYS = int(os.getenv("EXPORT_DEFAULT_DAYS", 30))
+
+EXPORT_COLUMNS = [column.name for column in DefAsyncTaskRequest.__table__.columns]
+EXPORT_FILTERS = ("status", "executor", "user_schedule_name", "redbeat_schedule_name",
+                  "schedule_type", "workflow_run_id")
+
+# Read by the list views themselves (keyset cursor, live state), whatever ?fields= asks for
+LIST_KEY_COLUMNS = ("task_id", "creation_date")
+# Served by /view_requests/<task_id>/result; list views can leave them out with ?fields=
+HEAVY_COLUMNS = ("result", "args", "kwargs", "parameters", "schedule")
+
+
+@async_task_bp.route('/view_requests/export', methods=['GET'])
+@jwt_required()
+def export_requests():
+    """
+    Stream task history as NDJSON (default) or CSV.
+
+    ?format=ndjson|csv  ?columns=task_id,status,...  ?from=&to= (ISO) or ?days=
+    (default EXPORT_DEFAULT_DAYS)  ?task_name= (search)  plus exact filters on
+    status, executor, user_schedule_name, redbeat_schedule_name,
+    schedule_type, workflow_run_id.
+    """
+    try:
+        fmt = request.args.get('format', 'ndjson').lower()
+        if fmt not in EXPORT_FORMATS:
+            return make_response(jsonify({"error": f"format must be one of: {', '.join(EXPORT_FORMATS)}"}), 400)
+
+        columns = [name.strip() for name in request.args.get('columns', '').split(',') if name.strip()] or EXPORT_COLUMNS
+        unknown = [name for name in columns if name not in EXPORT_COLUMNS]
+        if unknown:
+            return make_response(jsonify({"error": f"Unknown columns: {', '.join(unknown)}"}), 400)
+
+        try:
+            date_from = datetime.fromisoformat(request.args['from']) if request.args.get('from') else None
+            date_to = datetime.fromisoformat(request.args['to']) if request.args.get('to') else None
+        except ValueError:
+            return make_response(jsonify({"error": "from/to must be ISO dates"}), 400)
+        if date_from is None:
+            days = request.args.get('days', EXPORT_DEFAULT_DAYS, type=int)
+            date_from = (date_to or datetime.utcnow()) - timedelta(days=days)
+
+        table = DefAsyncTaskRequest.__table__
+        # Core select of plain tuples; the creation_date range prunes partitions
+        stmt = select(*[table.c[name] for name in columns]).where(table.c.creation_date >= date_from)
+        if date_to is not None:
+            stmt = stmt.where(table.c.creation_date < date_to)
+        stmt = apply_search(stmt, request.args.get('task_name', ''), table.c.task_name)
+        for name in EXPORT_FILTERS:
+            if request.args.get(name):
+                stmt = stmt.where(table.c[name] == request.args[name])
+        stmt = stmt.order_by(table.c.creation_date.desc(), table.c.request_id.desc())
+
+        def generate():
+            # yield_per -> psycopg2 named (server-side) cursor, EXPORT_BATCH_SIZE rows at a time
+            result = db.session.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+            try:
+                yield from stream_rows(result, columns, fmt, flush_every=EXPORT_BATCH_SIZE)
+            finally:
+                result.close()
+                db.session.rollback()
+
+        filename = f"task_requests_{date_from:%Y%m%d}.{'csv' if fmt == 'csv' else 'ndjson'}"
+        return Response(
+            stream_with_context(generate()),
+            mimetype=EXPORT_FORMATS[fmt],
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+        )
+
+    except Exception as e:
+        return make_response(jsonify({"error": str(e)}), 500)
+
 @async_task_bp.route('/view_requests_v1', methods=['GET'])
 @jwt_required()
 def get_all_tasks():
     try:
         fourteen_days = datetime.utcnow() - timedelta(days=2)
-        tasks = DefAsyncTaskRequest.query.filter(DefAsyncTaskRequest.creation_date >= fourteen_days).order_by(DefAsyncTaskRequest.creation_date.desc())
+        fields = requested_fields(DefAsyncTaskRequest)
+        tasks = project(DefAsyncTaskRequest.query, DefAsyncTaskRequest, fields).filter(DefAsyncTaskRequest.creation_date >= fourteen_days).order_by(DefAsyncTaskRequest.creation_date.desc())
         #tasks = DefAsyncTaskRequest.query.limit(100000).all()
         if not tasks:
             return jsonify({"message": "No tasks found"}), 404
-        return jsonify([task.json() for task in tasks]), 200
+        return jsonify([projected_json(task, fields) for task in tasks]), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -36,11 +117,14 @@ def get_all_tasks():
 def view_requests_v2():
     try:
         fourteen_days = datetime.utcnow() - timedelta(days=4)
-        tasks = DefAsyncTaskRequest.query.filter(DefAsyncTaskRequest.creation_date >= fourteen_days).order_by(DefAsyncTaskRequest.creation_date.desc())
+        fields = requested_fields(DefAsyncTaskRequest)
+        tasks = project(DefAsyncTaskRequest.query, DefAsyncTaskRequest, fields).filter(DefAsyncTaskRequest.creation_date >= fourteen_days).order_by(DefAsyncTaskRequest.creation_date.desc())
         #tasks = DefAsyncTaskRequest.query.limit(100000).all()
         if not tasks:
             return jsonify({"message": "No tasks found"}), 404
-        return jsonify([task.json() for task in tasks]), 200
+        return jsonify([projected_json(task, fields) for task in tasks]), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -57,7 +141,8 @@ def view_requests(page, page_limit):
         days = request.args.get('days', type=int)
         search_query = request.args.get('task_name', '').strip().lower()
 
-        query = DefAsyncTaskRequest.query
+        fields = requested_fields(DefAsyncTaskRequest)
+        query = project(DefAsyncTaskRequest.query, DefAsyncTaskRequest, fields, always=LIST_KEY_COLUMNS)
 
         # Case 1: task_name provided but days not provided -> default days = 30
         if search_query and days is None:
@@ -69,38 +154,29 @@ def view_requests(page, page_limit):
             query = query.filter(DefAsyncTaskRequest.creation_date >= cutoff_date)
 
         # Apply task_name search if provided (with TRIM to avoid space issues)
-        if search_query:
-            search_underscore = search_query.replace(' ', '_')
-            search_space = search_query.replace('_', ' ')
-            query = query.filter(or_(
-                DefAsyncTaskRequest.task_name.ilike(f'%{search_query}%'),
-                DefAsyncTaskRequest.task_name.ilike(f'%{search_underscore}%'),
-                DefAsyncTaskRequest.task_name.ilike(f'%{search_space}%')
-            ))
+        query = apply_search(query, search_query, DefAsyncTaskRequest.task_name)
 
-
-        # if search_query:
-        #     normalized_search = search_query.replace('_', ' ')
-        #     query = query.filter(or_(
-        #         func.lower(func.replace(func.trim(DefAsyncTaskRequest.task_name), '_', ' ')).ilike(f'%{normalized_search}%')
-        #     ))
-
-        # Order newest first
-        query = query.order_by(DefAsyncTaskRequest.creation_date.desc())
-
-        # Paginate results
-        paginated = query.paginate(page=page, per_page=page_limit, error_out=False)
+        # Paginate results (?cursor= switches to keyset pagination)
+        if 'cursor' in request.args:
+            paginated = keyset_paginate(query, DefAsyncTaskRequest.creation_date, DefAsyncTaskRequest.request_id, page_limit)
+        else:
+            # Order newest first
+            paginated = query.order_by(DefAsyncTaskRequest.creation_date.desc()) \
+                             .paginate(page=page, per_page=page_limit, error_out=False)
 
         if not paginated.items:
             return jsonify({"message": "No tasks found"}), 404
 
         return jsonify({
-            "items": [task.json() for task in paginated.items],
+            "items": [projected_json(task, fields) for task in paginated.items],
             "total": paginated.total,
             "pages": paginated.pages,
-            "page": paginated.page
+            "page": paginated.page,
+            "next_cursor": getattr(paginated, "next_cursor", None)
         }), 200
 
+    except ValueError as e:
+        return make_response(jsonify({"error": str(e)}), 400)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -110,33 +186,63 @@ def view_requests(page, page_limit):
 def def_async_task_requests_view_requests(page, limit):
     try:
         search_query = request.args.get('task_name', '').strip().lower()
-        search_underscore = search_query.replace(' ', '_')
-        search_space = search_query.replace('_', ' ')
         day_limit = datetime.utcnow() - timedelta(days=30)
-        query = DefAsyncTaskRequest.query.filter(DefAsyncTaskRequest.creation_date >= day_limit)
+        fields = requested_fields(DefAsyncTaskRequest)
+        query = project(DefAsyncTaskRequest.query, DefAsyncTaskRequest, fields, always=LIST_KEY_COLUMNS) \
+            .filter(DefAsyncTaskRequest.creation_date >= day_limit)
+        query = apply_search(query, search_query, DefAsyncTaskRequest.task_name)
 
-        if search_query:
-            query = query.filter(or_(
-                DefAsyncTaskRequest.task_name.ilike(f'%{search_query}%'),
-                DefAsyncTaskRequest.task_name.ilike(f'%{search_underscore}%'),
-                DefAsyncTaskRequest.task_name.ilike(f'%{search_space}%')
-            ))
-
-        paginated = query.order_by(DefAsyncTaskRequest.creation_date.desc()) \
-                         .paginate(page=page, per_page=limit, error_out=False)
+        if 'cursor' in request.args:
+            paginated = keyset_paginate(query, DefAsyncTaskRequest.creation_date, DefAsyncTaskRequest.request_id, limit)
+        else:
+            paginated = query.order_by(DefAsyncTaskRequest.creation_date.desc()) \
+                             .paginate(page=page, per_page=limit, error_out=False)
 
         return make_response(jsonify({
-            "items": [req.json() for req in paginated.items],
+            "items": [projected_json(req, fields) for req in paginated.items],
             "total": paginated.total,
             "pages": 1 if paginated.total == 0 else paginated.pages,
-            "page":  paginated.page
+            "page":  paginated.page,
+            "next_cursor": getattr(paginated, "next_cursor", None)
         }), 200)
 
+    except ValueError as e:
+        return make_response(jsonify({"error": str(e)}), 400)
     except Exception as e:
         return make_response(jsonify({"message": "Error fetching view requests", "error": str(e)}), 500)
 
 
 
+@async_task_bp.route('/view_requests/<task_id>/result', methods=['GET'])
+@jwt_required()
+def view_request_result(task_id):
+    """The heavy columns of one request: from the hot result store while it is there, else from the DB."""
+    try:
+        record = result_store.get_result(task_id)
+        if record:
+            return make_response(jsonify({
+                "task_id": task_id,
+                "status": record.get("status"),
+                "source": "result_store",
+                "result": record.get("result"),
+                "args": record.get("args"),
+                "kwargs": record.get("kwargs", record.get("parameters")),
+                "parameters": record.get("parameters"),
+                "schedule": record.get("schedule"),
+            }), 200)
+
+        fields = ["status", *HEAVY_COLUMNS]
+        task = project(DefAsyncTaskRequest.query, DefAsyncTaskRequest, fields, always=("task_id",)) \
+            .filter_by(task_id=task_id).first()
+        if not task:
+            return make_response(jsonify({"message": "Task request not found"}), 404)
+
+        return make_response(jsonify({"task_id": task_id, "source": "db", **projected_json(task, fields)}), 200)
+
+    except Exception as e:
+        return make_response(jsonify({"error": str(e)}), 500)
+
+
 @async_task_bp.route('/view_requests_v3/<int:page>/<int:limit>', methods=['GET'])
 @jwt_required()
 def combined_tasks_v3(page, limit):
@@ -144,7 +250,8 @@ def combined_tasks_v3(page, limit):
         days = request.args.get('days', type=int)
         search_query = request.args.get('task_name', '').strip().lower()
 
-        query = DefAsyncTaskRequest.query
+        fields = requested_fields(DefAsyncTaskRequest)
+        query = project(DefAsyncTaskRequest.query, DefAsyncTaskRequest, fields, always=LIST_KEY_COLUMNS)
 
         if search_query and days is None:
             days = 7
@@ -153,52 +260,45 @@ def combined_tasks_v3(page, limit):
             cutoff_date = datetime.utcnow() - timedelta(days=days)
             query = query.filter(DefAsyncTaskRequest.creation_date >= cutoff_date)
 
-        if search_query:
-            search_underscore = search_query.replace(' ', '_')
-            search_space = search_query.replace('_', ' ')
-            query = query.filter(or_(
-                DefAsyncTaskRequest.task_name.ilike(f'%{search_query}%'),
-                DefAsyncTaskRequest.task_name.ilike(f'%{search_underscore}%'),
-                DefAsyncTaskRequest.task_name.ilike(f'%{search_space}%')
-            ))
+        query = apply_search(query, search_query, DefAsyncTaskRequest.task_name)
 
-        paginated = query.order_by(DefAsyncTaskRequest.creation_date.desc()) \
-                         .paginate(page=page, per_page=limit, error_out=False)
+        if 'cursor' in request.args:
+            paginated = keyset_paginate(query, DefAsyncTaskRequest.creation_date, DefAsyncTaskRequest.request_id, limit)
+        else:
+            paginated = query.order_by(DefAsyncTaskRequest.creation_date.desc()) \
+                             .paginate(page=page, per_page=limit, error_out=False)
 
         db_tasks = paginated.items
 
-        flower_tasks = {}
+        # Live state for this page only, from the Redis task-state index
+        task_states = {}
         try:
-            res = requests.get(f"{FLOWER_URL}/api/tasks", timeout=5)
-            if res.status_code == 200:
-                flower_tasks = res.json()
-        except:
-            pass  # keep flower_tasks empty if error
+            task_states = get_states([t.task_id for t in db_tasks])
+        except Exception:
+            pass  # keep task_states empty if error
 
         items = []
 
         
         for t in db_tasks:
-            item = t.json()  # get all DB fields
-            # add Flower fields
-            if t.task_id and t.task_id in flower_tasks:
-                ftask = flower_tasks[t.task_id]
-                item["uuid"] = ftask.get("uuid")
-                item["state"] = ftask.get("state")
-                item["worker"] = ftask.get("worker")
-            else:
-                item["uuid"] = None
-                item["state"] = None
-                item["worker"] = None
+            item = projected_json(t, fields)  # DB fields (all unless ?fields=)
+            # add live state fields
+            live = task_states.get(t.task_id, {})
+            item["uuid"] = live.get("uuid")
+            item["state"] = live.get("state")
+            item["worker"] = live.get("worker")
             items.append(item)
 
         return make_response(jsonify({
             "items": items,
             "total": paginated.total,
             "pages": paginated.pages,
-            "page": paginated.page
+            "page": paginated.page,
+            "next_cursor": getattr(paginated, "next_cursor", None)
         }), 200)
 
+    except ValueError as e:
+        return make_response(jsonify({"error": str(e)}), 400)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -211,7 +311,8 @@ def combined_tasks_v4(page, limit):
         days = request.args.get('days', type=int)
         search_query = request.args.get('task_name', '').strip().lower()
 
-        query = DefAsyncTaskRequest.query
+        fields = requested_fields(DefAsyncTaskRequest)
+        query = project(DefAsyncTaskRequest.query, DefAsyncTaskRequest, fields, always=LIST_KEY_COLUMNS)
 
         if search_query and days is None:
             days = 7
@@ -220,71 +321,54 @@ def combined_tasks_v4(page, limit):
             cutoff_date = datetime.utcnow() - timedelta(days=days)
             query = query.filter(DefAsyncTaskRequest.creation_date >= cutoff_date)
 
-        if search_query:
-            search_underscore = search_query.replace(' ', '_')
-            search_space = search_query.replace('_', ' ')
-            query = query.filter(or_(
-                DefAsyncTaskRequest.task_name.ilike(f'%{search_query}%'),
-                DefAsyncTaskRequest.task_name.ilike(f'%{search_underscore}%'),
-                DefAsyncTaskRequest.task_name.ilike(f'%{search_space}%')
-            ))
+        query = apply_search(query, search_query, DefAsyncTaskRequest.task_name)
 
-        paginated = query.order_by(DefAsyncTaskRequest.creation_date.desc()) \
-                         .paginate(page=page, per_page=limit, error_out=False)
+        if 'cursor' in request.args:
+            paginated = keyset_paginate(query, DefAsyncTaskRequest.creation_date, DefAsyncTaskRequest.request_id, limit)
+        else:
+            paginated = query.order_by(DefAsyncTaskRequest.creation_date.desc()) \
+                             .paginate(page=page, per_page=limit, error_out=False)
 
         db_tasks = paginated.items
 
         # db_tasks = query.order_by(DefAsyncTaskRequest.creation_date.desc()).all()
         db_task_ids = {t.task_id for t in db_tasks if t.task_id}
 
-        flower_tasks = {}
+        # Live state from the Redis task-state index: this page's tasks plus
+        # tasks not in the DB page that did not succeed (unfinished, or
+        # recently FAILURE/REVOKED/REJECTED), as the Flower listing showed
+        task_states = {}
+        active_tasks = []
         try:
-            res = requests.get(f"{FLOWER_URL}/api/tasks", timeout=5)
-            if res.status_code == 200:
-                flower_tasks = res.json()
-        except:
-            pass  # keep flower_tasks empty if error
+            task_states = get_states(list(db_task_ids))
+            active_tasks = get_active(limit=limit, include_unsuccessful=True)
+        except Exception:
+            pass  # keep live state empty if error
 
         items = []
 
 
-        # Add Flower tasks first (skip duplicates if already in DB)
-        for tid, ftask in flower_tasks.items():
-            # if tid in db_task_ids:
-            #     continue  # skip duplicate
-            if tid in db_task_ids or ftask.get("state", "").lower() == "success":
-                continue 
-
-            args_list = []
-            try:
-                args_list = ast.literal_eval(ftask.get("args", "[]"))  # safely parse string repr
-            except Exception:
-                args_list = []
-
-            script_name          = args_list[0] if len(args_list) > 0 else None
-            user_task_name       = args_list[1] if len(args_list) > 1 else None
-            task_name            = args_list[2] if len(args_list) > 2 else None
-            user_schedule_name   = args_list[3] if len(args_list) > 3 else None
-            redbeat_schedule_name= args_list[4] if len(args_list) > 4 else None
-            schedule_type        = args_list[5] if len(args_list) > 5 else None
-            schedule_data        = args_list[6] if len(args_list) > 6 else None
+        # Add in-flight tasks first (skip duplicates if already in DB)
+        for atask in active_tasks:
+            tid = atask["task_id"]
+            if tid in db_task_ids:
+                continue
 
             items.append({
-                "uuid": ftask.get("uuid"),
+                "uuid": atask.get("uuid"),
                 "task_id": tid,
-                "script_name": script_name,
-                "user_task_name": user_task_name,
-                "task_name": task_name,                   
-                "user_schedule_name": user_schedule_name,
-                "redbeat_schedule_name": redbeat_schedule_name,
-                "schedule_type": schedule_type,
-                "schedule": schedule_data,
-                "state": ftask.get("state"),
-                "worker": ftask.get("worker"),
-                # "timestamp": ftask.get("timestamp"),
-                "result": ftask.get("result"),
-                "args": ftask.get("args"),                 
-                "kwargs": ftask.get("kwargs"),
+                "script_name": atask.get("script_name"),
+                "user_task_name": atask.get("user_task_name"),
+                "task_name": atask.get("task_name"),
+                "user_schedule_name": atask.get("user_schedule_name"),
+                "redbeat_schedule_name": atask.get("redbeat_schedule_name"),
+                "schedule_type": atask.get("schedule_type"),
+                "schedule": atask.get("schedule"),
+                "state": atask.get("state"),
+                "worker": atask.get("worker"),
+                "result": None,
+                "args": atask.get("args"),
+                "kwargs": atask.get("kwargs"),
                 "parameters": None,                        # DB-only field
                 "request_id": None,
                 "executor": None,
@@ -296,17 +380,12 @@ def combined_tasks_v4(page, limit):
 
         
         for t in db_tasks:
-            item = t.json()  # get all DB fields
-            # add Flower fields
-            if t.task_id and t.task_id in flower_tasks:
-                ftask = flower_tasks[t.task_id]
-                item["uuid"] = ftask.get("uuid")
-                item["state"] = ftask.get("state")
-                item["worker"] = ftask.get("worker")
-            else:
-                item["uuid"] = None
-                item["state"] = None
-                item["worker"] = None
+            item = projected_json(t, fields)  # DB fields (all unless ?fields=)
+            # add live state fields
+            live = task_states.get(t.task_id, {})
+            item["uuid"] = live.get("uuid")
+            item["state"] = live.get("state")
+            item["worker"] = live.get("worker")
             items.append(item)
 
         
@@ -316,7 +395,8 @@ def combined_tasks_v4(page, limit):
             "items": items,
             "total": paginated.total,
             "pages": paginated.pages,
-            "page": paginated.page
+            "page": paginated.page,
+            "next_cursor": getattr(paginated, "next_cursor", None)
         }), 200)
     
 
@@ -335,6 +415,8 @@ def combined_tasks_v4(page, limit):
         #     "page": page
         # }), 200)
 
+    except ValueError as e:
+        return make_response(jsonify({"error": str(e)}), 400)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
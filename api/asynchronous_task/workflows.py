@@ -0,0 +1,192 @@
+from flask import request, jsonify, make_response
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from datetime import datetime
+
+from executors.extensions import db
+from executors.models import (
+    DefAsyncWorkflow,
+    DefAsyncWorkflowNode,
+    DefAsyncWorkflowRun,
+    DefAsyncTaskRequest
+)
+from executors.workflow import WorkflowError, validate_nodes, validate_max_concurrency, start_run
+from . import async_task_bp
+
+
+def _build_nodes(nodes, user_id):
+    return [
+        DefAsyncWorkflowNode(
+            node_name = node.get('node_name'),
+            task_name = node.get('task_name'),
+            parameters = node.get('parameters') or {},
+            param_mappings = node.get('param_mappings') or {},
+            depends_on = node.get('depends_on') or [],
+            created_by = user_id,
+            creation_date = datetime.utcnow(),
+            last_updated_by = user_id,
+            last_update_date = datetime.utcnow()
+        )
+        for node in nodes
+    ]
+
+
+@async_task_bp.route('/Create_Workflow', methods=['POST'])
+@jwt_required()
+def Create_Workflow():
+    try:
+        workflow_name = request.json.get('workflow_name')
+        nodes = request.json.get('nodes') or []
+
+        if not workflow_name:
+            return make_response(jsonify({"error": "workflow_name is required"}), 400)
+        if DefAsyncWorkflow.query.filter_by(workflow_name=workflow_name).first():
+            return make_response(jsonify({"error": f"Workflow '{workflow_name}' already exists"}), 409)
+
+        layers = validate_nodes(nodes)
+
+        user_id = get_jwt_identity()
+        workflow = DefAsyncWorkflow(
+            workflow_name = workflow_name,
+            description = request.json.get('description'),
+            max_concurrency = validate_max_concurrency(request.json.get('max_concurrency')),
+            cancelled_yn = 'N',
+            created_by = user_id,
+            creation_date = datetime.utcnow(),
+            last_updated_by = user_id,
+            last_update_date = datetime.utcnow()
+        )
+        workflow.nodes = _build_nodes(nodes, user_id)
+        db.session.add(workflow)
+        db.session.commit()
+
+        return make_response(jsonify({
+            "message": "Added successfully",
+            "workflow_id": workflow.workflow_id,
+            "layers": layers
+        }), 201)
+
+    except WorkflowError as e:
+        db.session.rollback()
+        return make_response(jsonify({"error": str(e)}), 400)
+    except Exception as e:
+        db.session.rollback()
+        return make_response(jsonify({"message": "Error creating workflow", "error": str(e)}), 500)
+
+
+@async_task_bp.route('/def_async_workflows', methods=['GET'])
+@jwt_required()
+def Show_Workflows():
+    try:
+        workflows = DefAsyncWorkflow.query.order_by(DefAsyncWorkflow.workflow_id.desc()).all()
+        return make_response(jsonify([workflow.json() for workflow in workflows]), 200)
+    except Exception as e:
+        return make_response(jsonify({"message": "Error getting workflows", "error": str(e)}), 500)
+
+
+@async_task_bp.route('/def_async_workflows/<int:workflow_id>', methods=['GET'])
+@jwt_required()
+def Show_Workflow(workflow_id):
+    try:
+        workflow = DefAsyncWorkflow.query.get(workflow_id)
+        if not workflow:
+            return make_response(jsonify({"message": "Workflow not found"}), 404)
+        return make_response(jsonify(workflow.json()), 200)
+    except Exception as e:
+        return make_response(jsonify({"message": "Error getting the workflow", "error": str(e)}), 500)
+
+
+@async_task_bp.route('/Update_Workflow/<int:workflow_id>', methods=['PUT'])
+@jwt_required()
+def Update_Workflow(workflow_id):
+    try:
+        workflow = DefAsyncWorkflow.query.get(workflow_id)
+        if not workflow:
+            return make_response(jsonify({"message": "Workflow not found"}), 404)
+
+        user_id = get_jwt_identity()
+        if 'description' in request.json:
+            workflow.description = request.json.get('description')
+        if 'max_concurrency' in request.json:
+            workflow.max_concurrency = validate_max_concurrency(request.json.get('max_concurrency'))
+        if 'nodes' in request.json:
+            # Nodes are replaced as a whole so the graph is always validated together
+            nodes = request.json.get('nodes') or []
+            validate_nodes(nodes)
+            workflow.nodes = _build_nodes(nodes, user_id)
+        workflow.last_updated_by = user_id
+        workflow.last_update_date = datetime.utcnow()
+
+        db.session.commit()
+        return make_response(jsonify({"message": "Edited successfully"}), 200)
+
+    except WorkflowError as e:
+        db.session.rollback()
+        return make_response(jsonify({"error": str(e)}), 400)
+    except Exception as e:
+        db.session.rollback()
+        return make_response(jsonify({"message": "Error editing workflow", "error": str(e)}), 500)
+
+
+@async_task_bp.route('/Cancel_Workflow/<int:workflow_id>', methods=['PUT'])
+@jwt_required()
+def Cancel_Workflow(workflow_id):
+    try:
+        workflow = DefAsyncWorkflow.query.get(workflow_id)
+        if not workflow:
+            return make_response(jsonify({"message": "Workflow not found"}), 404)
+
+        workflow.cancelled_yn = 'Y'
+        workflow.last_updated_by = get_jwt_identity()
+        workflow.last_update_date = datetime.utcnow()
+        db.session.commit()
+        return make_response(jsonify({"message": "Cancelled successfully"}), 200)
+
+    except Exception as e:
+        return make_response(jsonify({"message": "Error cancelling workflow", "error": str(e)}), 500)
+
+
+@async_task_bp.route('/Run_Workflow/<int:workflow_id>', methods=['POST'])
+@jwt_required()
+def Run_Workflow(workflow_id):
+    try:
+        workflow = DefAsyncWorkflow.query.get(workflow_id)
+        if not workflow:
+            return make_response(jsonify({"message": "Workflow not found"}), 404)
+
+        overrides = (request.get_json(silent=True) or {}).get('parameters') or {}
+        run = start_run(workflow, overrides, created_by=get_jwt_identity())
+
+        return make_response(jsonify({
+            "message": "Workflow started",
+            "run_id": run.run_id,
+            "node_task_ids": run.node_task_ids
+        }), 202)
+
+    except WorkflowError as e:
+        db.session.rollback()
+        return make_response(jsonify({"error": str(e)}), 400)
+    except Exception as e:
+        db.session.rollback()
+        return make_response(jsonify({"message": "Error starting workflow", "error": str(e)}), 500)
+
+
+@async_task_bp.route('/def_async_workflow_runs/<int:run_id>', methods=['GET'])
+@jwt_required()
+def Show_Workflow_Run(run_id):
+    try:
+        run = DefAsyncWorkflowRun.query.get(run_id)
+        if not run:
+            return make_response(jsonify({"message": "Workflow run not found"}), 404)
+
+        # Node rows live in the partitions around the run's start
+        nodes = DefAsyncTaskRequest.query.filter(
+            DefAsyncTaskRequest.workflow_run_id == run_id,
+            DefAsyncTaskRequest.creation_date >= run.creation_date
+        ).order_by(DefAsyncTaskRequest.request_id).all()
+
+        result = run.json()
+        result["nodes"] = [node.json() for node in nodes]
+        return make_response(jsonify(result), 200)
+
+    except Exception as e:
+        return make_response(jsonify({"message": "Error getting workflow run", "error": str(e)}), 500)
@@ -2,7 +2,7 @@ from flask import request, jsonify, make_response
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
 
-from sqlalchemy import or_
+from utils.search import apply_search
 
 from utils.auth import role_required
 from executors.extensions import db
@@ -41,15 +41,7 @@ def get_control_environments():
 
         # Filter by name (supports underscores/spaces)
         if name:
-            search_underscore = name.replace(" ", "_")
-            search_space = name.replace("_", " ")
-            query = query.filter(
-                or_(
-                    DefControlEnvironment.name.ilike(f"%{name}%"),
-                    DefControlEnvironment.name.ilike(f"%{search_underscore}%"),
-                    DefControlEnvironment.name.ilike(f"%{search_space}%"),
-                )
-            )
+            query = apply_search(query, name, DefControlEnvironment.name)
 
         # Order by latest first
         query = query.order_by(DefControlEnvironment.control_environment_id.desc())
@@ -2,9 +2,10 @@ from flask import request, jsonify, make_response
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
 
-from sqlalchemy import or_
+from utils.search import apply_search
 
 from utils.auth import role_required
+from utils.response_cache import cached_response, invalidate_responses
 from executors.extensions import db
 from executors.models import (
     DefControl
@@ -20,6 +21,7 @@ from . import controls_bp
 #DEF_CONTROLS
 @controls_bp.route('/def_controls', methods=['GET'])
 @jwt_required()
+@cached_response("def_controls")
 def get_def_controls():
     try:
         def_control_id = request.args.get('def_control_id', type=int)
@@ -38,16 +40,7 @@ def get_def_controls():
 
         # Case 2: Search
         if control_name:
-            search_query = control_name.strip()
-            search_underscore = search_query.replace(' ', '_')
-            search_space = search_query.replace('_', ' ')
-            query = query.filter(
-                or_(
-                    DefControl.control_name.ilike(f'%{search_query}%'),
-                    DefControl.control_name.ilike(f'%{search_underscore}%'),
-                    DefControl.control_name.ilike(f'%{search_space}%')
-                )
-            )
+            query = apply_search(query, control_name, DefControl.control_name)
 
         # Case 3: Pagination (Search or just List)
         if page and limit:
@@ -92,6 +85,7 @@ def create_control():
         )
         db.session.add(new_control)
         db.session.commit()
+        invalidate_responses("def_controls")
         return make_response(jsonify({'message': 'Added successfully'}), 201)
     except Exception as e:
         return make_response(jsonify({'message': 'Error adding control', 'error': str(e)}), 500)
@@ -127,6 +121,7 @@ def update_control():
             control.last_update_date = datetime.utcnow()
 
             db.session.commit()
+            invalidate_responses("def_controls")
             return make_response(jsonify({'message': 'Edited successfully'}), 200)
         return make_response(jsonify({'message': 'Control not found'}), 404)
     except Exception as e:
@@ -145,6 +140,7 @@ def delete_control():
         if control:
             db.session.delete(control)
             db.session.commit()
+            invalidate_responses("def_controls")
             return make_response(jsonify({'message': 'Deleted successfully'}), 200)
         return make_response(jsonify({'message': 'Control not found'}), 404)
     except Exception as e:
@@ -1,7 +1,8 @@
 from datetime import datetime
 from flask import request, jsonify, make_response 
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from sqlalchemy import or_
+from utils.search import apply_search
+from utils.response_cache import cached_response, invalidate_responses
 from executors.extensions import db
 from executors.models import (
     DefDataSource
@@ -32,6 +33,7 @@ def create_def_data_source():
         )
         db.session.add(new_datasource)
         db.session.commit()
+        invalidate_responses("def_data_sources")
         return make_response(jsonify({'message': 'Added successfully'}), 201)
     except Exception as e:
         return make_response(jsonify({'message': 'Error creating data source', 'error': str(e)}), 500)
@@ -39,6 +41,7 @@ def create_def_data_source():
 
 @data_sources_bp.route('/def_data_sources', methods=['GET'])
 @jwt_required()
+@cached_response("def_data_sources")
 def get_def_data_sources():
     try:
         def_data_source_id = request.args.get('def_data_source_id', type=int)
@@ -57,16 +60,7 @@ def get_def_data_sources():
 
         # Case 2: Search
         if datasource_name:
-            search_query = datasource_name.strip()
-            search_underscore = search_query.replace(' ', '_')
-            search_space = search_query.replace('_', ' ')
-            query = query.filter(
-                or_(
-                    DefDataSource.datasource_name.ilike(f'%{search_query}%'),
-                    DefDataSource.datasource_name.ilike(f'%{search_underscore}%'),
-                    DefDataSource.datasource_name.ilike(f'%{search_space}%')
-                )
-            )
+            query = apply_search(query, datasource_name, DefDataSource.datasource_name)
 
         # Case 3: Pagination (Search or just List)
         if page and limit:
@@ -107,6 +101,7 @@ def update_def_data_source():
             ds.last_updated_by = get_jwt_identity()
             ds.last_update_date = datetime.utcnow()
             db.session.commit()
+            invalidate_responses("def_data_sources")
             return make_response(jsonify({'message': 'Edited successfully'}), 200)
         return make_response(jsonify({'message': 'Data source not found'}), 404)
     except Exception as e:
@@ -125,6 +120,7 @@ def delete_def_data_source():
         if ds:
             db.session.delete(ds)
             db.session.commit()
+            invalidate_responses("def_data_sources")
             return make_response(jsonify({'message': 'Deleted successfully'}), 200)
         return make_response(jsonify({'message': 'Data source not found'}), 404)
     except Exception as e:
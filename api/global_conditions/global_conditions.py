@@ -1,4 +1,4 @@
-from sqlalchemy import or_
+from utils.search import apply_search
 from datetime import datetime
 from flask import request, jsonify, make_response       # Flask utilities for handling requests and responses
 
@@ -62,15 +62,7 @@ def get_def_global_conditions():
 
         # Case 2: Search by name
         if name:
-            search_underscore = name.replace(' ', '_')
-            search_space = name.replace('_', ' ')
-            query = query.filter(
-                or_(
-                    DefGlobalCondition.name.ilike(f'%{name}%'),
-                    DefGlobalCondition.name.ilike(f'%{search_underscore}%'),
-                    DefGlobalCondition.name.ilike(f'%{search_space}%')
-                )
-            )
+            query = apply_search(query, name, DefGlobalCondition.name)
 
         # Order by ID descending
         query = query.order_by(DefGlobalCondition.def_global_condition_id.desc())
@@ -4,6 +4,7 @@ from flask import request, jsonify, make_response
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from executors.extensions import db
 from utils.auth import role_required
+from utils.rbac_cache import invalidate_all
 
 from executors.models import (
     DefApiEndpoint,
@@ -65,6 +66,7 @@ def create_api_endpoint_role():
 
         db.session.add(new_mapping)
         db.session.commit()
+        invalidate_all()
 
         return make_response(jsonify(new_mapping.json()), 201)
 
@@ -147,6 +149,7 @@ def update_api_endpoint_role():
         record.last_update_date = datetime.utcnow()
 
         db.session.commit()
+        invalidate_all()
 
         return make_response(jsonify({
             "message": "Edited successfully",
@@ -188,6 +191,7 @@ def delete_api_endpoint_role():
 
         db.session.delete(record)
         db.session.commit()
+        invalidate_all()
 
         return make_response(jsonify({
             "message": "Deleted successfully"}), 200)
@@ -9,6 +9,7 @@ from executors.models import (
 )
 
 from utils.auth import role_required
+from utils.rbac_cache import invalidate_all
 
 from . import rbac_bp
 
@@ -120,6 +121,7 @@ def update_api_endpoint():
         row.last_update_date = datetime.utcnow()
 
         db.session.commit()
+        invalidate_all()
         return make_response(jsonify({'message': 'Edited successfully'}), 200)
 
     except Exception as e:
@@ -146,6 +148,7 @@ def delete_api_endpoint():
 
         db.session.delete(row)
         db.session.commit()
+        invalidate_all()
 
         return make_response(jsonify({'message': 'Deleted successfully'}), 200)
 
@@ -10,12 +10,15 @@ from executors.models import (
 
 
 from utils.auth import role_required
+from utils.response_cache import cached_response, invalidate_responses
+from utils.rbac_cache import invalidate_all
 
 from . import rbac_bp
 
 
 @rbac_bp.route('/def_privileges', methods=['GET'])
 @jwt_required()
+@cached_response("def_privileges")
 def get_def_privileges():
     try:
         privilege_id = request.args.get("privilege_id", type=int)
@@ -69,6 +72,7 @@ def create_def_privilege():
 
         db.session.add(new_record)
         db.session.commit()
+        invalidate_responses("def_privileges")
 
         return make_response(new_record.json(), 201)
 
@@ -102,6 +106,7 @@ def update_privilege():
         privilege.last_update_date = datetime.utcnow()
 
         db.session.commit()
+        invalidate_responses("def_privileges")
 
         return make_response(jsonify({'message': 'Edited successfully'}), 200)
 
@@ -129,6 +134,8 @@ def delete_privilege():
 
         db.session.delete(privilege)
         db.session.commit()
+        invalidate_responses("def_privileges")
+        invalidate_all()
 
         return make_response(jsonify({'message': 'Deleted successfully'}), 200)
 
@@ -12,6 +12,8 @@ from executors.models import (
 
 
 from utils.auth import role_required
+from utils.response_cache import cached_response, invalidate_responses
+from utils.rbac_cache import invalidate_all
 from api.rbac import rbac_bp
 
 
@@ -43,6 +45,7 @@ def create_role():
 
         db.session.add(new_role)
         db.session.commit()
+        invalidate_responses("def_roles")
 
         return make_response(jsonify({'message': 'Added successfully'}), 201)
 
@@ -56,6 +59,7 @@ def create_role():
 
 @rbac_bp.route('/def_roles', methods=['GET'])
 @jwt_required()
+@cached_response("def_roles")
 def get_roles():
     try:
         role_id = request.args.get("role_id", type=int)
@@ -104,6 +108,7 @@ def update_role():
         role.last_update_date = datetime.utcnow()
 
         db.session.commit()
+        invalidate_responses("def_roles")
 
         return make_response(jsonify({'message': 'Edited successfully'}), 200)
 
@@ -131,6 +136,8 @@ def delete_role():
 
         db.session.delete(role)
         db.session.commit()
+        invalidate_responses("def_roles")
+        invalidate_all()
 
         return make_response(jsonify({'message': 'Deleted successfully'}), 200)
 
@@ -12,6 +12,7 @@ from executors.models import (
 )
 
 from utils.auth import role_required
+from utils.rbac_cache import invalidate_user
 from . import rbac_bp
 
 
@@ -75,6 +76,7 @@ def create_user_granted_privileges():
             new_mappings.append(new_mapping)
 
         db.session.commit()
+        invalidate_user(user_id)
 
         # Return response with success message
         return make_response(jsonify({
@@ -199,6 +201,7 @@ def update_user_granted_privileges():
             )
 
         db.session.commit()
+        invalidate_user(user_id)
 
         return make_response(jsonify({
             "message": "Edited successfully",
@@ -238,6 +241,7 @@ def delete_user_granted_privilege():
 
         db.session.delete(record)
         db.session.commit()
+        invalidate_user(user_id)
 
         return make_response(jsonify({"message": "Deleted successfully"}), 200)
 
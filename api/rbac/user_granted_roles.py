@@ -12,6 +12,7 @@ from executors.models import (
 )
 
 from utils.auth import role_required
+from utils.rbac_cache import invalidate_user
 from . import rbac_bp
 
 
@@ -76,6 +77,7 @@ def create_user_granted_roles():
             new_mappings.append(new_mapping)
 
         db.session.commit()
+        invalidate_user(user_id)
 
         # Return response with success message
         return make_response(jsonify({
@@ -203,6 +205,7 @@ def update_user_granted_roles():
             mapping.last_update_date = now
 
         db.session.commit()
+        invalidate_user(user_id)
 
         return make_response(jsonify({
             "message": "Edited successfully",
@@ -249,6 +252,7 @@ def delete_user_granted_role():
 
         db.session.delete(mapping)
         db.session.commit()
+        invalidate_user(user_id)
 
         return make_response(jsonify({"message": "Deleted successfully"}), 200)
 
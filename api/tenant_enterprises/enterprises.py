@@ -12,6 +12,7 @@ from executors.models import (
     DefTenantEnterpriseSetupV
 )
 
+from utils.response_cache import cached_response, invalidate_responses
 from . import tenant_enterprise_bp
 
 # Create enterprise setup
@@ -36,6 +37,7 @@ def create_enterprise(tenant_id):
 
         db.session.add(new_enterprise)
         db.session.commit()
+        invalidate_responses("enterprises")
         return make_response(jsonify({"message": "Added successfully"}), 201)
 
     except IntegrityError:
@@ -96,6 +98,7 @@ def create_update_enterprise():
             message = "Added successfully"
 
         db.session.commit()
+        invalidate_responses("enterprises")
         return make_response(jsonify({"message": message, "result": new_enterprise.json() if not existing_enterprise else existing_enterprise.json()}), 200)
 
     except IntegrityError:
@@ -108,6 +111,7 @@ def create_update_enterprise():
 #Get all enterprise setups
 @tenant_enterprise_bp.route('/get_enterprises', methods=['GET'])
 @jwt_required()
+@cached_response("enterprises")
 def get_enterprises():
     try:
         setups = DefTenantEnterpriseSetup.query.order_by(DefTenantEnterpriseSetup.tenant_id.desc()).all()
@@ -116,6 +120,7 @@ def get_enterprises():
         return make_response(jsonify({"message": "Error retrieving enterprise setups", "error": str(e)}), 500)
 
 @tenant_enterprise_bp.route('/get_enterprises/v1', methods=['GET'])
+@cached_response("enterprises")
 def get_enterprises_v1():
     try:
         setups = DefTenantEnterpriseSetup.query.order_by(DefTenantEnterpriseSetup.tenant_id.desc()).all()
@@ -141,6 +146,7 @@ def update_enterprise(tenant_id):
             setup.last_updated_by = get_jwt_identity()
             setup.last_update_date = datetime.utcnow()
             db.session.commit()
+            invalidate_responses("enterprises")
             return make_response(jsonify({"message": "Edited successfully"}), 200)
         return make_response(jsonify({"message": "Enterprise setup not found"}), 404)
     except Exception as e:
@@ -160,6 +166,7 @@ def delete_enterprise():
         if setup:
             db.session.delete(setup)
             db.session.commit()
+            invalidate_responses("enterprises")
             return make_response(jsonify({"message": "Enterprise setup deleted successfully"}), 200)
         return make_response(jsonify({"message": "Enterprise setup not found"}), 404)
     except Exception as e:
@@ -173,6 +180,7 @@ def delete_enterprise():
 
 @tenant_enterprise_bp.route('/def_tenant_enterprise_setup', methods=['GET'])
 @jwt_required()
+@cached_response("enterprises")
 def get_tenant_enterprise_setup():
     try:
         # Base query using the View model
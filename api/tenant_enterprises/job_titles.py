@@ -10,6 +10,7 @@ from executors.models import (
 )
 
 
+from utils.response_cache import cached_response, invalidate_responses
 from . import tenant_enterprise_bp
 
 @tenant_enterprise_bp.route('/job_titles', methods=['POST'])
@@ -38,6 +39,7 @@ def create_job_title():
         )
         db.session.add(new_title)
         db.session.commit()
+        invalidate_responses("job_titles")
         return jsonify({
             "message": "Added successfully",
             "job_title_id": new_title.job_title_id
@@ -49,6 +51,7 @@ def create_job_title():
 
 @tenant_enterprise_bp.route('/job_titles', methods=['GET'])
 @jwt_required()
+@cached_response("job_titles")
 def get_job_titles():
     try:
         job_title_id = request.args.get('job_title_id', type=int)
@@ -134,6 +137,7 @@ def update_job_title():
         title.last_updated_by  = get_jwt_identity()
         title.last_update_date = datetime.utcnow()
         db.session.commit()
+        invalidate_responses("job_titles")
 
         return jsonify({
             "message": "Edited successfully",
@@ -163,6 +167,7 @@ def delete_job_title():
 
         db.session.delete(title)
         db.session.commit()
+        invalidate_responses("job_titles")
         return jsonify({"message": "Deleted successfully"}), 200
 
     except Exception as e:
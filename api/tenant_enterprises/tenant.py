@@ -1,5 +1,5 @@
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import or_
+from utils.search import apply_search
 from datetime import datetime
 from flask import request, jsonify, make_response       # Flask utilities for handling requests and responses
 from flask_jwt_extended import jwt_required, get_jwt_identity
@@ -14,6 +14,7 @@ from executors.models import (
 
 from . import tenant_enterprise_bp
 from utils.auth import role_required
+from utils.response_cache import invalidate_responses
 
 
 
@@ -104,18 +105,7 @@ def get_paginated_tenants(page, limit):
 def search_tenants(page, limit):
     try:
         search_query = request.args.get('tenant_name', '').strip()
-        search_underscore = search_query.replace(' ', '_')
-        search_space = search_query.replace('_', ' ')
-        query = DefTenant.query
-
-        if search_query:
-            query = query.filter(
-                or_(
-                    DefTenant.tenant_name.ilike(f'%{search_query}%'),
-                    DefTenant.tenant_name.ilike(f'%{search_underscore}%'),
-                    DefTenant.tenant_name.ilike(f'%{search_space}%')
-                )
-            )
+        query = apply_search(DefTenant.query, search_query, DefTenant.tenant_name)
 
         paginated = query.order_by(DefTenant.tenant_id.desc()).paginate(page=page, per_page=limit, error_out=False)
 
@@ -160,6 +150,8 @@ def update_tenant():
             tenant.last_update_date = datetime.utcnow()
 
             db.session.commit()
+            # Cached enterprise setup lists include tenant_name; job titles are per tenant
+            invalidate_responses("enterprises", "job_titles")
             return make_response(jsonify({"message": "Edited successfully"}), 200)
         return make_response(jsonify({"message": "Tenant not found"}), 404)
     except Exception as e:
@@ -179,6 +171,7 @@ def delete_tenant():
         if user:
             db.session.delete(user)
             db.session.commit()
+            invalidate_responses("enterprises", "job_titles")
             return make_response(jsonify({"message": "Deleted successfully"}), 200)
         return make_response(jsonify({"message": "Tenant not found"}), 404)
     except Exception as e:
@@ -203,6 +196,7 @@ def delete_tenant_and_related():
 
         db.session.delete(tenant)
         db.session.commit()
+        invalidate_responses("enterprises", "job_titles")
 
         return jsonify({
             "message": f"Deleted successfully"
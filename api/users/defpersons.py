@@ -1,6 +1,6 @@
 from flask import request, jsonify, make_response
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from sqlalchemy import or_, func
+from utils.search import apply_search
 from datetime import datetime
 from utils.auth import role_required
 from executors.extensions import db
@@ -78,21 +78,7 @@ def get_paginated_persons(page, limit):
 def search_def_persons(page, limit):
     try:
         search_query = request.args.get('name', '').strip().lower()
-        search_underscore = search_query.replace(' ', '_')
-        search_space = search_query.replace('_', ' ')
-        query = DefPerson.query
-
-        if search_query:
-            query = query.filter(
-                or_(
-                    func.lower(DefPerson.first_name).ilike(f'%{search_query}%'),
-                    func.lower(DefPerson.first_name).ilike(f'%{search_underscore}%'),
-                    func.lower(DefPerson.first_name).ilike(f'%{search_space}%'),
-                    func.lower(DefPerson.last_name).ilike(f'%{search_query}%'),
-                    func.lower(DefPerson.last_name).ilike(f'%{search_underscore}%'),
-                    func.lower(DefPerson.last_name).ilike(f'%{search_space}%')
-                )
-            )
+        query = apply_search(DefPerson.query, search_query, DefPerson.first_name, DefPerson.last_name)
 
         paginated = query.order_by(DefPerson.user_id.desc()).paginate(page=page, per_page=limit, error_out=False)
 
@@ -2,7 +2,7 @@ from flask import request, jsonify, make_response
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
 
-from sqlalchemy import or_
+from utils.search import apply_search
 
 from utils.auth import role_required
 from executors.extensions import db
@@ -101,18 +101,7 @@ def get_paginated_def_users(page, limit):
 def search_def_users(page, limit):
     try:
         search_query = request.args.get('user_name', '').strip().lower()
-        search_underscore = search_query.replace(' ', '_')
-        search_space = search_query.replace('_', ' ')
-        query = DefUser.query
-
-        if search_query:
-            query = query.filter(
-                or_(
-                    DefUser.user_name.ilike(f'%{search_query}%'),
-                    DefUser.user_name.ilike(f'%{search_underscore}%'),
-                    DefUser.user_name.ilike(f'%{search_space}%')
-                )
-            )
+        query = apply_search(DefUser.query, search_query, DefUser.user_name)
 
         paginated = query.order_by(DefUser.user_id.desc()).paginate(page=page, per_page=limit, error_out=False)
 
@@ -5,10 +5,15 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 
 from executors.extensions import db
 from utils.auth import role_required
+from utils.projection import requested_fields
+from utils.pagination import paginate_rows
+from utils.rows import RowSerializer
 from executors.models import(DefUser, 
                              DefPerson, DefUsersView, DefUserCredential, DefAccessProfile, NewUserInvitation)
 from . import users_bp
 
+# def_users_v rows straight to dicts (no ORM instances) for the read-only listing
+USERS_VIEW_ROWS = RowSerializer(DefUsersView, isoformat=("date_of_birth",))
 
 
 
@@ -129,21 +134,25 @@ def register_user():
 @jwt_required()
 def get_users_unified():
     try:
+        # ?fields=user_id,user_name,... skips the other columns (profile_picture, granted_roles)
+        fields = requested_fields(DefUsersView)
+
         # Check for specific user ID
         user_id = request.args.get('user_id', type=int)
         if user_id:
-            user = DefUsersView.query.filter_by(user_id=user_id).first()
-            if user:
-                return make_response(jsonify({"result" : user.json()}), 200)
+            stmt = USERS_VIEW_ROWS.select(fields).where(DefUsersView.user_id == user_id)
+            users = USERS_VIEW_ROWS.dicts(db.session.execute(stmt), fields)
+            if users:
+                return make_response(jsonify({"result" : users[0]}), 200)
             return make_response(jsonify({'message': 'User not found'}), 404)
 
         # Base query
-        query = DefUsersView.query
+        query = USERS_VIEW_ROWS.select(fields)
 
         # Search filter
         user_name = request.args.get('user_name', '').strip()
         if user_name:
-            query = query.filter(DefUsersView.user_name.ilike(f'%{user_name}%'))
+            query = query.where(DefUsersView.user_name.ilike(f'%{user_name}%'))
 
         # Ordering
         query = query.order_by(DefUsersView.user_id.desc())
@@ -153,18 +162,20 @@ def get_users_unified():
         limit = request.args.get('limit', type=int)
 
         if page and limit:
-            paginated = query.paginate(page=page, per_page=limit, error_out=False)
+            paginated = paginate_rows(query, page, limit)
             return make_response(jsonify({
-                "result": [user.json() for user in paginated.items],
+                "result": USERS_VIEW_ROWS.dicts(paginated.items, fields),
                 "total": paginated.total,
                 "pages": paginated.pages,
                 "page": paginated.page
             }), 200)
         
         # Return all if no pagination
-        users = query.all()
-        return make_response(jsonify({"result": [user.json() for user in users]}), 200)
+        users = USERS_VIEW_ROWS.dicts(db.session.execute(query), fields)
+        return make_response(jsonify({"result": users}), 200)
 
+    except ValueError as e:
+        return make_response(jsonify({'message': 'Invalid fields', 'error': str(e)}), 400)
     except Exception as e:
         return make_response(jsonify({'message': 'Error fetching users', 'error': str(e)}), 500)
 
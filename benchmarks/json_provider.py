@@ -0,0 +1,118 @@
+"""
+Flask's DefaultJSONProvider vs utils.json_provider.OrjsonProvider on
+payloads shaped like the big list endpoints (GET /users/users,
+/async_task/def_async_tasks, /access_points/def_access_points_view and a
+task-request page with JSON results).
+
+    python -m benchmarks.json_provider [--rows 10000] [--repeat 5]
+
+Run from the repository root. Only needs flask and orjson; no database.
+Checks that both providers produce the same JSON before timing them.
+"""
+import json
+import time
+import uuid
+import argparse
+from decimal import Decimal
+from datetime import datetime, date, timedelta
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from utils.json_provider import OrjsonProvider
+
+
+def users(n):
+    now = datetime(2025, 1, 1, 8, 30)
+    return {"result": [{
+        "user_id": i,
+        "user_name": f"user{i}",
+        "first_name": "Ana", "middle_name": None, "last_name": "Ruiz",
+        "email_address": f"user{i}@example.com",
+        "date_of_birth": date(1990, 1, 1).isoformat(),
+        "job_title_id": i % 40,
+        "user_type": "person",
+        "created_by": 1, "creation_date": now - timedelta(days=i % 365),
+        "last_updated_by": 1, "last_update_date": now,
+        "tenant_id": 1,
+        "user_invitation_id": None,
+        "profile_picture": {"original": f"/uploads/{i}.png", "thumbnail": f"/uploads/{i}_t.png"},
+        "granted_roles": [{"role_id": r, "role_name": f"role{r}"} for r in range(i % 4)],
+    } for i in range(n)]}
+
+
+def tasks(n):
+    now = datetime(2025, 1, 1, 8, 30)
+    return [{
+        "def_task_id": i, "user_task_name": f"Task {i}", "task_name": f"task_{i}",
+        "internal_execution_method": "python", "execution_method": "python",
+        "executor": "executors.python.execute", "script_name": f"script_{i}.py",
+        "script_path": "/d01/scripts", "description": "Nightly job " * 3,
+        "cancelled_yn": "N", "srs": "N", "sf": "N", "queue": "celery", "priority": 5,
+        "overlap_policy": "allow", "max_concurrency": None,
+        "created_by": 1, "creation_date": now, "last_updated_by": 1, "last_update_date": now,
+    } for i in range(n)]
+
+
+def access_points(n):
+    now = datetime(2025, 1, 1, 8, 30)
+    return {"items": [{
+        "def_access_point_id": i, "def_data_source_id": i % 20, "def_entitlement_id": i % 300,
+        "access_point_name": f"AP {i}", "datasource_name": "ERP", "description": "Access point",
+        "platform": "Oracle", "access_point_type": "Function", "access_control": "Y",
+        "change_control": "N", "audit": "Y", "created_by": 1, "creation_date": now,
+        "last_updated_by": 1, "last_update_date": now,
+    } for i in range(n)], "page": 1, "pages": 1, "total": n}
+
+
+def task_requests(n):
+    now = datetime(2025, 1, 1, 8, 30)
+    return {"items": [{
+        "request_id": i, "task_id": str(uuid.UUID(int=i)), "status": "SUCCESS",
+        "task_name": f"task_{i % 50}", "executor": "executors.stored_procedure.execute",
+        "schedule": {"FREQUENCY_TYPE": "HOURS", "FREQUENCY": 2},
+        "args": ["p.sql", "Task", f"task_{i % 50}", None, None, "PERIODIC", None],
+        "kwargs": {"p_date": "2025-01-01", "p_amount": 10.5},
+        "parameters": {"p_date": "2025-01-01", "p_amount": 10.5},
+        "result": {"rows": [[j, f"name{j}", j * 1.5] for j in range(20)], "elapsed": Decimal("1.234")},
+        "timestamp": now, "creation_date": now, "last_update_date": now,
+    } for i in range(n)], "total": n, "pages": 1, "page": 1, "next_cursor": None}
+
+
+PAYLOADS = {"users": users, "tasks": tasks, "access_points": access_points, "task_requests": task_requests}
+
+
+def best_of(repeat, fn):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    options = parser.parse_args()
+
+    app = Flask(__name__)
+    providers = {"default": DefaultJSONProvider(app), "orjson": OrjsonProvider(app)}
+
+    print(f"{'payload':<15}{'default ms':>12}{'orjson ms':>12}{'speedup':>10}{'bytes':>12}")
+    with app.app_context():
+        for name, build in PAYLOADS.items():
+            payload = build(options.rows)
+            outputs = {key: provider.dumps(payload, separators=(",", ":")) for key, provider in providers.items()}
+            if json.loads(outputs["default"]) != json.loads(outputs["orjson"]):
+                raise SystemExit(f"{name}: providers disagree")
+
+            timings = {key: best_of(options.repeat, lambda p=provider: p.response(payload))
+                       for key, provider in providers.items()}
+            print(f"{name:<15}{timings['default'] * 1000:>12.1f}{timings['orjson'] * 1000:>12.1f}"
+                  f"{timings['default'] / timings['orjson']:>9.1f}x{len(outputs['orjson']):>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,7 @@ from dotenv import load_dotenv
 import ssl
 from datetime import timedelta
 from flask_mail import Mail  
+from utils.json_provider import OrjsonProvider, orjson
 
 # Load environment variables from the .env file
 # load_dotenv()  
@@ -32,6 +33,30 @@ database_url_test = os.environ.get("DATABASE_URL_TEST")  # Test DB for frontend
 FLOWER_URL = os.environ.get("FLOWER_URL")
 crypto_secret_key = os.getenv("CRYPTO_SECRET_KEY")
 jwt_secret_key = os.getenv("JWT_SECRET_ACCESS_TOKEN")
+
+# RBAC permission snapshot cache (seconds)
+rbac_cache_ttl = int(os.getenv("RBAC_CACHE_TTL", 300))            # Redis copy
+rbac_local_cache_ttl = int(os.getenv("RBAC_LOCAL_CACHE_TTL", 30))  # In-process copy
+
+# Redis response cache for reference lists (utils.response_cache, seconds)
+response_cache_enabled = os.getenv("RESPONSE_CACHE", "true").lower() == "true"
+response_cache_ttl = int(os.getenv("RESPONSE_CACHE_TTL", 300))
+
+# Executor results: "redis" / "file" (executors.result_store) or "database" (legacy db+ backend)
+result_store = os.getenv("RESULT_STORE", "redis").lower()
+result_archive_interval = int(os.getenv("RESULT_ARCHIVE_INTERVAL", 30))    # seconds between archive runs
+celery_result_expires = int(os.getenv("CELERY_RESULT_EXPIRES", 3600))      # Celery's own copy (chords, AsyncResult)
+requests_partition_interval_hours = int(os.getenv("REQUESTS_PARTITION_INTERVAL_HOURS", 24))
+redbeat_sweep_interval = int(os.getenv("REDBEAT_SWEEP_INTERVAL", 600))   # seconds between orphan sweeps
+schedule_reconcile_interval = int(os.getenv("SCHEDULE_RECONCILE_INTERVAL", 900))  # seconds between DB/RedBeat reconciliations
+
+# Queue routing / priority lanes (executors.routing)
+celery_default_queue = os.getenv("CELERY_DEFAULT_QUEUE", "celery")
+celery_priority_steps = list(range(10))   # 0 = highest on the Redis broker
+celery_priority_sep = ":"                 # priority lists are named "<queue>:<priority>"
+
+# Response JSON encoder: "orjson" (utils.json_provider, if installed) or "default" (Flask's)
+json_provider = os.getenv("JSON_PROVIDER", "orjson").lower()
  
 
 def parse_expiry(value):
@@ -53,6 +78,41 @@ def parse_expiry(value):
 
 invitation_expire_time = parse_expiry(os.getenv("INVITATION_ACCESS_TOKEN_EXPIRED_TIME", '1h')) 
 
+
+def result_backend_config():
+    if result_store == "database":
+        return dict(result_backend="db+" + database_url)
+
+    # Results are kept by executors.result_store; Celery's Redis copy is short-lived
+    return dict(
+        result_backend=redis_url,
+        result_expires=celery_result_expires,
+    )
+
+
+def beat_schedule_config():
+    # Static housekeeping entries; RedBeat loads these next to the user schedules
+    schedule = {
+        "maintain-request-partitions": {
+            "task": "executors.partition_maintenance.maintain_request_partitions",
+            "schedule": timedelta(hours=requests_partition_interval_hours),
+        },
+    }
+    schedule["sweep-redbeat-orphans"] = {
+        "task": "redbeat_s.maintenance.sweep_orphans",
+        "schedule": timedelta(seconds=redbeat_sweep_interval),
+    }
+    schedule["reconcile-schedules"] = {
+        "task": "redbeat_s.reconcile.reconcile_schedules",
+        "schedule": timedelta(seconds=schedule_reconcile_interval),
+    }
+    if result_store != "database":
+        schedule["archive-task-results"] = {
+            "task": "executors.result_store.archive_results",
+            "schedule": timedelta(seconds=result_archive_interval),
+        }
+    return schedule
+
 # Function to initialize and configure Celery with Flask
 def celery_init_app(app: Flask) -> Celery:
     # Define a custom Celery Task class that runs tasks in Flask's application context
@@ -60,7 +120,9 @@ def celery_init_app(app: Flask) -> Celery:
         def __call__(self, *args: object, **kwargs: object) -> object:
             # Use Flask's app context to ensure proper access to app resources
             with app.app_context():
-                return self.run(*args, **kwargs)  
+                # Overlap policy (skip / queue_one / allow_n) of the task being run
+                from executors.overlap import run_guarded
+                return run_guarded(self, args, kwargs, lambda: self.run(*args, **kwargs))
 
     # Create a Celery instance, associating it with the Flask app name and custom task class
     celery_app = Celery(app.name, task_cls=FlaskTask)
@@ -90,11 +152,21 @@ def create_app() -> Flask:
     app.config.from_mapping(
         CELERY=dict(
             broker_url=redis_url,                      
-            result_backend="db+"+database_url,             
+            **result_backend_config(),
+            beat_schedule=beat_schedule_config(),
             #result_backend=database_url,              
+            task_default_queue=celery_default_queue,
+            task_routes=("executors.routing.route_task",),
+            broker_transport_options={
+                "priority_steps": celery_priority_steps,
+                "sep": celery_priority_sep,
+                "queue_order_strategy": "priority",
+            },
             beat_scheduler='redbeat.RedBeatScheduler',
             redbeat_redis_url=redis_url,              
             redbeat_lock_timeout=900,
+            worker_send_task_events=True,             # feeds executors.task_state_index
+            task_send_sent_event=True,
             # broker_use_ssl = {
             #     'ssl_cert_reqs': ssl.CERT_NONE  # or ssl.CERT_REQUIRED if you have proper certs
             # },
@@ -121,6 +193,10 @@ def create_app() -> Flask:
     )
     # Load additional configuration from environment variables with a prefix
     app.config.from_prefixed_env()
+
+    # Same JSON output as Flask's provider, encoded by orjson
+    if json_provider == "orjson" and orjson is not None:
+        app.json = OrjsonProvider(app)
     
     # Initialize Celery with the Flask app
     celery_init_app(app)
@@ -3,11 +3,19 @@ from dotenv import load_dotenv
 from config import create_app
 from .python import execute as run_script
 from .bash import execute as bash_script
+from .bash import execute_stream as bash_script_stream
 from .stored_procedure import execute as execute_procedure
+from .stored_procedure import execute_batch as execute_procedure_batch
 from .stored_function import execute as execute_function
 from .http import execute as http_request
+from .http import execute_batch as http_batch
 from .python_v1 import execute as python_script
 from .extensions import db
+from . import result_store  # stores executor results, registers archive_results
+from . import partition_maintenance
+from . import workflow
+from redbeat_s import maintenance as redbeat_maintenance  # registers sweep_orphans
+from redbeat_s import reconcile as schedule_reconcile     # registers reconcile_schedules
 
 
 # load_dotenv()
@@ -1,10 +1,27 @@
 import subprocess
 import os
 import json
+import time
+import signal
+import logging
+import selectors
+from collections import deque
 from celery import shared_task
 
 script_path = os.getenv("SCRIPT_PATH_02")  # Base directory for scripts
 
+# Streaming executor limits
+BASH_TIMEOUT = int(os.getenv("BASH_TIMEOUT", 3600))                          # seconds
+BASH_MAX_OUTPUT_BYTES = int(os.getenv("BASH_MAX_OUTPUT_BYTES", 1024 * 1024))  # kept in the result
+BASH_MAX_SPILL_BYTES = int(os.getenv("BASH_MAX_SPILL_BYTES", 0))              # 0 = unlimited
+BASH_OUTPUT_DIR = os.getenv("BASH_OUTPUT_DIR", "/tmp/procg_bash_output")
+BASH_PROGRESS_INTERVAL = float(os.getenv("BASH_PROGRESS_INTERVAL", 2))       # seconds
+BASH_PROGRESS_LINES = int(os.getenv("BASH_PROGRESS_LINES", 20))
+BASH_OUTPUT_RETENTION = int(os.getenv("BASH_OUTPUT_RETENTION", 7 * 24 * 3600))  # seconds spill files are kept
+BASH_OUTPUT_PURGE_INTERVAL = int(os.getenv("BASH_OUTPUT_PURGE_INTERVAL", 3600))  # seconds between purges per process
+
+_last_purge = None
+
 @shared_task(bind=True)
 def execute(self, *args, **kwargs):
     script_name = args[0] if len(args) > 0 else None
@@ -68,3 +85,236 @@ def execute(self, *args, **kwargs):
 
     except Exception as e:
         return {"error": f"Unexpected error: {str(e)}"}
+
+
+
+def _kill_group(process):
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass  # the whole group has already exited
+
+
+def purge_spill_files():
+    """
+    Delete spill files in this host's BASH_OUTPUT_DIR older than
+    BASH_OUTPUT_RETENTION. Called by execute_stream, so every worker host
+    cleans its own directory; runs at most once per BASH_OUTPUT_PURGE_INTERVAL
+    per process. Returns the number of files removed.
+    """
+    global _last_purge
+    now = time.monotonic()
+    if _last_purge is not None and now - _last_purge < BASH_OUTPUT_PURGE_INTERVAL:
+        return 0
+    _last_purge = now
+
+    cutoff = time.time() - BASH_OUTPUT_RETENTION
+    removed = 0
+    try:
+        entries = list(os.scandir(BASH_OUTPUT_DIR))
+    except FileNotFoundError:
+        return 0
+    for entry in entries:
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+        except OSError:
+            pass  # removed concurrently or not ours to delete
+    return removed
+
+
+class _StreamBuffer:
+    """
+    Keeps the first max_bytes of a stream in memory and spills the whole
+    stream to a file once that cap is exceeded.
+    """
+
+    def __init__(self, name, max_bytes, spill_path):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.spill_path = spill_path
+        self.head = bytearray()
+        self.total_bytes = 0
+        self.spill_file = None
+        self.tail_lines = deque(maxlen=BASH_PROGRESS_LINES)
+        self._partial = b""
+
+    def write(self, chunk):
+        self.total_bytes += len(chunk)
+
+        if self.spill_file is None and len(self.head) + len(chunk) > self.max_bytes:
+            os.makedirs(os.path.dirname(self.spill_path), exist_ok=True)
+            self.spill_file = open(self.spill_path, 'wb')
+            self.spill_file.write(self.head)
+
+        if self.spill_file is not None:
+            self.spill_file.write(chunk)
+            room = self.max_bytes - len(self.head)
+            if room > 0:
+                self.head.extend(chunk[:room])
+        else:
+            self.head.extend(chunk)
+
+        lines = (self._partial + chunk).split(b"\n")
+        self._partial = lines.pop()[-4096:]
+        for line in lines:
+            self.tail_lines.append(line.decode(errors="replace"))
+
+    def close(self):
+        if self.spill_file is not None:
+            self.spill_file.close()
+
+    @property
+    def truncated(self):
+        return self.spill_file is not None
+
+    def text(self):
+        return self.head.decode(errors="replace").strip()
+
+
+@shared_task(bind=True)
+def execute_stream(self, *args, **kwargs):
+    """
+    Streaming variant of execute for long or chatty shell scripts.
+
+    stdout/stderr are read incrementally. The first BASH_MAX_OUTPUT_BYTES of
+    each stream stay in the result; anything larger is spilled in full to
+    BASH_OUTPUT_DIR/<task_id>.<stream> and only the head is returned (spill
+    files older than BASH_OUTPUT_RETENTION are purged by later runs). The
+    script is killed after BASH_TIMEOUT seconds (or kwargs['timeout']) or
+    when a stream exceeds BASH_MAX_SPILL_BYTES. Recent lines are published
+    every BASH_PROGRESS_INTERVAL seconds as a PROGRESS state for tailing.
+    """
+    script_name = args[0] if len(args) > 0 else None
+    user_task_name = args[1] if len(args) > 1 else None
+    task_name = args[2] if len(args) > 2 else None
+    user_schedule_name = args[3] if len(args) > 3 else None
+    redbeat_schedule_name = args[4] if len(args) > 4 else None
+    schedule_type = args[5] if len(args) > 5 else None
+    schedule = args[6] if len(args) > 6 else None
+
+    timeout = int(kwargs.get('timeout') or BASH_TIMEOUT)
+    full_script_path = os.path.join(script_path, script_name)
+
+    # Ensure the script exists
+    if not os.path.exists(full_script_path):
+        return {"error": f"Script '{script_name}' not found at '{script_path}'"}
+
+    # Ensure the script is executable
+    if not os.access(full_script_path, os.X_OK):
+        return {"error": f"Permission denied: '{full_script_path}' is not executable"}
+
+    try:
+        purge_spill_files()
+    except Exception as e:
+        logging.error(f"Could not purge bash spill files: {e}")
+
+    task_id = self.request.id or str(os.getpid())
+    stdout = _StreamBuffer("stdout", BASH_MAX_OUTPUT_BYTES, os.path.join(BASH_OUTPUT_DIR, f"{task_id}.stdout"))
+    stderr = _StreamBuffer("stderr", BASH_MAX_OUTPUT_BYTES, os.path.join(BASH_OUTPUT_DIR, f"{task_id}.stderr"))
+
+    process = None
+    killed_reason = None
+    started = time.monotonic()
+    try:
+        process = subprocess.Popen(
+            [full_script_path] + [str(arg) for arg in args[6:]],  # Pass additional arguments to the script
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            start_new_session=True   # own process group so a timeout kills children too
+        )
+
+        selector = selectors.DefaultSelector()
+        selector.register(process.stdout, selectors.EVENT_READ, stdout)
+        selector.register(process.stderr, selectors.EVENT_READ, stderr)
+        last_progress = started
+
+        while selector.get_map():
+            now = time.monotonic()
+            if now - started > timeout:
+                killed_reason = f"Timed out after {timeout}s"
+                break
+
+            for key, _ in selector.select(timeout=1):
+                chunk = os.read(key.fileobj.fileno(), 65536)
+                if not chunk:
+                    selector.unregister(key.fileobj)
+                    continue
+                key.data.write(chunk)
+
+            if BASH_MAX_SPILL_BYTES and max(stdout.total_bytes, stderr.total_bytes) > BASH_MAX_SPILL_BYTES:
+                killed_reason = f"Output exceeded {BASH_MAX_SPILL_BYTES} bytes"
+                break
+
+            if now - last_progress >= BASH_PROGRESS_INTERVAL:
+                last_progress = now
+                self.update_state(state='PROGRESS', meta={
+                    "task_name": task_name,
+                    "elapsed_seconds": round(now - started, 1),
+                    "stdout_bytes": stdout.total_bytes,
+                    "stderr_bytes": stderr.total_bytes,
+                    "lines": list(stdout.tail_lines)
+                })
+
+        selector.close()
+
+        if killed_reason:
+            _kill_group(process)
+        try:
+            # The pipes can close long before the script exits (redirected
+            # output, backgrounded children), so the wait is bounded too
+            remaining = None if killed_reason else max(0, timeout - (time.monotonic() - started))
+            returncode = process.wait(timeout=remaining)
+        except subprocess.TimeoutExpired:
+            killed_reason = f"Timed out after {timeout}s"
+            _kill_group(process)
+            returncode = process.wait()
+
+    except Exception as e:
+        if process is not None and process.poll() is None:
+            _kill_group(process)
+            process.wait()
+        return {"error": f"Unexpected error: {str(e)}"}
+
+    finally:
+        stdout.close()
+        stderr.close()
+
+    if killed_reason or returncode != 0:
+        return {
+            "error": killed_reason or f"Shell script execution failed: {returncode}",
+            "stderr": stderr.text() or "No error output",
+            "stdout": stdout.text() or "No output",
+            "stdout_file": stdout.spill_path if stdout.truncated else None,
+            "stderr_file": stderr.spill_path if stderr.truncated else None
+        }
+
+    # Only a complete stdout can be parsed as JSON
+    output_json = None
+    if not stdout.truncated:
+        try:
+            output_json = json.loads(stdout.text())
+        except json.JSONDecodeError:
+            output_json = None
+    if output_json is None:
+        output_json = {"output": stdout.text()}  # Fallback if not valid JSON
+
+    return {
+        "user_task_name": user_task_name,
+        "task_name": task_name,
+        "executor": self.name,
+        "user_schedule_name": user_schedule_name,
+        "redbeat_schedule_name": redbeat_schedule_name,
+        "schedule_type": schedule_type,
+        "schedule": schedule,
+        "args": args,
+        "kwargs": kwargs,
+        "parameters": kwargs,
+        "result": output_json,
+        "output_truncated": stdout.truncated,
+        "stdout_bytes": stdout.total_bytes,
+        "stdout_file": stdout.spill_path if stdout.truncated else None,
+        "elapsed_seconds": round(time.monotonic() - started, 3),
+        "message": "Shell script executed successfully!"
+    }
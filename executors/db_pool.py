@@ -0,0 +1,123 @@
+import os
+import time
+import logging
+import threading
+from contextlib import contextmanager
+
+import psycopg2
+from psycopg2 import pool
+from celery.signals import worker_process_init, worker_process_shutdown
+
+logging.basicConfig(level=logging.INFO)
+
+db_url = os.getenv("DATABASE_URL")
+
+# Pool bounds per worker process
+POOL_MIN_CONN = int(os.getenv("EXECUTOR_DB_POOL_MIN", 1))
+POOL_MAX_CONN = int(os.getenv("EXECUTOR_DB_POOL_MAX", 5))
+# Seconds a task waits for a free connection before giving up
+POOL_TIMEOUT = float(os.getenv("EXECUTOR_DB_POOL_TIMEOUT", 30))
+# Run "SELECT 1" on checkout to detect connections dropped by the server
+POOL_PRE_PING = os.getenv("EXECUTOR_DB_POOL_PRE_PING", "True").lower() == "true"
+
+_pool = None
+_slots = None
+_pool_lock = threading.Lock()
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+def init_pool():
+    """Create the connection pool for this process (idempotent)."""
+    global _pool, _slots
+    with _pool_lock:
+        if _pool is None:
+            _pool = pool.ThreadedConnectionPool(POOL_MIN_CONN, POOL_MAX_CONN, db_url)
+            _slots = threading.BoundedSemaphore(POOL_MAX_CONN)
+            logging.info(f"Executor DB pool created (min={POOL_MIN_CONN}, max={POOL_MAX_CONN}).")
+    return _pool
+
+
+def close_pool():
+    global _pool, _slots
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
+            _slots = None
+            logging.info("Executor DB pool closed.")
+
+
+@worker_process_init.connect
+def _on_worker_process_init(**kwargs):
+    # Connections must not be shared across fork, so each child builds its own pool
+    init_pool()
+
+
+@worker_process_shutdown.connect
+def _on_worker_process_shutdown(**kwargs):
+    close_pool()
+
+
+def _is_healthy(conn):
+    if conn.closed:
+        return False
+    if not POOL_PRE_PING:
+        return True
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT 1;")
+        conn.rollback()
+        return True
+    except psycopg2.Error:
+        return False
+
+
+def _checkout(db_pool):
+    # After a server restart or failover every idle connection is stale:
+    # discard them until a healthy one comes back. The pool holds at most
+    # POOL_MAX_CONN idle ones, so the last attempt gets a newly opened one.
+    for _ in range(POOL_MAX_CONN + 1):
+        conn = db_pool.getconn()
+        if _is_healthy(conn):
+            return conn
+        logging.warning("Discarding unhealthy pooled connection and reconnecting.")
+        db_pool.putconn(conn, close=True)
+    raise psycopg2.OperationalError("No healthy database connection after discarding stale pooled connections")
+
+
+@contextmanager
+def pooled_connection():
+    """
+    Borrow a connection from the per-process pool.
+
+    Yields (conn, pool_wait_ms). The connection is rolled back if the caller
+    raises and is closed instead of returned when it is broken.
+    """
+    db_pool = _pool or init_pool()
+    slots = _slots
+
+    start = time.monotonic()
+    if not slots.acquire(timeout=POOL_TIMEOUT):
+        raise PoolTimeout(f"Timed out after {POOL_TIMEOUT}s waiting for a database connection.")
+
+    conn = None
+    try:
+        conn = _checkout(db_pool)
+        pool_wait_ms = round((time.monotonic() - start) * 1000, 2)
+
+        try:
+            yield conn, pool_wait_ms
+        except Exception:
+            if not conn.closed:
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    pass
+            raise
+    finally:
+        if conn is not None:
+            db_pool.putconn(conn, close=bool(conn.closed))
+        slots.release()
@@ -1,5 +1,9 @@
 from flask_sqlalchemy import SQLAlchemy
+from redis import Redis
+from config import redis_url
 
 
 db = SQLAlchemy()
 
+# Shared Redis client (same instance as the Celery broker)
+redis_client = Redis.from_url(redis_url, decode_responses=True)
@@ -1,6 +1,113 @@
+import os
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from celery import shared_task
 
+# Connection pool and retry policy for the per-process HTTP session
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", 10))   # distinct hosts kept alive
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", 20))           # connections per host
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", 5))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", 60))
+HTTP_RETRY_TOTAL = int(os.getenv("HTTP_RETRY_TOTAL", 3))
+HTTP_RETRY_BACKOFF = float(os.getenv("HTTP_RETRY_BACKOFF", 0.5))
+HTTP_RETRY_STATUSES = [
+    int(code) for code in os.getenv("HTTP_RETRY_STATUSES", "429,502,503,504").split(",") if code.strip()
+]
+# Default number of in-flight requests for execute_batch
+HTTP_BATCH_CONCURRENCY = int(os.getenv("HTTP_BATCH_CONCURRENCY", 10))
+
+SUPPORTED_METHODS = ('GET', 'POST', 'PUT', 'DELETE')
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """
+    Return this process's pooled requests.Session.
+
+    Rebuilt after fork so prefork children never share sockets with the
+    parent. Retries use urllib3's defaults for which methods are retried,
+    so non-idempotent POSTs are not replayed.
+    """
+    global _session, _session_pid
+    pid = os.getpid()
+    if _session is not None and _session_pid == pid:
+        return _session
+
+    with _session_lock:
+        if _session is None or _session_pid != pid:
+            retry = Retry(
+                total=HTTP_RETRY_TOTAL,
+                backoff_factor=HTTP_RETRY_BACKOFF,
+                status_forcelist=HTTP_RETRY_STATUSES,
+                raise_on_status=False
+            )
+            adapter = HTTPAdapter(
+                pool_connections=HTTP_POOL_CONNECTIONS,
+                pool_maxsize=HTTP_POOL_MAXSIZE,
+                max_retries=retry
+            )
+            session = requests.Session()
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _session = session
+            _session_pid = pid
+    return _session
+
+
+def _is_seconds(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0
+
+
+def request_timeout(timeout):
+    """
+    A requests timeout from JSON input: seconds, [connect, read] (JSON has
+    no tuples) or empty for the defaults. Raises ValueError otherwise.
+    """
+    if not timeout:
+        return (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+    if isinstance(timeout, (list, tuple)) and len(timeout) == 2 and all(map(_is_seconds, timeout)):
+        return tuple(timeout)
+    if _is_seconds(timeout):
+        return timeout
+    raise ValueError("timeout must be a number of seconds or [connect, read]")
+
+
+def send_request(method, url, headers=None, params=None, timeout=None):
+    """
+    Send one request through the pooled session.
+
+    params become the query string for GET and the JSON body otherwise,
+    matching what the executor has always done.
+    """
+    # Set default headers only for POST and PUT if headers not provided
+    if not headers and method in ['POST', 'PUT']:
+        headers = {'Content-Type': 'application/json'}
+
+    timeout = request_timeout(timeout)
+    session = get_session()
+
+    if method == 'GET':
+        return session.get(url, headers=headers, params=params, timeout=timeout)
+    return session.request(method, url, headers=headers, json=params, timeout=timeout)
+
+
+def _response_data(response):
+    # Try to decode JSON, fallback to raw text
+    try:
+        return response.json()
+    except ValueError:
+        return {"response_text": response.text}
+
+
 @shared_task(bind=True)
 def execute(self, *args, **kwargs):
     script_name = args[0] if len(args) > 0 else None  # Will be None for HTTP executor
@@ -21,9 +128,6 @@ def execute(self, *args, **kwargs):
     method = method.upper()
 
     headers = kwargs.pop('headers', None)
-    # Set default headers only for POST and PUT if headers not provided
-    if not headers and method in ['POST', 'PUT']:
-        headers = {'Content-Type': 'application/json'}
 
     params = kwargs  # Use kwargs as script parameters
 
@@ -33,24 +137,11 @@ def execute(self, *args, **kwargs):
     # print(f"Payload: {payload}")
 
     try:
-        response = None
-
-        if method == 'GET':
-            response = requests.get(url, headers=headers, params=params)
-        elif method == 'POST':
-            response = requests.post(url, headers=headers, json=params)
-        elif method == 'PUT':
-            response = requests.put(url, headers=headers, json=params)
-        elif method == 'DELETE':
-            response = requests.delete(url, headers=headers, json=params)
-        else:
+        if method not in SUPPORTED_METHODS:
             return {"error": f"Unsupported HTTP method: {method}"}
 
-        # Try to decode JSON, fallback to raw text
-        try:
-            result_data = response.json()
-        except ValueError:
-            result_data = {"response_text": response.text}
+        response = send_request(method, url, headers=headers, params=params)
+        result_data = _response_data(response)
 
         # print("result_data:", result_data)
 
@@ -74,3 +165,95 @@ def execute(self, *args, **kwargs):
 
     except Exception as e:
         return {"error": f"HTTP request execution failed: {str(e)}"}
+
+
+async def _gather_requests(items, concurrency):
+    """Send every item with at most `concurrency` requests in flight."""
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+
+        async def run_one(index, item):
+            method = (item.get('method') or '').upper()
+            url = item.get('url')
+            if not url or method not in SUPPORTED_METHODS:
+                return {"index": index, "url": url, "method": method,
+                        "error": "Each request needs a 'url' and a method of GET, POST, PUT or DELETE."}
+
+            async with semaphore:
+                started = time.monotonic()
+                try:
+                    response = await loop.run_in_executor(
+                        pool,
+                        lambda: send_request(method, url, headers=item.get('headers'),
+                                             params=item.get('params'), timeout=item.get('timeout'))
+                    )
+                    return {
+                        "index": index,
+                        "url": url,
+                        "method": method,
+                        "status_code": response.status_code,
+                        "elapsed_ms": round((time.monotonic() - started) * 1000, 2),
+                        "result": _response_data(response)
+                    }
+                except Exception as e:
+                    return {"index": index, "url": url, "method": method, "error": str(e)}
+
+        return await asyncio.gather(*(run_one(index, item) for index, item in enumerate(items)))
+
+
+@shared_task(bind=True)
+def execute_batch(self, *args, **kwargs):
+    """
+    http_batch executor: send many requests concurrently in one task.
+
+    kwargs:
+        requests (list[dict]): {"url", "method", "headers"?, "params"?, "timeout"?}
+        concurrency (int): max requests in flight (default HTTP_BATCH_CONCURRENCY)
+
+    Requests go through the pooled session via asyncio + a thread pool, so
+    keep-alive connections and the retry policy apply to each of them.
+    """
+    user_task_name = args[1] if len(args) > 1 else None
+    task_name = args[2] if len(args) > 2 else None
+    user_schedule_name = args[3] if len(args) > 3 else None
+    redbeat_schedule_name = args[4] if len(args) > 4 else None
+    schedule_type = args[5] if len(args) > 5 else None
+    schedule = args[6] if len(args) > 6 else None
+
+    items = kwargs.get('requests') or []
+    if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+        return {"error": "'requests' must be a list of request dictionaries."}
+
+    concurrency = max(1, int(kwargs.get('concurrency') or HTTP_BATCH_CONCURRENCY))
+
+    try:
+        started = time.monotonic()
+        results = asyncio.run(_gather_requests(items, concurrency)) if items else []
+        failed = [r for r in results if "error" in r or r.get("status_code", 0) >= 400]
+
+        return {
+            "user_task_name": user_task_name,
+            "task_name": task_name,
+            "executor": self.name,
+            "user_schedule_name": user_schedule_name,
+            "redbeat_schedule_name": redbeat_schedule_name,
+            "schedule_type": schedule_type,
+            "schedule": schedule,
+            "args": args,
+            "kwargs": kwargs,
+            "parameters": kwargs,
+            "result": {
+                "total": len(results),
+                "succeeded": len(results) - len(failed),
+                "failed": len(failed),
+                "elapsed_ms": round((time.monotonic() - started) * 1000, 2),
+                "responses": results
+            },
+            "message": "HTTP batch executed successfully." if not failed
+                       else "HTTP batch executed with errors."
+        }
+
+    except Exception as e:
+        return {"error": f"HTTP batch execution failed: {str(e)}"}
@@ -341,6 +341,8 @@ class DefAsyncExecutionMethods(db.Model):
     internal_execution_method = db.Column(db.String(255), primary_key=True) 
     executor = db.Column(db.String(100))  
     description = db.Column(db.String(255))
+    queue = db.Column(db.String(100))  # Celery queue for this method's tasks (None = default queue)
+    priority = db.Column(db.Integer)   # 0 (highest) - 9
     created_by = db.Column(db.Integer)
     creation_date = db.Column(db.DateTime, default=datetime.utcnow)
     last_updated_by = db.Column(db.Integer)
@@ -351,6 +353,8 @@ class DefAsyncExecutionMethods(db.Model):
             "internal_execution_method": self.internal_execution_method,
             "executor": self.executor,
             "description": self.description,
+            "queue": self.queue,
+            "priority": self.priority,
             "created_by": self.created_by,
             "creation_date": self.creation_date,
             "last_updated_by": self.last_updated_by,
@@ -373,6 +377,10 @@ class DefAsyncTask(db.Model):
     cancelled_yn     = db.Column(db.String(1), default='N')  # Default 'N'
     srs              = db.Column(db.String(1), default='N')  # Default 'N'
     sf               = db.Column(db.String(1), default='N')  # Default 'N'
+    queue            = db.Column(db.String(100))  # Overrides the execution method's queue
+    priority         = db.Column(db.Integer)      # Overrides the execution method's priority
+    overlap_policy   = db.Column(db.String(20))   # allow (default), skip, queue_one, allow_n
+    max_concurrency  = db.Column(db.Integer)      # Runs allowed at once for allow_n
     created_by       = db.Column(db.Integer)  # User who created the record (optional)
     creation_date    = db.Column(db.TIMESTAMP, default=datetime.utcnow)  # Timestamp of creation
     last_updated_by  = db.Column(db.Integer)  # User who last updated the record (optional)
@@ -392,6 +400,10 @@ class DefAsyncTask(db.Model):
             "cancelled_yn": self.cancelled_yn,
             "srs": self.srs,
             "sf": self.sf,
+            "queue": self.queue,
+            "priority": self.priority,
+            "overlap_policy": self.overlap_policy,
+            "max_concurrency": self.max_concurrency,
             "created_by": self.created_by,
             "creation_date": self.creation_date,
             "last_updated_by": self.last_updated_by,
@@ -503,6 +515,8 @@ class DefAsyncTaskScheduleNew(db.Model):
 
 
 class DefAsyncTaskRequest(db.Model):
+    # Range-partitioned by month on creation_date (migrations/003); filter on
+    # creation_date so queries only touch the partitions they need.
     __tablename__ = 'def_async_task_requests'
 
     request_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
@@ -519,6 +533,8 @@ class DefAsyncTaskRequest(db.Model):
     kwargs = db.Column(db.JSON)
     parameters = db.Column(db.JSON)
     result = db.Column(db.JSON)
+    workflow_run_id = db.Column(db.Integer)  # Set for workflow nodes
+    workflow_node = db.Column(db.String(200))
     timestamp = db.Column(db.TIMESTAMP, default=datetime.utcnow)
     created_by = db.Column(db.Integer)  
     creation_date = db.Column(db.DateTime, default=datetime.utcnow) 
@@ -539,9 +555,12 @@ class DefAsyncTaskRequest(db.Model):
             "schedule_type": self.schedule_type,
             "schedule": self.schedule,
             "args": self.args,
-            "kwargs": self.kwargs,
+            # Archived results store the params once, in parameters
+            "kwargs": self.kwargs if self.kwargs is not None else self.parameters,
             "parameters": self.parameters,
             "result": self.result,
+            "workflow_run_id": self.workflow_run_id,
+            "workflow_node": self.workflow_node,
             "timestamp": self.timestamp,
             "created_by": self.created_by,
             "creation_date": self.creation_date,
@@ -549,6 +568,101 @@ class DefAsyncTaskRequest(db.Model):
             "last_update_date": self.last_update_date,
         }
 
+
+class DefAsyncWorkflow(db.Model):
+    __tablename__ = 'def_async_workflows'
+
+    workflow_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    workflow_name = db.Column(db.String(255), nullable=False, unique=True)
+    description = db.Column(db.String(255))
+    max_concurrency = db.Column(db.Integer)  # Max nodes in flight per run (None = no limit)
+    cancelled_yn = db.Column(db.String(1), default='N')
+    created_by = db.Column(db.Integer)
+    creation_date = db.Column(db.TIMESTAMP, default=datetime.utcnow)
+    last_updated_by = db.Column(db.Integer)
+    last_update_date = db.Column(db.TIMESTAMP, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    nodes = db.relationship('DefAsyncWorkflowNode', backref='workflow', lazy='selectin',
+                            cascade='all, delete-orphan', order_by='DefAsyncWorkflowNode.node_id')
+
+    def json(self):
+        return {
+            "workflow_id": self.workflow_id,
+            "workflow_name": self.workflow_name,
+            "description": self.description,
+            "max_concurrency": self.max_concurrency,
+            "cancelled_yn": self.cancelled_yn,
+            "nodes": [node.json() for node in self.nodes],
+            "created_by": self.created_by,
+            "creation_date": self.creation_date,
+            "last_updated_by": self.last_updated_by,
+            "last_update_date": self.last_update_date,
+        }
+
+
+class DefAsyncWorkflowNode(db.Model):
+    __tablename__ = 'def_async_workflow_nodes'
+
+    node_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    workflow_id = db.Column(db.Integer, db.ForeignKey('def_async_workflows.workflow_id', ondelete='CASCADE'), nullable=False)
+    node_name = db.Column(db.String(200), nullable=False)  # Unique within the workflow
+    task_name = db.Column(db.String(255), nullable=False)  # DefAsyncTask.task_name
+    parameters = db.Column(JSONB)      # Static parameters
+    param_mappings = db.Column(JSONB)  # {"param": "upstream_node.result.path"}
+    depends_on = db.Column(JSONB)      # ["upstream_node", ...]
+    created_by = db.Column(db.Integer)
+    creation_date = db.Column(db.TIMESTAMP, default=datetime.utcnow)
+    last_updated_by = db.Column(db.Integer)
+    last_update_date = db.Column(db.TIMESTAMP, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def json(self):
+        return {
+            "node_id": self.node_id,
+            "workflow_id": self.workflow_id,
+            "node_name": self.node_name,
+            "task_name": self.task_name,
+            "parameters": self.parameters,
+            "param_mappings": self.param_mappings,
+            "depends_on": self.depends_on,
+            "created_by": self.created_by,
+            "creation_date": self.creation_date,
+            "last_updated_by": self.last_updated_by,
+            "last_update_date": self.last_update_date,
+        }
+
+
+class DefAsyncWorkflowRun(db.Model):
+    __tablename__ = 'def_async_workflow_runs'
+
+    run_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    workflow_id = db.Column(db.Integer, db.ForeignKey('def_async_workflows.workflow_id'), nullable=False)
+    status = db.Column(db.String(50))  # PENDING, RUNNING, SUCCESS, FAILURE
+    celery_task_id = db.Column(db.String(200))  # Id of the final callback
+    node_task_ids = db.Column(JSONB)  # {"node_name": "task_id"}
+    parameters = db.Column(JSONB)     # Run-time overrides {"node_name": {...}}
+    started_at = db.Column(db.TIMESTAMP)
+    finished_at = db.Column(db.TIMESTAMP)
+    created_by = db.Column(db.Integer)
+    creation_date = db.Column(db.TIMESTAMP, default=datetime.utcnow)
+    last_updated_by = db.Column(db.Integer)
+    last_update_date = db.Column(db.TIMESTAMP, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def json(self):
+        return {
+            "run_id": self.run_id,
+            "workflow_id": self.workflow_id,
+            "status": self.status,
+            "celery_task_id": self.celery_task_id,
+            "node_task_ids": self.node_task_ids,
+            "parameters": self.parameters,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "created_by": self.created_by,
+            "creation_date": self.creation_date,
+            "last_updated_by": self.last_updated_by,
+            "last_update_date": self.last_update_date,
+        }
+
     
 
 class DefAsyncTaskSchedulesV(db.Model):
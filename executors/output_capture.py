@@ -0,0 +1,107 @@
+import io
+import os
+import sys
+import json
+import subprocess
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# "inprocess" (default) or "subprocess" for the Python executors
+PYTHON_EXECUTOR_MODE = os.getenv("PYTHON_EXECUTOR_MODE", "inprocess").lower()
+# Seconds before a subprocess-isolated script is killed
+PYTHON_EXECUTOR_TIMEOUT = int(os.getenv("PYTHON_EXECUTOR_TIMEOUT", 3600))
+
+# Scripts containing this marker always run in a child interpreter
+SUBPROCESS_MARKER = "# procg: subprocess"
+
+# Buffer for the task running in the current thread/greenlet (None = not capturing)
+_task_stdout = ContextVar("procg_task_stdout", default=None)
+_install_lock = threading.Lock()
+
+
+class TaskStdout(io.TextIOBase):
+    """
+    sys.stdout replacement that routes writes to the buffer bound to the
+    current context, so concurrent tasks under -P threads / -P gevent never
+    see each other's output. Writes outside a task go to the real stream.
+    """
+
+    def __init__(self, stream):
+        self._stream = stream
+
+    def _target(self):
+        buffer = _task_stdout.get()
+        return buffer if buffer is not None else self._stream
+
+    def write(self, text):
+        return self._target().write(text)
+
+    def writelines(self, lines):
+        self._target().writelines(lines)
+
+    def flush(self):
+        self._target().flush()
+
+    def writable(self):
+        return True
+
+    def isatty(self):
+        return False
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+def install():
+    """Wrap sys.stdout once per process (idempotent)."""
+    if isinstance(sys.stdout, TaskStdout):
+        return
+    with _install_lock:
+        if not isinstance(sys.stdout, TaskStdout):
+            sys.stdout = TaskStdout(sys.stdout)
+
+
+@contextmanager
+def capture_stdout():
+    """Capture everything printed by the current task into a StringIO."""
+    install()
+    buffer = io.StringIO()
+    token = _task_stdout.set(buffer)
+    try:
+        yield buffer
+    finally:
+        _task_stdout.reset(token)
+
+
+# Child-side bootstrap: params arrive as JSON on stdin and become script globals
+_RUNNER = (
+    "import json, sys\n"
+    "path = sys.argv[1]\n"
+    "params = json.load(sys.stdin)\n"
+    "exec_globals = {'__builtins__': __builtins__, '__name__': '__procg_script__', '__file__': path}\n"
+    "exec_globals.update(params)\n"
+    "with open(path, 'r') as file:\n"
+    "    code = compile(file.read(), path, 'exec')\n"
+    "exec(code, exec_globals)\n"
+)
+
+
+def run_isolated(script_path, params, timeout=None):
+    """
+    Run a script in a separate interpreter and return its stdout.
+
+    Raises RuntimeError with the child's stderr if it exits non-zero.
+    """
+    completed = subprocess.run(
+        [sys.executable, "-c", _RUNNER, script_path],
+        input=json.dumps(params, default=str),
+        text=True,
+        capture_output=True,
+        timeout=timeout or PYTHON_EXECUTOR_TIMEOUT
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(
+            f"Script exited with code {completed.returncode}: {completed.stderr.strip()}"
+        )
+    return completed.stdout
@@ -0,0 +1,218 @@
+"""
+Non-overlap locks and concurrency caps for executor runs.
+
+Each run of a task is checked against its DefAsyncTask.overlap_policy before
+it starts (from FlaskTask.__call__ in config.py):
+
+    allow      (default) no limit
+    skip       skip the run while a previous run of the same key is executing
+    queue_one  like skip, but one extra run waits (retried every
+               OVERLAP_RETRY_DELAY seconds) and runs once the slot frees up
+    allow_n    up to max_concurrency runs at once, extra runs are skipped
+
+The key is the RedBeat schedule name when the run comes from a schedule,
+otherwise the task_name. Holders live in the zset overlap:<key> (member =
+task_id, score = lease expiry) and a background thread renews the lease
+while the task runs, so a crashed worker frees its slot after
+OVERLAP_LOCK_TTL seconds. Skipped runs are stored with status SKIPPED.
+"""
+import os
+import time
+import logging
+import threading
+from contextlib import contextmanager
+
+logging.basicConfig(level=logging.INFO)
+
+OVERLAP_LOCK_TTL = int(os.getenv("OVERLAP_LOCK_TTL", 300))
+OVERLAP_RETRY_DELAY = int(os.getenv("OVERLAP_RETRY_DELAY", 30))
+OVERLAP_POLICY_CACHE_TTL = int(os.getenv("OVERLAP_POLICY_CACHE_TTL", 30))
+
+POLICIES = ("allow", "skip", "queue_one", "allow_n")
+KEY_PREFIX = "overlap"
+
+# Drop expired leases, then take a slot if fewer than ARGV[1] are held
+_ACQUIRE_LUA = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[2])
+if redis.call('ZSCORE', KEYS[1], ARGV[4]) then
+    redis.call('ZADD', KEYS[1], ARGV[3], ARGV[4])
+    return 1
+end
+if redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[1]) then
+    redis.call('ZADD', KEYS[1], ARGV[3], ARGV[4])
+    redis.call('EXPIRE', KEYS[1], ARGV[5])
+    return 1
+end
+return 0
+"""
+
+# Take the single waiting slot of a queue_one key (or confirm we already hold it)
+_WAIT_LUA = """
+local holder = redis.call('GET', KEYS[1])
+if holder == ARGV[1] then
+    redis.call('EXPIRE', KEYS[1], ARGV[2])
+    return 1
+end
+if not holder then
+    redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+    return 1
+end
+return 0
+"""
+
+# Free the waiting slot only if this run still holds it
+_RELEASE_WAIT_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+_scripts = {}
+_policies = {}
+_policies_loaded_at = 0.0
+_lock = threading.Lock()
+
+
+def _redis():
+    from executors.extensions import redis_client
+    return redis_client
+
+
+def _script(name, source):
+    if name not in _scripts:
+        _scripts[name] = _redis().register_script(source)
+    return _scripts[name]
+
+
+def _load_policies():
+    from .db_pool import pooled_connection
+
+    with pooled_connection() as (conn, _):
+        with conn.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT task_name, overlap_policy, max_concurrency
+                  FROM def_async_tasks
+                 WHERE overlap_policy IS NOT NULL AND overlap_policy <> 'allow';
+                """
+            )
+            rows = cursor.fetchall()
+        conn.rollback()
+    return {task_name: (policy, max_concurrency) for task_name, policy, max_concurrency in rows}
+
+
+def get_policy(task_name):
+    """(policy, max_concurrency) for a task_name; ("allow", None) when unrestricted."""
+    global _policies, _policies_loaded_at
+    if time.monotonic() - _policies_loaded_at >= OVERLAP_POLICY_CACHE_TTL:
+        with _lock:
+            if time.monotonic() - _policies_loaded_at >= OVERLAP_POLICY_CACHE_TTL:
+                try:
+                    _policies = _load_policies()
+                except Exception as e:
+                    logging.error(f"Could not load overlap policies: {e}")
+                _policies_loaded_at = time.monotonic()
+    return _policies.get(task_name, ("allow", None))
+
+
+def is_valid_max_concurrency(value):
+    """None (no limit) or a positive integer, as the CHECK on def_async_tasks requires."""
+    return value is None or (isinstance(value, int) and not isinstance(value, bool) and value > 0)
+
+
+def invalidate():
+    global _policies_loaded_at
+    _policies_loaded_at = 0.0
+
+
+def acquire(key, task_id, limit):
+    now = time.time()
+    return bool(_script("acquire", _ACQUIRE_LUA)(
+        keys=[f"{KEY_PREFIX}:{key}"],
+        args=[limit, now, now + OVERLAP_LOCK_TTL, task_id, OVERLAP_LOCK_TTL * 2]
+    ))
+
+
+def release(key, task_id):
+    _redis().zrem(f"{KEY_PREFIX}:{key}", task_id)
+
+
+def _renew_until(stop, key, task_id):
+    client = _redis()
+    while not stop.wait(OVERLAP_LOCK_TTL / 3):
+        try:
+            # XX: only extend a lease we still hold
+            client.zadd(f"{KEY_PREFIX}:{key}", {task_id: time.time() + OVERLAP_LOCK_TTL}, xx=True)
+            client.expire(f"{KEY_PREFIX}:{key}", OVERLAP_LOCK_TTL * 2)
+        except Exception as e:
+            logging.error(f"Could not renew overlap lock {key} for {task_id}: {e}")
+
+
+@contextmanager
+def held(key, task_id):
+    """Renew the lease in the background while the body runs, release after."""
+    stop = threading.Event()
+    renewer = threading.Thread(target=_renew_until, args=(stop, key, task_id), daemon=True)
+    renewer.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        release(key, task_id)
+
+
+def _skipped(task, args, key, policy, reason):
+    from . import result_store
+
+    task_id = task.request.id
+    result_store.annotate(task_id, status="SKIPPED")
+    logging.info(f"Skipped {task.name} run {task_id} for '{key}' ({policy}): {reason}")
+    return {
+        "user_task_name": args[1] if len(args) > 1 else None,
+        "task_name": args[2] if len(args) > 2 else None,
+        "executor": task.name,
+        "user_schedule_name": args[3] if len(args) > 3 else None,
+        "redbeat_schedule_name": args[4] if len(args) > 4 else None,
+        "skipped": True,
+        "overlap_policy": policy,
+        "message": f"Run skipped: {reason}"
+    }
+
+
+def run_guarded(task, args, kwargs, run):
+    """Apply the task's overlap policy around run() (the task body)."""
+    task_name = args[2] if len(args) > 2 else None
+    if not task_name:
+        return run()
+
+    policy, max_concurrency = get_policy(task_name)
+    if policy not in POLICIES or policy == "allow":
+        return run()
+
+    key = (args[4] if len(args) > 4 else None) or task_name
+    task_id = task.request.id
+    limit = (max_concurrency or 1) if policy == "allow_n" and is_valid_max_concurrency(max_concurrency) else 1
+
+    try:
+        acquired = acquire(key, task_id, limit)
+    except Exception as e:
+        # Redis trouble must not stop scheduled work; run unguarded
+        logging.error(f"Overlap lock unavailable for '{key}': {e}")
+        return run()
+
+    if not acquired:
+        if policy == "queue_one" and not task.request.is_eager:
+            if _script("wait", _WAIT_LUA)(keys=[f"{KEY_PREFIX}:{key}:waiting"],
+                                          args=[task_id, OVERLAP_RETRY_DELAY * 4]):
+                raise task.retry(countdown=OVERLAP_RETRY_DELAY, max_retries=None)
+            return _skipped(task, args, key, policy, "a run is executing and another is already waiting")
+        return _skipped(task, args, key, policy,
+                        f"{limit} run(s) of this schedule already executing")
+
+    if policy == "queue_one":
+        # This run may have been the waiting one: free the slot for the next
+        _script("release_wait", _RELEASE_WAIT_LUA)(keys=[f"{KEY_PREFIX}:{key}:waiting"], args=[task_id])
+
+    with held(key, task_id):
+        return run()
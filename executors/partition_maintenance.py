@@ -0,0 +1,121 @@
+import os
+import re
+import logging
+from datetime import date, datetime
+
+from celery import shared_task
+
+from .db_pool import pooled_connection
+
+logging.basicConfig(level=logging.INFO)
+
+PARENT_TABLE = "def_async_task_requests"
+PARTITION_PATTERN = re.compile(rf"^{PARENT_TABLE}_p(\d{{4}})(\d{{2}})$")
+
+# Months of partitions kept ready ahead of the current one
+REQUESTS_PARTITION_PREMAKE = int(os.getenv("REQUESTS_PARTITION_PREMAKE", 3))
+# Months of partitions kept attached (0 = keep everything)
+REQUESTS_RETENTION_MONTHS = int(os.getenv("REQUESTS_RETENTION_MONTHS", 0))
+# What happens to partitions past retention: "archive" (detach and move to
+# REQUESTS_ARCHIVE_SCHEMA), "detach" (standalone table in place) or "drop"
+REQUESTS_RETENTION_ACTION = os.getenv("REQUESTS_RETENTION_ACTION", "archive").lower()
+REQUESTS_ARCHIVE_SCHEMA = os.getenv("REQUESTS_ARCHIVE_SCHEMA", "archive")
+
+
+def add_months(month_start, months):
+    index = month_start.year * 12 + month_start.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month_start):
+    return f"{PARENT_TABLE}_p{month_start:%Y%m}"
+
+
+def is_partitioned(cursor):
+    """True once migration 003 has turned def_async_task_requests into a partitioned table."""
+    cursor.execute(
+        "SELECT relkind FROM pg_class WHERE oid = to_regclass(%s);", (PARENT_TABLE,)
+    )
+    row = cursor.fetchone()
+    return bool(row) and row[0] == "p"
+
+
+def _attached_partitions(cursor):
+    """{month_start: partition name} for the monthly partitions currently attached."""
+    cursor.execute(
+        """
+        SELECT child.relname
+          FROM pg_inherits
+          JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+         WHERE pg_inherits.inhparent = to_regclass(%s);
+        """,
+        (PARENT_TABLE,)
+    )
+    partitions = {}
+    for (name,) in cursor.fetchall():
+        match = PARTITION_PATTERN.match(name)
+        if match:
+            partitions[date(int(match.group(1)), int(match.group(2)), 1)] = name
+    return partitions
+
+
+def _retire(cursor, name):
+    cursor.execute(f'ALTER TABLE {PARENT_TABLE} DETACH PARTITION "{name}";')
+    if REQUESTS_RETENTION_ACTION == "drop":
+        cursor.execute(f'DROP TABLE "{name}";')
+    elif REQUESTS_RETENTION_ACTION == "archive":
+        cursor.execute(f'CREATE SCHEMA IF NOT EXISTS "{REQUESTS_ARCHIVE_SCHEMA}";')
+        cursor.execute(f'ALTER TABLE "{name}" SET SCHEMA "{REQUESTS_ARCHIVE_SCHEMA}";')
+
+
+@shared_task(bind=True)
+def maintain_request_partitions(self):
+    """
+    Create the monthly def_async_task_requests partitions for the current
+    month and REQUESTS_PARTITION_PREMAKE months ahead, and retire partitions
+    older than REQUESTS_RETENTION_MONTHS. No-op until migration 003 has
+    made the table partitioned.
+    """
+    current_month = datetime.utcnow().date().replace(day=1)
+    created, retired = [], []
+
+    try:
+        with pooled_connection() as (conn, _):
+            with conn.cursor() as cursor:
+                if not is_partitioned(cursor):
+                    return {"message": f"{PARENT_TABLE} is not partitioned; nothing to do."}
+
+                attached = _attached_partitions(cursor)
+
+                for offset in range(REQUESTS_PARTITION_PREMAKE + 1):
+                    month_start = add_months(current_month, offset)
+                    if month_start in attached:
+                        continue
+                    name = partition_name(month_start)
+                    cursor.execute(
+                        f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF {PARENT_TABLE} '
+                        f'FOR VALUES FROM (%s) TO (%s);',
+                        (month_start, add_months(month_start, 1))
+                    )
+                    created.append(name)
+
+                if REQUESTS_RETENTION_MONTHS > 0:
+                    cutoff = add_months(current_month, -REQUESTS_RETENTION_MONTHS)
+                    for month_start, name in sorted(attached.items()):
+                        if month_start < cutoff:
+                            _retire(cursor, name)
+                            retired.append(name)
+
+            conn.commit()
+
+        if created or retired:
+            logging.info(f"Request partitions created={created} retired={retired} ({REQUESTS_RETENTION_ACTION}).")
+        return {
+            "created": created,
+            "retired": retired,
+            "retention_action": REQUESTS_RETENTION_ACTION if retired else None,
+            "message": "Partition maintenance completed successfully."
+        }
+
+    except Exception as e:
+        return {"error": f"Partition maintenance failed: {str(e)}"}
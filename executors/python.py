@@ -1,9 +1,9 @@
 import json
-import sys
-import io
 import os
 from celery import shared_task
 
+from .output_capture import capture_stdout, run_isolated, PYTHON_EXECUTOR_MODE, SUBPROCESS_MARKER
+
 script_path = os.getenv("SCRIPT_PATH_01")
 
 @shared_task(bind=True)
@@ -20,21 +20,23 @@ def execute(self, *args, **kwargs):
     full_script_path = os.path.join(script_path, script_name)
 
     try:
-        # Capture script output
-        original_stdout = sys.stdout
-        sys.stdout = io.StringIO()
-
         # Read & Execute the script
         with open(full_script_path, 'r') as file:
             script_content = file.read()
 
-        exec_globals = {"__builtins__": __builtins__}  # Safe execution context
-        exec_globals.update(params)  # Inject parameters
+        if PYTHON_EXECUTOR_MODE == "subprocess" or SUBPROCESS_MARKER in script_content:
+            # Separate interpreter: no shared globals, stdout or crashes
+            raw_output = run_isolated(full_script_path, params).strip()
+        else:
+            exec_globals = {"__builtins__": __builtins__}  # Safe execution context
+            exec_globals.update(params)  # Inject parameters
 
-        exec(script_content, exec_globals)
+            # Capture script output in a per-task buffer (safe under threads/gevent pools)
+            with capture_stdout() as captured:
+                exec(script_content, exec_globals)
 
-        # Get script output
-        raw_output = sys.stdout.getvalue().strip()
+            # Get script output
+            raw_output = captured.getvalue().strip()
 
         # Ensure output is a dictionary
         try:
@@ -59,7 +61,3 @@ def execute(self, *args, **kwargs):
 
     except Exception as e:
         return {"error": f"Script execution failed: {str(e)}"}
-
-    finally:
-        # Restore stdout safely
-        sys.stdout = original_stdout
@@ -1,10 +1,10 @@
 import json
-import sys
-import io
 import os
 from celery import shared_task, states
 from celery.exceptions import Ignore, CeleryError, Reject
 
+from . import script_cache
+from .output_capture import capture_stdout, run_isolated, PYTHON_EXECUTOR_MODE
 
 script_path = os.getenv("SCRIPT_PATH_01")
 
@@ -30,27 +30,41 @@ def execute(self, *args, **kwargs):
     params = kwargs
     full_script_path = os.path.join(script_path, script_name) if script_name else None
 
-    original_stdout = sys.stdout
-    sys.stdout = io.StringIO()
-
     try:
         if not script_name or not os.path.exists(full_script_path):
             raise FileNotFoundError(f"Script not found: {full_script_path}")
 
-        with open(full_script_path, 'r') as file:
-            script_content = file.read()
-
-        exec_globals = {"__builtins__": __builtins__}
-        exec_globals.update(params)
-
-        exec(script_content, exec_globals)
-
-        raw_output = sys.stdout.getvalue().strip()
-
-        try:
-            output = json.loads(raw_output)
-        except json.JSONDecodeError:
-            output = {"output": raw_output}
+        # Compiled once per (path, mtime, content hash)
+        script = script_cache.load(full_script_path)
+
+        returned = None
+        if script.persistent:
+            # Imported once per worker process; only main(**params) runs per task
+            with capture_stdout() as captured:
+                entry_point = script_cache.get_entry_point(script)
+                returned = entry_point(**params)
+            raw_output = captured.getvalue().strip()
+
+        elif script.isolated or PYTHON_EXECUTOR_MODE == "subprocess":
+            # Separate interpreter: no shared globals, stdout or crashes
+            raw_output = run_isolated(full_script_path, params).strip()
+
+        else:
+            exec_globals = {"__builtins__": __builtins__}
+            exec_globals.update(params)
+
+            # Per-task buffer (contextvar), safe under -P threads / -P gevent
+            with capture_stdout() as captured:
+                exec(script.code, exec_globals)
+            raw_output = captured.getvalue().strip()
+
+        if returned is not None and not raw_output:
+            output = returned if isinstance(returned, dict) else {"output": returned}
+        else:
+            try:
+                output = json.loads(raw_output)
+            except json.JSONDecodeError:
+                output = {"output": raw_output}
 
         result_data = {
             "task_id": self.request.id,
@@ -113,7 +127,7 @@ def execute(self, *args, **kwargs):
         # raise Reject(exc, requeue=False)
 
     finally:
-        sys.stdout = original_stdout
+        script_cache.publish_stats()
         
 
 
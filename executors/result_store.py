@@ -0,0 +1,378 @@
+"""
+Executor result store, kept off the Postgres that serves the API.
+
+Every finished executor task is written once, compacted and compressed, to a
+hot tier with a per-task-type TTL:
+
+    redis (default)  task_result:<task_id>   payload (TTL)
+                     task_result:pending     zset task_id -> finished_at, not yet archived
+    file             RESULT_STORE_DIR/<task_id>.res and pending/<task_id>
+
+archive_results() (run by beat every RESULT_ARCHIVE_INTERVAL seconds) moves
+pending results into def_async_task_requests in one bulk upsert per batch.
+Set RESULT_STORE=database to keep the old "db+" Celery result backend instead.
+"""
+import os
+import json
+import time
+import zlib
+import logging
+import threading
+from datetime import datetime
+
+from celery import shared_task
+from celery.signals import task_prerun, task_postrun
+
+from config import redis_url, result_store as RESULT_STORE
+
+logging.basicConfig(level=logging.INFO)
+
+# Default seconds a result stays in the hot tier
+RESULT_TTL = int(os.getenv("RESULT_TTL", 24 * 3600))
+# Per task type overrides: "executors.http.execute=3600,executors.bash.execute_stream=604800"
+RESULT_TTL_BY_TASK = {
+    name.strip(): int(ttl)
+    for name, ttl in (
+        item.split("=", 1) for item in os.getenv("RESULT_TTL_BY_TASK", "").split(",") if "=" in item
+    )
+}
+# Payloads at least this large (bytes of JSON) are zlib-compressed
+RESULT_COMPRESS_MIN_BYTES = int(os.getenv("RESULT_COMPRESS_MIN_BYTES", 1024))
+RESULT_ARCHIVE_BATCH = int(os.getenv("RESULT_ARCHIVE_BATCH", 500))
+RESULT_STORE_DIR = os.getenv("RESULT_STORE_DIR", "/tmp/procg_results")
+
+KEY_PREFIX = "task_result"
+PENDING_KEY = f"{KEY_PREFIX}:pending"
+
+# Positional args every executor receives, in order
+ARG_FIELDS = (
+    "script_name", "user_task_name", "task_name", "user_schedule_name",
+    "redbeat_schedule_name", "schedule_type", "schedule"
+)
+# Keys executors copy into their result that are already stored in their own columns
+DUPLICATED_KEYS = ("args", "kwargs", "parameters")
+# Housekeeping tasks whose results are not worth keeping
+SKIP_TASKS = {
+    "executors.result_store.archive_results",
+    "executors.partition_maintenance.maintain_request_partitions",
+    "redbeat_s.reconcile.reconcile_schedules",
+    "redbeat_s.maintenance.sweep_orphans",
+    "executors.workflow.run_node",
+    "executors.workflow.finish_run",
+}
+
+
+def ttl_for(task_name):
+    return RESULT_TTL_BY_TASK.get(task_name, RESULT_TTL)
+
+
+def encode(record):
+    raw = json.dumps(record, default=str, separators=(",", ":")).encode()
+    if len(raw) >= RESULT_COMPRESS_MIN_BYTES:
+        return b"z" + zlib.compress(raw)
+    return b"j" + raw
+
+
+def decode(payload):
+    if not payload:
+        return None
+    body = payload[1:]
+    if payload[:1] == b"z":
+        body = zlib.decompress(body)
+    return json.loads(body)
+
+
+def compact_record(task_id, task_name, args, kwargs, retval, state, started_at, finished_at):
+    """One record per task: executor args and params once, the result without copies of them."""
+    args = list(args or [])
+    if isinstance(retval, dict):
+        result = {key: value for key, value in retval.items() if key not in DUPLICATED_KEYS}
+    elif isinstance(retval, BaseException):
+        result = {"error": f"{type(retval).__name__}: {retval}"}
+    else:
+        result = retval
+
+    record = {name: (args[i] if len(args) > i else None) for i, name in enumerate(ARG_FIELDS)}
+    record.update({
+        "task_id": task_id,
+        "status": state,
+        "executor": task_name,
+        "args": args,
+        "parameters": kwargs or {},
+        "result": result,
+        "started_at": started_at,
+        "finished_at": finished_at,
+    })
+    return record
+
+
+class RedisResultStore:
+    def __init__(self):
+        self._client = None
+        self._client_pid = None
+        self._lock = threading.Lock()
+
+    def _redis(self):
+        # Binary client (payloads may be compressed); rebuilt after fork
+        pid = os.getpid()
+        if self._client is None or self._client_pid != pid:
+            with self._lock:
+                if self._client is None or self._client_pid != pid:
+                    from redis import Redis
+                    self._client = Redis.from_url(redis_url)
+                    self._client_pid = pid
+        return self._client
+
+    def put(self, task_id, record, ttl):
+        pipe = self._redis().pipeline(transaction=False)
+        pipe.set(f"{KEY_PREFIX}:{task_id}", encode(record), ex=ttl)
+        pipe.zadd(PENDING_KEY, {task_id: time.time()})
+        pipe.execute()
+
+    def get(self, task_id):
+        return decode(self._redis().get(f"{KEY_PREFIX}:{task_id}"))
+
+    def pending(self, limit):
+        """Oldest not-yet-archived results as [(task_id, record or None if expired)]."""
+        client = self._redis()
+        task_ids = [task_id.decode() for task_id in client.zrange(PENDING_KEY, 0, limit - 1)]
+        if not task_ids:
+            return []
+        payloads = client.mget([f"{KEY_PREFIX}:{task_id}" for task_id in task_ids])
+        return [(task_id, decode(payload)) for task_id, payload in zip(task_ids, payloads)]
+
+    def ack(self, task_ids):
+        if task_ids:
+            self._redis().zrem(PENDING_KEY, *task_ids)
+
+    def purge_expired(self):
+        pass  # Redis expires keys itself
+
+
+class FileResultStore:
+    """Local-directory stand-in for the Redis tier (single host, tests, no Redis)."""
+
+    def __init__(self, root):
+        self.root = root
+        self.pending_dir = os.path.join(root, "pending")
+        os.makedirs(self.pending_dir, exist_ok=True)
+
+    def _path(self, task_id):
+        return os.path.join(self.root, f"{task_id}.res")
+
+    def put(self, task_id, record, ttl):
+        path = self._path(task_id)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as file:
+            # First line is the expiry timestamp, the rest the encoded payload
+            file.write(f"{time.time() + ttl:.0f}\n".encode() + encode(record))
+        os.replace(tmp_path, path)
+        open(os.path.join(self.pending_dir, task_id), "wb").close()
+
+    def _read(self, path):
+        try:
+            with open(path, "rb") as file:
+                expires_at, payload = file.read().split(b"\n", 1)
+        except (OSError, ValueError):
+            return None
+        if float(expires_at) < time.time():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        return decode(payload)
+
+    def get(self, task_id):
+        return self._read(self._path(task_id))
+
+    def pending(self, limit):
+        entries = sorted(os.scandir(self.pending_dir), key=lambda entry: entry.stat().st_mtime)[:limit]
+        return [(entry.name, self.get(entry.name)) for entry in entries]
+
+    def ack(self, task_ids):
+        for task_id in task_ids:
+            try:
+                os.remove(os.path.join(self.pending_dir, task_id))
+            except FileNotFoundError:
+                pass
+
+    def purge_expired(self):
+        for entry in os.scandir(self.root):
+            if entry.name.endswith(".res"):
+                self._read(entry.path)
+
+
+_store = None
+
+
+def get_store():
+    """The configured hot tier, or None when RESULT_STORE=database."""
+    global _store
+    if _store is None and RESULT_STORE != "database":
+        _store = FileResultStore(RESULT_STORE_DIR) if RESULT_STORE == "file" else RedisResultStore()
+    return _store
+
+
+def get_result(task_id):
+    """Hot-tier record for a task, or None (not stored, expired or store disabled)."""
+    store = get_store()
+    return store.get(task_id) if store else None
+
+
+def reported_outcome(backend, task_id):
+    """
+    (state, result) of a task that stored its outcome with update_state()
+    and then raised Ignore() (python_v1 failures): the meta's own "status"
+    when it has one, else the stored state.
+    """
+    meta = backend.get_task_meta(task_id)
+    result = meta.get("result")
+    if isinstance(result, dict) and result.get("status"):
+        return result["status"], result
+    return meta.get("status"), result
+
+
+# Start times of tasks running in this process, keyed by task_id
+_started = {}
+# Extra record fields set before a task runs (e.g. by the workflow engine), keyed by task_id
+_annotations = {}
+
+
+def annotate(task_id, **fields):
+    """
+    Attach fields to the record stored for task_id when it finishes.
+    created_at, when given, becomes the row's creation_date on archival so a
+    row inserted up front (PENDING) is updated rather than duplicated.
+    """
+    _annotations.setdefault(task_id, {}).update(fields)
+
+
+def _created_at(store, task_id, default):
+    """created_at of the record already stored for task_id (an earlier attempt), else default."""
+    try:
+        previous = store.get(task_id)
+    except Exception as e:
+        logging.error(f"Could not read stored result for task {task_id}: {e}")
+        previous = None
+    return (previous or {}).get("created_at") or default
+
+
+def store_result(task_id, task_name, args, kwargs, retval, state, started_at=None):
+    """Write one finished task to the hot tier (no-op when RESULT_STORE=database)."""
+    extra = _annotations.pop(task_id, {})
+    store = get_store()
+    if store is None or task_name in SKIP_TASKS:
+        return
+    finished_at = datetime.utcnow().isoformat()
+    record = compact_record(task_id, task_name, args, kwargs, retval, state, started_at, finished_at)
+    record.update(extra)
+    if not record.get("created_at"):
+        # One creation_date per task_id: later stores of the same task update its row
+        record["created_at"] = _created_at(store, task_id, started_at or finished_at)
+    store.put(task_id, record, ttl_for(task_name))
+
+
+@task_prerun.connect
+def _on_task_prerun(task_id=None, **kwargs):
+    _started[task_id] = datetime.utcnow().isoformat()
+
+
+@task_postrun.connect
+def _on_task_postrun(task_id=None, task=None, args=None, kwargs=None, retval=None, state=None, **extra):
+    started_at = _started.pop(task_id, None)
+    # A retried attempt (e.g. a queue_one run waiting for its slot) is not a
+    # result; the attempt that finishes stores it under the same task_id
+    if task is None or state == "RETRY":
+        return
+    try:
+        if state == "IGNORED":
+            # retval is just the Ignore exception; the outcome is in the backend
+            state, retval = reported_outcome(task.backend, task_id)
+        store_result(task_id, task.name, args, kwargs, retval, state, started_at)
+    except Exception as e:
+        # Never fail the task because its result could not be stored
+        logging.error(f"Failed to store result for task {task_id}: {e}")
+
+
+# The unique key is (task_id, creation_date) once migration 003 has
+# partitioned the table and task_id before that (see upsert_sql()).
+# creation_date is the record's created_at, fixed at the first store of a
+# task_id, so re-archiving the same task hits the same row.
+UPSERT_SQL = """
+    INSERT INTO def_async_task_requests (
+        task_id, status, user_task_name, task_name, executor, user_schedule_name,
+        redbeat_schedule_name, schedule_type, schedule, args, parameters, result,
+        workflow_run_id, workflow_node, timestamp, creation_date, last_update_date
+    ) VALUES %s
+    ON CONFLICT ({conflict}) DO UPDATE SET
+        status = EXCLUDED.status,
+        executor = EXCLUDED.executor,
+        args = EXCLUDED.args,
+        parameters = EXCLUDED.parameters,
+        result = EXCLUDED.result,
+        timestamp = EXCLUDED.timestamp,
+        last_update_date = EXCLUDED.last_update_date
+"""
+
+
+def upsert_sql(cursor):
+    from .partition_maintenance import is_partitioned
+
+    conflict = "task_id, creation_date" if is_partitioned(cursor) else "task_id"
+    return UPSERT_SQL.format(conflict=conflict)
+
+
+def _history_row(record):
+    from psycopg2.extras import Json
+
+    finished_at = record.get("finished_at")
+    return (
+        record["task_id"], record.get("status"), record.get("user_task_name"),
+        record.get("task_name"), record.get("executor"), record.get("user_schedule_name"),
+        record.get("redbeat_schedule_name"), record.get("schedule_type"),
+        Json(record.get("schedule")), Json(record.get("args")), Json(record.get("parameters")),
+        Json(record.get("result")), record.get("workflow_run_id"), record.get("workflow_node"),
+        finished_at, record.get("created_at") or record.get("started_at") or finished_at, finished_at
+    )
+
+
+@shared_task(bind=True)
+def archive_results(self, batch_size=None):
+    """Bulk-move pending hot-tier results into def_async_task_requests."""
+    from psycopg2.extras import execute_values
+    from .db_pool import pooled_connection
+
+    store = get_store()
+    if store is None:
+        return {"archived": 0, "expired": 0, "message": "Result store disabled (RESULT_STORE=database)."}
+
+    batch_size = int(batch_size or RESULT_ARCHIVE_BATCH)
+    archived = expired = 0
+    started = time.monotonic()
+
+    while True:
+        batch = store.pending(batch_size)
+        if not batch:
+            break
+
+        rows = [_history_row(record) for _, record in batch if record]
+        if rows:
+            with pooled_connection() as (conn, _):
+                with conn.cursor() as cursor:
+                    execute_values(cursor, upsert_sql(cursor), rows, page_size=len(rows))
+                conn.commit()
+
+        # Expired before archival: nothing left to move, just drop from the queue
+        store.ack([task_id for task_id, _ in batch])
+        archived += len(rows)
+        expired += len(batch) - len(rows)
+        if len(batch) < batch_size:
+            break
+
+    store.purge_expired()
+    return {
+        "archived": archived,
+        "expired": expired,
+        "elapsed_ms": round((time.monotonic() - started) * 1000, 2)
+    }
@@ -0,0 +1,150 @@
+"""
+Per-executor queue routing and priority lanes.
+
+Routes come from the DB: def_async_tasks.queue/priority override the task's
+execution method (def_async_execution_methods.queue/priority), which also
+applies to anything sent straight to that executor. Unrouted tasks stay on
+the default queue. Start one worker pool per lane, e.g.
+
+    celery -A executors.celery_app worker -Q http -P gevent -c 100 --prefetch-multiplier 1
+    celery -A executors.celery_app worker -Q db -c 4 --prefetch-multiplier 1
+
+Priorities are 0 (highest) to 9 on the Redis broker.
+"""
+import os
+import time
+import logging
+import threading
+
+from config import celery_default_queue, celery_priority_steps, celery_priority_sep
+
+logging.basicConfig(level=logging.INFO)
+
+# Seconds a process keeps its copy of the routing table
+ROUTING_CACHE_TTL = int(os.getenv("ROUTING_CACHE_TTL", 30))
+
+WORKFLOW_NODE_TASK = "executors.workflow.run_node"
+
+_routes = {"tasks": {}, "executors": {}}
+_loaded_at = 0.0
+_lock = threading.Lock()
+
+
+def _load_routes():
+    from .db_pool import pooled_connection
+
+    with pooled_connection() as (conn, _):
+        with conn.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT t.task_name, COALESCE(t.queue, m.queue), COALESCE(t.priority, m.priority)
+                  FROM def_async_tasks t
+                  LEFT JOIN def_async_execution_methods m
+                    ON m.internal_execution_method = t.internal_execution_method
+                 WHERE COALESCE(t.queue, m.queue) IS NOT NULL
+                    OR COALESCE(t.priority, m.priority) IS NOT NULL;
+                """
+            )
+            tasks = {task_name: (queue, priority) for task_name, queue, priority in cursor.fetchall()}
+            cursor.execute(
+                """
+                SELECT executor, queue, priority
+                  FROM def_async_execution_methods
+                 WHERE executor IS NOT NULL
+                   AND (queue IS NOT NULL OR priority IS NOT NULL);
+                """
+            )
+            executors = {executor: (queue, priority) for executor, queue, priority in cursor.fetchall()}
+        conn.rollback()
+    return {"tasks": tasks, "executors": executors}
+
+
+def get_routes():
+    """Routing table for this process, reloaded every ROUTING_CACHE_TTL seconds."""
+    global _routes, _loaded_at
+    if time.monotonic() - _loaded_at < ROUTING_CACHE_TTL:
+        return _routes
+    with _lock:
+        if time.monotonic() - _loaded_at >= ROUTING_CACHE_TTL:
+            try:
+                _routes = _load_routes()
+            except Exception as e:
+                # Keep routing with the last known table rather than failing the send
+                logging.error(f"Could not load task routes: {e}")
+            _loaded_at = time.monotonic()
+    return _routes
+
+
+def route_error(queue, priority):
+    """Why queue/priority cannot be stored, or None. Null keeps the default for either."""
+    if queue is not None and (not isinstance(queue, str) or not queue.strip() or len(queue) > 100):
+        return "queue must be a non-empty string of at most 100 characters"
+    if priority is not None and (isinstance(priority, bool) or priority not in celery_priority_steps):
+        return f"priority must be an integer from {celery_priority_steps[0]} to {celery_priority_steps[-1]}"
+    return None
+
+
+def invalidate():
+    """Reload routes on the next send (call after changing queue/priority)."""
+    global _loaded_at
+    _loaded_at = 0.0
+
+
+def route_for(task_name, executor):
+    routes = get_routes()
+    queue, priority = routes["tasks"].get(task_name) or routes["executors"].get(executor) or (None, None)
+    route = {}
+    if queue:
+        route["queue"] = queue
+    if priority is not None:
+        route["priority"] = int(priority)
+    return route or None
+
+
+def route_task(name, args, kwargs, options, task=None, **kw):
+    """
+    Celery router (task_routes). Executors get the task_name as their third
+    positional arg; workflow nodes carry theirs in the node spec. Options
+    passed explicitly to apply_async/send_task still win.
+    """
+    if name == WORKFLOW_NODE_TASK:
+        spec = (kwargs or {}).get("spec") or {}
+        executor = spec.get("executor")
+        node_args = spec.get("args") or []
+        task_name = node_args[2] if len(node_args) > 2 else None
+    else:
+        executor = name
+        task_name = args[2] if args and len(args) > 2 else None
+    return route_for(task_name, executor)
+
+
+def known_queues():
+    routes = get_routes()
+    queues = {celery_default_queue}
+    queues.update(queue for queue, _ in routes["tasks"].values() if queue)
+    queues.update(queue for queue, _ in routes["executors"].values() if queue)
+    return sorted(queues)
+
+
+def _priority_key(queue, priority):
+    # Same naming as kombu's Redis transport: priority 0 uses the bare queue name
+    return queue if priority == 0 else f"{queue}{celery_priority_sep}{priority}"
+
+
+def queue_depths(client, queues=None):
+    """{queue: {"total": n, "by_priority": {priority: n}}} of messages waiting in the broker."""
+    queues = queues or known_queues()
+    pipe = client.pipeline(transaction=False)
+    for queue in queues:
+        for priority in celery_priority_steps:
+            pipe.llen(_priority_key(queue, priority))
+    lengths = iter(pipe.execute())
+
+    depths = {}
+    for queue in queues:
+        by_priority = {priority: next(lengths) for priority in celery_priority_steps}
+        depths[queue] = {
+            "total": sum(by_priority.values()),
+            "by_priority": {priority: count for priority, count in by_priority.items() if count}
+        }
+    return depths
@@ -0,0 +1,158 @@
+import os
+import json
+import time
+import socket
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+from .output_capture import SUBPROCESS_MARKER
+
+logging.basicConfig(level=logging.INFO)
+
+# Maximum number of compiled scripts kept per worker process
+SCRIPT_CACHE_SIZE = int(os.getenv("SCRIPT_CACHE_SIZE", 128))
+
+# Scripts containing this marker are imported once and run through main(**params)
+PERSISTENT_MARKER = "# procg: persistent"
+
+# Seconds between stats snapshots pushed to Redis by each worker process
+SCRIPT_CACHE_STATS_INTERVAL = int(os.getenv("SCRIPT_CACHE_STATS_INTERVAL", 10))
+STATS_KEY_PREFIX = "script_cache:stats"
+
+
+class CachedScript:
+    __slots__ = ("path", "mtime_ns", "size", "sha256", "code", "persistent", "isolated", "namespace")
+
+    def __init__(self, path, mtime_ns, size, sha256, code, persistent, isolated=False):
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.sha256 = sha256
+        self.code = code
+        self.persistent = persistent
+        self.isolated = isolated  # run in a child interpreter
+        self.namespace = None   # module globals for persistent scripts
+
+
+_entries = OrderedDict()
+_lock = threading.RLock()
+_stats = {"hits": 0, "misses": 0, "recompiles": 0, "evictions": 0}
+_last_published = 0.0
+
+
+def load(path):
+    """
+    Return the CachedScript for path, compiling it only when needed.
+
+    A stat() per call detects changes; when mtime/size differ the file is
+    re-read and only recompiled if its sha256 changed too.
+    """
+    st = os.stat(path)
+
+    with _lock:
+        entry = _entries.get(path)
+        if entry is not None and entry.mtime_ns == st.st_mtime_ns and entry.size == st.st_size:
+            _entries.move_to_end(path)
+            _stats["hits"] += 1
+            return entry
+
+    with open(path, 'rb') as file:
+        source = file.read()
+    sha256 = hashlib.sha256(source).hexdigest()
+
+    with _lock:
+        if entry is not None and entry.sha256 == sha256:
+            # Touched but unchanged: keep the compiled code and loaded module
+            entry.mtime_ns = st.st_mtime_ns
+            entry.size = st.st_size
+            _entries.move_to_end(path)
+            _stats["hits"] += 1
+            return entry
+
+    code = compile(source, path, 'exec')
+    persistent = PERSISTENT_MARKER.encode() in source
+    isolated = SUBPROCESS_MARKER.encode() in source
+
+    with _lock:
+        if entry is None:
+            _stats["misses"] += 1
+        else:
+            _stats["recompiles"] += 1
+            logging.info(f"Script changed, recompiled: {path}")
+
+        entry = CachedScript(path, st.st_mtime_ns, st.st_size, sha256, code, persistent, isolated)
+        _entries[path] = entry
+        _entries.move_to_end(path)
+
+        while len(_entries) > SCRIPT_CACHE_SIZE:
+            _entries.popitem(last=False)
+            _stats["evictions"] += 1
+
+    return entry
+
+
+def get_entry_point(entry, name="main"):
+    """
+    Import a persistent script once (per compiled version) and return its
+    entry point. Module-level state survives between task runs.
+    """
+    with _lock:
+        if entry.namespace is None:
+            namespace = {
+                "__builtins__": __builtins__,
+                "__name__": f"procg_script_{entry.sha256[:12]}",
+                "__file__": entry.path
+            }
+            exec(entry.code, namespace)
+            entry.namespace = namespace
+
+    func = entry.namespace.get(name)
+    if not callable(func):
+        raise AttributeError(f"Persistent script '{entry.path}' does not define {name}(**params)")
+    return func
+
+
+def stats():
+    with _lock:
+        return {
+            **_stats,
+            "pid": os.getpid(),
+            "size": len(_entries),
+            "max_size": SCRIPT_CACHE_SIZE,
+            "scripts": [
+                {
+                    "path": entry.path,
+                    "sha256": entry.sha256,
+                    "persistent": entry.persistent,
+                    "isolated": entry.isolated,
+                    "loaded": entry.namespace is not None
+                }
+                for entry in _entries.values()
+            ]
+        }
+
+
+def clear():
+    with _lock:
+        _entries.clear()
+
+
+def publish_stats(force=False):
+    """
+    Push this process's stats to Redis (throttled) so the API can report on
+    every worker process, not just the one that answers a broadcast.
+    """
+    global _last_published
+    now = time.monotonic()
+    if not force and now - _last_published < SCRIPT_CACHE_STATS_INTERVAL:
+        return
+    _last_published = now
+
+    try:
+        from executors.extensions import redis_client
+        key = f"{STATS_KEY_PREFIX}:{socket.gethostname()}:{os.getpid()}"
+        redis_client.set(key, json.dumps(stats()), ex=SCRIPT_CACHE_STATS_INTERVAL * 6)
+    except Exception as e:
+        logging.warning(f"Failed to publish script cache stats: {e}")
@@ -1,12 +1,12 @@
-import os
 import psycopg2
 from celery import shared_task
 import logging
 import json
 
+from .db_pool import pooled_connection
+
 logging.basicConfig(level=logging.INFO)
 
-db_url = os.getenv("DATABASE_URL")
 
 @shared_task(bind=True)
 def execute(self, *args, **kwargs):
@@ -19,36 +19,26 @@ def execute(self, *args, **kwargs):
     schedule = args[6] if len(args) > 6 else None
     params = kwargs
 
-    conn = None
-    cursor = None
-
     try:
-        logging.info("Attempting to connect to the database for function")
-        conn = psycopg2.connect(db_url)
-        logging.info("Database connection for function successful.")
-
-        if conn is None:
-            logging.error("Database connection object for function is None.")
-            return {"error": "Failed to establish database connection for function."}
+        with pooled_connection() as (conn, pool_wait_ms):
+            with conn.cursor() as cursor:
 
-        cursor = conn.cursor()
+                if params:
+                    placeholders = ', '.join(['%s'] * len(params))
+                    call_query = f"SELECT {stored_function_name}({placeholders});"
+                    cursor.execute(call_query, list(params.values()))
+                else:
+                    call_query = f"SELECT {stored_function_name}();"
+                    cursor.execute(call_query)
 
-        if params:
-            placeholders = ', '.join(['%s'] * len(params))
-            call_query = f"SELECT {stored_function_name}({placeholders});"
-            cursor.execute(call_query, list(params.values()))
-        else:
-            call_query = f"SELECT {stored_function_name}();"
-            cursor.execute(call_query)
+                output = None
+                if cursor.description:
+                    output = cursor.fetchall()
+                    if output:
+                        output = output[0][0]  
+                        logging.info(f"Stored function output: {output}")
 
-        output = None
-        if cursor.description:
-            output = cursor.fetchall()
-            if output:
-                output = output[0][0]  
-                logging.info(f"Stored function output: {output}")
-
-        conn.commit()
+            conn.commit()
 
         return {
             "user_task_name": user_task_name,
@@ -62,6 +52,7 @@ def execute(self, *args, **kwargs):
             "kwargs": params,
             "parameters": params,
             "result": output,  
+            "pool_wait_ms": pool_wait_ms,
             "message": "Stored function executed successfully!"
         }
 
@@ -71,16 +62,3 @@ def execute(self, *args, **kwargs):
     except Exception as e:
         logging.exception("An unexpected error occurred (function):")
         return {"error": f"Stored function execution failed: {str(e)}"}
-
-    finally:
-        if cursor is not None:
-            try:
-                cursor.close()
-            except Exception as e:
-                logging.error(f"Failed to close cursor (function): {e}", exc_info=True)
-
-        if conn is not None:
-            try:
-                conn.close()
-            except Exception as e:
-                logging.error(f"Failed to close connection (function): {e}", exc_info=True)
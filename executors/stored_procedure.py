@@ -1,11 +1,16 @@
 import os
 import psycopg2
+from psycopg2.extras import execute_batch as pg_execute_batch
 from celery import shared_task
 import logging
 
+from .db_pool import pooled_connection
+
 logging.basicConfig(level=logging.INFO)
 
-db_url = os.getenv("DATABASE_URL")
+# Default number of parameter sets per commit for execute_batch
+BATCH_COMMIT_EVERY = int(os.getenv("PROCEDURE_BATCH_COMMIT_EVERY", 100))
+
 
 @shared_task(bind=True)
 def execute(self, *args, **kwargs):
@@ -18,44 +23,34 @@ def execute(self, *args, **kwargs):
     schedule = args[6] if len(args) > 6 else None
     params = kwargs
 
-    conn = None
-    cursor = None
-
     try:
-        logging.info("Attempting to connect to the database...")
-        conn = psycopg2.connect(db_url)
-        logging.info("Database connection successful.")
-
-        if conn is None:
-            logging.error("Database connection object is None.")
-            return {"error": "Failed to establish database connection."}
-
-        cursor = conn.cursor()
-
-        # Add a placeholder for the OUT parameter
-        # call_query = f"CALL {stored_procedure_name}(%s);"
-        # out_param = None  # This will hold the output value
-
-        # cursor.execute(call_query, (out_param,))  # Execute the stored procedure
-        # output = cursor.fetchone()  # Fetch the output
-
-        param_values = list(params.values()) if params else []
-        placeholders = ', '.join(['%s'] * len(param_values))
-        if placeholders:
-            call_query = f"CALL {stored_procedure_name}({placeholders});"
-            cursor.execute(call_query, param_values)
-        else:
-            call_query = f"CALL {stored_procedure_name}();"
-            cursor.execute(call_query, (None,))
-
-        # If your procedure returns something, fetch it here (optional)
-        output = None
-        try:
-            output = cursor.fetchone()
-        except Exception:
-            output = None
-
-        conn.commit()
+        with pooled_connection() as (conn, pool_wait_ms):
+            with conn.cursor() as cursor:
+
+                # Add a placeholder for the OUT parameter
+                # call_query = f"CALL {stored_procedure_name}(%s);"
+                # out_param = None  # This will hold the output value
+
+                # cursor.execute(call_query, (out_param,))  # Execute the stored procedure
+                # output = cursor.fetchone()  # Fetch the output
+
+                param_values = list(params.values()) if params else []
+                placeholders = ', '.join(['%s'] * len(param_values))
+                if placeholders:
+                    call_query = f"CALL {stored_procedure_name}({placeholders});"
+                    cursor.execute(call_query, param_values)
+                else:
+                    call_query = f"CALL {stored_procedure_name}();"
+                    cursor.execute(call_query, (None,))
+
+                # If your procedure returns something, fetch it here (optional)
+                output = None
+                try:
+                    output = cursor.fetchone()
+                except Exception:
+                    output = None
+
+            conn.commit()
 
         return {
             "user_task_name": user_task_name,
@@ -69,6 +64,7 @@ def execute(self, *args, **kwargs):
             "kwargs": params,
             "parameters": params,
             "result": output[0] if output else None,  
+            "pool_wait_ms": pool_wait_ms,
             "message": "Stored procedure executed successfully!"
         }
 
@@ -79,18 +75,136 @@ def execute(self, *args, **kwargs):
         logging.exception("An unexpected error occurred:")
         return {"error": f"Stored procedure execution failed: {str(e)}"}
 
-    finally:
-        if cursor is not None:
-            try:
-                cursor.close()
-            except Exception as e:
-                logging.error(f"Failed to close cursor: {e}", exc_info=True)
-
-        if conn is not None:
-            try:
-                conn.close()
-            except Exception as e:
-                logging.error(f"Failed to close connection: {e}", exc_info=True)
+
+@shared_task(bind=True)
+def execute_batch(self, *args, **kwargs):
+    """
+    Run one stored procedure for many parameter sets over a single connection.
+
+    kwargs:
+        batch (list[dict]): one dict of procedure parameters per CALL. Every
+            dict must use the same parameter names as the first one.
+        commit_every (int): commit after this many items (default
+            PROCEDURE_BATCH_COMMIT_EVERY).
+        stop_on_error (bool): stop at the first failed item instead of
+            recording it and moving on (default False).
+
+    Each chunk of commit_every items is sent with execute_batch. If the chunk
+    fails it is rolled back to a savepoint and replayed one item at a time so
+    the failing items can be reported individually.
+    """
+    stored_procedure_name = args[0] if len(args) > 0 else None
+    user_task_name = args[1] if len(args) > 1 else None
+    task_name = args[2] if len(args) > 2 else None
+    user_schedule_name = args[3] if len(args) > 3 else None
+    redbeat_schedule_name = args[4] if len(args) > 4 else None
+    schedule_type = args[5] if len(args) > 5 else None
+    schedule = args[6] if len(args) > 6 else None
+    params = kwargs
+
+    batch = params.get('batch') or []
+    commit_every = int(params.get('commit_every') or BATCH_COMMIT_EVERY)
+    stop_on_error = bool(params.get('stop_on_error', False))
+
+    if not isinstance(batch, list) or not all(isinstance(item, dict) for item in batch):
+        return {"error": "'batch' must be a list of parameter dictionaries."}
+    if commit_every < 1:
+        return {"error": "'commit_every' must be a positive integer."}
+
+    param_names = list(batch[0].keys()) if batch else []
+    placeholders = ', '.join(['%s'] * len(param_names))
+    call_query = f"CALL {stored_procedure_name}({placeholders});"
+
+    succeeded = 0
+    errors = []
+    commits = 0
+
+    def call_one(cursor, index, values):
+        nonlocal succeeded
+        cursor.execute("SAVEPOINT batch_item;")
+        try:
+            cursor.execute(call_query, values)
+            cursor.execute("RELEASE SAVEPOINT batch_item;")
+            succeeded += 1
+            return True
+        except psycopg2.Error as item_err:
+            cursor.execute("ROLLBACK TO SAVEPOINT batch_item;")
+            errors.append({"index": index, "parameters": batch[index], "error": str(item_err).strip()})
+            return False
+
+    try:
+        with pooled_connection() as (conn, pool_wait_ms):
+            with conn.cursor() as cursor:
+                stopped = False
+
+                for chunk_start in range(0, len(batch), commit_every):
+                    chunk = []
+                    for index in range(chunk_start, min(chunk_start + commit_every, len(batch))):
+                        item = batch[index]
+                        if set(item.keys()) != set(param_names):
+                            errors.append({
+                                "index": index,
+                                "parameters": item,
+                                "error": f"Parameter names differ from the first item: expected {param_names}"
+                            })
+                            continue
+                        chunk.append((index, [item[name] for name in param_names]))
+
+                    if errors and stop_on_error:
+                        stopped = True
+                        break
+
+                    # Fast path: whole chunk in one round trip
+                    cursor.execute("SAVEPOINT batch_chunk;")
+                    try:
+                        pg_execute_batch(cursor, call_query, [values for _, values in chunk], page_size=commit_every)
+                        cursor.execute("RELEASE SAVEPOINT batch_chunk;")
+                        succeeded += len(chunk)
+                    except psycopg2.Error:
+                        # Slow path: replay item by item to isolate the failures
+                        cursor.execute("ROLLBACK TO SAVEPOINT batch_chunk;")
+                        for index, values in chunk:
+                            if not call_one(cursor, index, values) and stop_on_error:
+                                stopped = True
+                                break
+
+                    conn.commit()
+                    commits += 1
+
+                    if stopped:
+                        break
+
+        return {
+            "user_task_name": user_task_name,
+            "task_name": task_name,
+            "executor": self.name,
+            "user_schedule_name": user_schedule_name,
+            "redbeat_schedule_name": redbeat_schedule_name,
+            "schedule_type": schedule_type,
+            "schedule": schedule,
+            "args": args,
+            "kwargs": params,
+            "parameters": params,
+            "result": {
+                "total": len(batch),
+                "succeeded": succeeded,
+                "failed": len(errors),
+                "skipped": len(batch) - succeeded - len(errors),
+                "commits": commits,
+                "commit_every": commit_every,
+                "errors": errors
+            },
+            "pool_wait_ms": pool_wait_ms,
+            "message": "Stored procedure batch executed successfully!" if not errors
+                       else "Stored procedure batch executed with errors."
+        }
+
+    except psycopg2.Error as db_err:
+        logging.error(f"psycopg2 error (batch): {db_err}", exc_info=True)
+        return {"error": f"Stored procedure batch execution failed: {str(db_err)}"}
+    except Exception as e:
+        logging.exception("An unexpected error occurred (batch):")
+        return {"error": f"Stored procedure batch execution failed: {str(e)}"}
 
 
 # import os
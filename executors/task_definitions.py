@@ -0,0 +1,181 @@
+"""
+Process-local cache of task definitions and their parameter validators.
+
+The scheduling endpoints read def_async_tasks and def_async_task_params
+from here instead of querying them on every call. The first lookup loads
+both tables (two queries) and compiles each task's parameters into a
+pydantic model; after that a lookup is a dict access.
+
+Writes to either table call invalidate(): it INCRs the version key and
+publishes the new version on TASK_DEFINITIONS_CHANNEL. Each process
+listens on a daemon thread and reloads on its next lookup. The version
+read before a load is kept with it, so a change published while a load
+is running still marks that load stale. TASK_DEFINITIONS_CACHE_TTL bounds
+staleness if messages are lost (e.g. while the listener reconnects).
+
+Parameter data_type values are free text; the usual names map to Python
+types (see DATA_TYPES), anything else accepts any value. Validation only
+checks the values: kwargs keep what the caller sent.
+"""
+import os
+import time
+import logging
+import threading
+from decimal import Decimal
+from datetime import date, datetime
+from typing import Annotated, Any, Optional
+
+from pydantic import BeforeValidator, Field, ValidationError, create_model
+
+logging.basicConfig(level=logging.INFO)
+
+TASK_DEFINITIONS_CACHE_TTL = int(os.getenv("TASK_DEFINITIONS_CACHE_TTL", 300))
+
+VERSION_KEY = "task_definitions:version"
+TASK_DEFINITIONS_CHANNEL = "task_definitions:invalidate"
+
+
+def _scalar_to_str(value):
+    # Numbers (and booleans) have always been accepted for string parameters
+    return str(value) if isinstance(value, (int, float, Decimal)) else value
+
+
+String = Annotated[str, BeforeValidator(_scalar_to_str)]
+
+DATA_TYPES = {
+    "string": String, "str": String, "text": String, "varchar": String, "varchar2": String, "char": String,
+    "int": int, "integer": int, "bigint": int, "smallint": int,
+    "number": float, "numeric": float, "decimal": float, "float": float, "double": float, "real": float,
+    "bool": bool, "boolean": bool,
+    "date": date,
+    "datetime": datetime, "timestamp": datetime,
+    "object": dict, "dict": dict,
+    "array": list, "list": list,
+}
+
+_definitions = {}
+_loaded_at = 0.0
+_loaded_version = -1
+_latest_version = 0
+_listener_pid = None
+_lock = threading.Lock()
+
+
+class TaskDefinition:
+    def __init__(self, task_name, user_task_name, executor, script_name, cancelled_yn, parameters):
+        self.task_name = task_name
+        self.user_task_name = user_task_name
+        self.executor = executor
+        self.script_name = script_name
+        self.cancelled_yn = cancelled_yn or 'N'
+        # [(parameter_name, data_type)] in definition order
+        self.parameters = parameters
+        self.parameter_names = [name for name, _ in parameters]
+        self._validator = _compile(task_name, parameters) if parameters else None
+
+    def validate(self, values):
+        """(kwargs, errors) for the parameters a caller sent; kwargs hold only defined parameters."""
+        values = values or {}
+        errors = []
+        if self._validator is not None:
+            try:
+                self._validator.model_validate(values)
+            except ValidationError as e:
+                for error in e.errors():
+                    name = error["loc"][0] if error["loc"] else None
+                    if error["type"] == "missing":
+                        errors.append(f"Missing value for parameter: {name}")
+                    else:
+                        errors.append(f"Invalid value for parameter {name}: {error['msg']}")
+        return {name: values[name] for name in self.parameter_names if name in values}, errors
+
+
+def _compile(task_name, parameters):
+    # Aliased fields: parameter names need not be Python identifiers; None stays allowed
+    fields = {
+        f"p{index}": (Optional[DATA_TYPES.get(str(data_type or "").strip().lower(), Any)], Field(..., alias=name))
+        for index, (name, data_type) in enumerate(parameters)
+    }
+    return create_model(f"{task_name}_parameters", **fields)
+
+
+def _redis():
+    from .extensions import redis_client
+    return redis_client
+
+
+def _listen():
+    global _latest_version
+    while True:
+        try:
+            pubsub = _redis().pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(TASK_DEFINITIONS_CHANNEL)
+            # Catch up on anything published while we were not subscribed
+            _latest_version = max(_latest_version, int(_redis().get(VERSION_KEY) or 0))
+            for message in pubsub.listen():
+                _latest_version = max(_latest_version, int(message["data"]))
+        except Exception as e:
+            logging.error(f"Task definition invalidation listener failed: {e}")
+            time.sleep(5)
+
+
+def _ensure_listener():
+    # One listener per process; a forked worker starts its own
+    global _listener_pid
+    if _listener_pid != os.getpid():
+        _listener_pid = os.getpid()
+        threading.Thread(target=_listen, name="task-definitions-listener", daemon=True).start()
+
+
+def _load():
+    from .extensions import db
+    from .models import DefAsyncTask, DefAsyncTaskParam
+
+    parameters = {}
+    for task_name, parameter_name, data_type in db.session.query(
+        DefAsyncTaskParam.task_name, DefAsyncTaskParam.parameter_name, DefAsyncTaskParam.data_type
+    ).order_by(DefAsyncTaskParam.def_param_id):
+        parameters.setdefault(task_name, []).append((parameter_name, data_type))
+
+    return {
+        row.task_name: TaskDefinition(row.task_name, row.user_task_name, row.executor, row.script_name,
+                                      row.cancelled_yn, parameters.get(row.task_name, []))
+        for row in db.session.query(
+            DefAsyncTask.task_name, DefAsyncTask.user_task_name, DefAsyncTask.executor,
+            DefAsyncTask.script_name, DefAsyncTask.cancelled_yn
+        )
+    }
+
+
+def _stale():
+    return _loaded_version < _latest_version or time.monotonic() - _loaded_at >= TASK_DEFINITIONS_CACHE_TTL
+
+
+def get_definitions():
+    """{task_name: TaskDefinition} for this process, reloaded after invalidate()."""
+    global _definitions, _loaded_at, _loaded_version
+    _ensure_listener()
+    if not _stale():
+        return _definitions
+    with _lock:
+        if _stale():
+            version = _latest_version
+            _definitions = _load()
+            _loaded_version = version
+            _loaded_at = time.monotonic()
+    return _definitions
+
+
+def get_definition(task_name):
+    return get_definitions().get(task_name)
+
+
+def invalidate():
+    """Reload task definitions in every process (call after changing tasks or their parameters)."""
+    global _loaded_at
+    _loaded_at = 0.0
+    try:
+        client = _redis()
+        client.publish(TASK_DEFINITIONS_CHANNEL, client.incr(VERSION_KEY))
+    except Exception as e:
+        logging.error(f"Could not publish task definition invalidation: {e}")
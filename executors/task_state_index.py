@@ -0,0 +1,182 @@
+"""
+Compact task-state index kept in Redis from Celery events.
+
+Replaces fetching Flower's whole /api/tasks table on every page view:
+
+    task_state:<task_id>     hash {state, worker, uuid, timestamp[, meta]}  (TTL)
+    task_state:active        zset task_id -> timestamp, tasks not yet finished
+    task_state:unsuccessful  zset task_id -> timestamp, tasks that ended FAILURE,
+                             REVOKED or REJECTED (kept as long as their state)
+
+Run the consumer next to the workers (workers must send events):
+
+    python -m executors.task_state_index
+"""
+import os
+import ast
+import json
+import time
+import logging
+
+from celery import states
+
+logging.basicConfig(level=logging.INFO)
+
+KEY_PREFIX = "task_state"
+ACTIVE_KEY = f"{KEY_PREFIX}:active"
+UNSUCCESSFUL_KEY = f"{KEY_PREFIX}:unsuccessful"
+
+# Seconds a task's state is kept after its last event
+TASK_STATE_TTL = int(os.getenv("TASK_STATE_TTL", 7 * 24 * 3600))
+# Unfinished tasks older than this are dropped from the active set
+TASK_STATE_ACTIVE_TTL = int(os.getenv("TASK_STATE_ACTIVE_TTL", 24 * 3600))
+
+EVENT_STATES = {
+    "task-sent": states.PENDING,
+    "task-received": states.RECEIVED,
+    "task-started": states.STARTED,
+    "task-succeeded": states.SUCCESS,
+    "task-failed": states.FAILURE,
+    "task-retried": states.RETRY,
+    "task-revoked": states.REVOKED,
+    "task-rejected": states.REJECTED,
+}
+
+# Positional args every executor receives, in order
+ARG_FIELDS = (
+    "script_name", "user_task_name", "task_name", "user_schedule_name",
+    "redbeat_schedule_name", "schedule_type", "schedule"
+)
+
+
+def _redis():
+    from executors.extensions import redis_client
+    return redis_client
+
+
+def _state_key(task_id):
+    return f"{KEY_PREFIX}:{task_id}"
+
+
+def _parse_args(raw_args):
+    try:
+        args_list = ast.literal_eval(raw_args) if isinstance(raw_args, str) else list(raw_args or [])
+    except Exception:
+        args_list = []
+    return {name: (args_list[i] if len(args_list) > i else None) for i, name in enumerate(ARG_FIELDS)}
+
+
+def record_event(event, client=None):
+    """Apply one Celery task event to the index."""
+    state = EVENT_STATES.get(event.get("type"))
+    task_id = event.get("uuid")
+    if not state or not task_id:
+        return
+
+    client = client or _redis()
+    key = _state_key(task_id)
+
+    # Events can arrive out of order; never move a finished task back
+    current = client.hget(key, "state")
+    if current in states.READY_STATES and state not in states.READY_STATES:
+        return
+
+    timestamp = event.get("timestamp") or time.time()
+    mapping = {"state": state, "uuid": task_id, "timestamp": timestamp}
+    if event.get("hostname"):
+        mapping["worker"] = event["hostname"]
+    if event.get("type") == "task-received":
+        meta = _parse_args(event.get("args"))
+        meta["args"] = event.get("args")
+        meta["kwargs"] = event.get("kwargs")
+        mapping["meta"] = json.dumps(meta, default=str)
+
+    pipe = client.pipeline(transaction=False)
+    pipe.hset(key, mapping=mapping)
+    pipe.expire(key, TASK_STATE_TTL)
+    if state in states.READY_STATES:
+        pipe.zrem(ACTIVE_KEY, task_id)
+        if state != states.SUCCESS:
+            pipe.zadd(UNSUCCESSFUL_KEY, {task_id: timestamp})
+    else:
+        pipe.zadd(ACTIVE_KEY, {task_id: timestamp})
+    pipe.execute()
+
+
+def get_states(task_ids):
+    """Return {task_id: {"state", "worker", "uuid"}} for the ids that are indexed."""
+    task_ids = [task_id for task_id in task_ids if task_id]
+    if not task_ids:
+        return {}
+
+    pipe = _redis().pipeline(transaction=False)
+    for task_id in task_ids:
+        pipe.hmget(_state_key(task_id), "state", "worker", "uuid")
+
+    found = {}
+    for task_id, (state, worker, uuid) in zip(task_ids, pipe.execute()):
+        if state is not None:
+            found[task_id] = {"state": state, "worker": worker, "uuid": uuid}
+    return found
+
+
+def get_active(limit=100, include_unsuccessful=False):
+    """
+    Return the newest unfinished tasks as a list of dicts (state, worker,
+    uuid and the parsed executor args when the task was received).
+    include_unsuccessful also returns tasks that ended FAILURE, REVOKED or
+    REJECTED within TASK_STATE_TTL, i.e. every state except SUCCESS.
+    """
+    client = _redis()
+    now = time.time()
+    client.zremrangebyscore(ACTIVE_KEY, 0, now - TASK_STATE_ACTIVE_TTL)
+    entries = client.zrevrange(ACTIVE_KEY, 0, limit - 1, withscores=True)
+    if include_unsuccessful:
+        client.zremrangebyscore(UNSUCCESSFUL_KEY, 0, now - TASK_STATE_TTL)
+        entries += client.zrevrange(UNSUCCESSFUL_KEY, 0, limit - 1, withscores=True)
+        entries.sort(key=lambda entry: entry[1], reverse=True)
+    task_ids = list(dict.fromkeys(task_id for task_id, _ in entries))[:limit]
+    if not task_ids:
+        return []
+
+    pipe = client.pipeline(transaction=False)
+    for task_id in task_ids:
+        pipe.hgetall(_state_key(task_id))
+
+    active = []
+    for task_id, data in zip(task_ids, pipe.execute()):
+        if not data:
+            continue
+        item = {"task_id": task_id, "state": data.get("state"),
+                "worker": data.get("worker"), "uuid": data.get("uuid")}
+        item.update(json.loads(data["meta"]) if data.get("meta") else {})
+        active.append(item)
+    return active
+
+
+def run_consumer(app):
+    """Consume task events forever, reconnecting on broker errors."""
+    client = _redis()
+
+    def on_event(event):
+        try:
+            record_event(event, client)
+        except Exception as e:
+            logging.error(f"Failed to index task event {event.get('type')}: {e}")
+
+    while True:
+        try:
+            with app.connection() as connection:
+                receiver = app.events.Receiver(connection, handlers={"*": on_event})
+                logging.info("Task state index consumer connected.")
+                receiver.capture(limit=None, timeout=None, wakeup=True)
+        except (KeyboardInterrupt, SystemExit):
+            raise
+        except Exception as e:
+            logging.error(f"Task event consumer disconnected: {e}. Reconnecting in 5s.")
+            time.sleep(5)
+
+
+if __name__ == "__main__":
+    from executors import celery_app
+    run_consumer(celery_app)
@@ -0,0 +1,344 @@
+"""
+Workflow (DAG) engine on top of DefAsyncTask.
+
+A workflow is a set of nodes, each running one DefAsyncTask, with
+depends_on edges and param_mappings that feed an upstream node's result into
+a downstream node's parameters ({"param": "node_name.result.path"}).
+
+A run is one Celery canvas:
+
+    chain(group(layer 1), group(layer 2), ..., finish_run)
+
+Layers are the DAG's topological levels, split into groups of at most
+max_concurrency nodes, so independent nodes run in parallel and at most
+max_concurrency of them are in flight. Every node writes its own row in
+def_async_task_requests (PENDING up front, final status via the result store,
+or written by run_node itself when RESULT_STORE=database).
+"""
+import json
+import uuid
+import logging
+from datetime import datetime
+
+from celery import shared_task, group, chain, current_app
+
+from .extensions import db
+from .models import (
+    DefAsyncTask,
+    DefAsyncTaskParam,
+    DefAsyncTaskRequest,
+    DefAsyncWorkflowRun
+)
+from . import result_store
+
+logging.basicConfig(level=logging.INFO)
+
+SCHEDULE_TYPE = "WORKFLOW"
+
+
+class WorkflowError(ValueError):
+    pass
+
+
+def validate_max_concurrency(value):
+    """None (no limit) or a positive integer."""
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        raise WorkflowError("max_concurrency must be a positive integer")
+    return value
+
+
+def topological_layers(dependencies):
+    """
+    dependencies: {node_name: [upstream node names]}.
+    Returns [[node names], ...] where each layer only depends on earlier ones.
+    """
+    for node_name, upstream in dependencies.items():
+        for dep in upstream:
+            if dep not in dependencies:
+                raise WorkflowError(f"Node '{node_name}' depends on unknown node '{dep}'")
+            if dep == node_name:
+                raise WorkflowError(f"Node '{node_name}' depends on itself")
+
+    remaining = {name: set(upstream) for name, upstream in dependencies.items()}
+    layers = []
+    while remaining:
+        ready = sorted(name for name, upstream in remaining.items() if not upstream)
+        if not ready:
+            raise WorkflowError(f"Workflow has a cycle between: {', '.join(sorted(remaining))}")
+        layers.append(ready)
+        for name in ready:
+            del remaining[name]
+        for upstream in remaining.values():
+            upstream.difference_update(ready)
+    return layers
+
+
+def ancestors(dependencies, node_name):
+    seen, stack = set(), list(dependencies.get(node_name, []))
+    while stack:
+        dep = stack.pop()
+        if dep not in seen:
+            seen.add(dep)
+            stack.extend(dependencies.get(dep, []))
+    return seen
+
+
+def validate_nodes(nodes):
+    """
+    Check a list of node dicts (node_name, task_name, parameters?,
+    depends_on?, param_mappings?) and return its topological layers.
+    """
+    if not nodes:
+        raise WorkflowError("A workflow needs at least one node")
+
+    dependencies = {}
+    for node in nodes:
+        node_name = node.get('node_name')
+        if not node_name or not node.get('task_name'):
+            raise WorkflowError("Every node needs a node_name and a task_name")
+        if node_name in dependencies:
+            raise WorkflowError(f"Duplicate node_name '{node_name}'")
+        depends_on = node.get('depends_on') or []
+        if not isinstance(depends_on, list):
+            raise WorkflowError(f"depends_on of node '{node_name}' must be a list")
+        dependencies[node_name] = depends_on
+
+    layers = topological_layers(dependencies)
+
+    for node in nodes:
+        for param, path in (node.get('param_mappings') or {}).items():
+            source = str(path).split('.', 1)[0]
+            if source not in ancestors(dependencies, node['node_name']):
+                raise WorkflowError(
+                    f"Mapping '{param}' of node '{node['node_name']}' reads '{source}', "
+                    f"which is not upstream of it"
+                )
+
+    task_names = {node['task_name'] for node in nodes}
+    tasks = {task.task_name: task for task in DefAsyncTask.query.filter(DefAsyncTask.task_name.in_(task_names))}
+    for task_name in task_names:
+        task = tasks.get(task_name)
+        if not task:
+            raise WorkflowError(f"No task found with task_name: {task_name}")
+        if task.cancelled_yn == 'Y':
+            raise WorkflowError(f"Task '{task_name}' is cancelled and cannot be used in a workflow")
+
+    return layers
+
+
+def resolve_path(outputs, path):
+    """'extract.result.rows.0.id' -> outputs['extract']['result']['rows'][0]['id']"""
+    value = outputs
+    for part in str(path).split('.'):
+        if isinstance(value, list) and part.lstrip('-').isdigit():
+            value = value[int(part)]
+        elif isinstance(value, dict) and part in value:
+            value = value[part]
+        else:
+            raise KeyError(f"'{path}' not found in upstream results")
+    return value
+
+
+def _merge(upstream):
+    """Upstream is None (first layer), one node's return value, or a group's list of them."""
+    outputs, failed = {}, set()
+    items = upstream if isinstance(upstream, list) else [upstream]
+    for item in items:
+        if isinstance(item, dict):
+            outputs.update(item.get('outputs') or {})
+            failed.update(item.get('failed') or [])
+    return outputs, failed
+
+
+def start_run(workflow, overrides=None, created_by=None):
+    """
+    Launch a run of a DefAsyncWorkflow. overrides: {"node_name": {param: value}}
+    merged over each node's static parameters. Returns the DefAsyncWorkflowRun.
+    """
+    if workflow.cancelled_yn == 'Y':
+        raise WorkflowError(f"Workflow '{workflow.workflow_name}' is cancelled and cannot be run")
+
+    nodes = workflow.nodes
+    layers = validate_nodes([node.json() for node in nodes])
+    overrides = overrides or {}
+
+    tasks = {task.task_name: task for task in
+             DefAsyncTask.query.filter(DefAsyncTask.task_name.in_({node.task_name for node in nodes}))}
+    required = {}
+    for param in DefAsyncTaskParam.query.filter(DefAsyncTaskParam.task_name.in_(tasks)).all():
+        required.setdefault(param.task_name, []).append(param.parameter_name)
+
+    # Outputs are only carried between nodes when some mapping reads them
+    mapped_sources = {
+        str(path).split('.', 1)[0]
+        for node in nodes for path in (node.param_mappings or {}).values()
+    }
+
+    run = DefAsyncWorkflowRun(
+        workflow_id=workflow.workflow_id,
+        status='PENDING',
+        parameters=overrides,
+        created_by=created_by,
+        creation_date=datetime.utcnow(),
+        last_updated_by=created_by,
+        last_update_date=datetime.utcnow()
+    )
+    db.session.add(run)
+    db.session.flush()
+
+    specs, node_task_ids = {}, {}
+    for node in nodes:
+        task = tasks[node.task_name]
+        parameters = dict(node.parameters or {})
+        parameters.update(overrides.get(node.node_name) or {})
+        mappings = node.param_mappings or {}
+
+        missing = [name for name in required.get(node.task_name, [])
+                   if name not in parameters and name not in mappings]
+        if missing:
+            raise WorkflowError(f"Node '{node.node_name}' is missing parameters: {', '.join(missing)}")
+
+        task_id = str(uuid.uuid4())
+        created_at = datetime.utcnow()
+        node_task_ids[node.node_name] = task_id
+        specs[node.node_name] = {
+            "task_id": task_id,
+            "created_at": created_at.isoformat(),
+            "executor": task.executor,
+            "args": [task.script_name, task.user_task_name, task.task_name, workflow.workflow_name,
+                     None, SCHEDULE_TYPE, {"workflow_run_id": run.run_id, "node": node.node_name}],
+            "parameters": parameters,
+            "param_mappings": mappings,
+            "depends_on": node.depends_on or [],
+            "keep_output": node.node_name in mapped_sources,
+        }
+
+        # Per-node row, updated with the final status when the result is archived
+        db.session.add(DefAsyncTaskRequest(
+            task_id=task_id,
+            status='PENDING',
+            user_task_name=task.user_task_name,
+            task_name=task.task_name,
+            executor=task.executor,
+            user_schedule_name=workflow.workflow_name,
+            schedule_type=SCHEDULE_TYPE,
+            parameters=parameters,
+            workflow_run_id=run.run_id,
+            workflow_node=node.node_name,
+            created_by=created_by,
+            creation_date=created_at,
+            last_update_date=created_at
+        ))
+
+    size = workflow.max_concurrency or 0
+    stages = []
+    for layer in layers:
+        chunk_size = size if size > 0 else len(layer)
+        for start in range(0, len(layer), chunk_size):
+            stages.append(group([
+                run_node.s(run_id=run.run_id, node_name=node_name, spec=specs[node_name])
+                for node_name in layer[start:start + chunk_size]
+            ]))
+
+    final_task_id = str(uuid.uuid4())
+    run.node_task_ids = node_task_ids
+    run.celery_task_id = final_task_id
+    run.status = 'RUNNING'
+    run.started_at = datetime.utcnow()
+    db.session.commit()
+
+    chain(*stages, finish_run.s(run_id=run.run_id).set(task_id=final_task_id)).apply_async()
+    return run
+
+
+def _finish_node_row(spec, state, value):
+    """Final status on the node's row when there is no hot tier to archive it from."""
+    if result_store.get_store() is not None:
+        return
+    try:
+        DefAsyncTaskRequest.query.filter_by(
+            task_id=spec["task_id"], creation_date=datetime.fromisoformat(spec["created_at"])
+        ).update({
+            "status": state,
+            "result": json.loads(json.dumps(value, default=str)),
+            "timestamp": datetime.utcnow(),
+            "last_update_date": datetime.utcnow()
+        }, synchronize_session=False)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logging.error(f"Could not record status of workflow node {spec['task_id']}: {e}")
+
+
+def _skip(spec, run_id, node_name, reason, state):
+    result_store.annotate(spec["task_id"], created_at=spec["created_at"],
+                          workflow_run_id=run_id, workflow_node=node_name)
+    result_store.store_result(spec["task_id"], spec["executor"], spec["args"],
+                              spec["parameters"], {"error": reason}, state)
+    _finish_node_row(spec, state, {"error": reason})
+
+
+@shared_task(bind=True)
+def run_node(self, upstream=None, run_id=None, node_name=None, spec=None):
+    """
+    Run one workflow node: resolve its parameters from upstream outputs and
+    execute its DefAsyncTask executor in this worker (with the node's own
+    task_id, so its result is stored like any other request). Never raises,
+    so one failed branch does not break the chord for the others.
+    """
+    outputs, failed = _merge(upstream)
+
+    blocked = [dep for dep in spec["depends_on"] if dep in failed]
+    if blocked:
+        _skip(spec, run_id, node_name, f"Skipped: upstream node(s) failed: {', '.join(blocked)}", "SKIPPED")
+        failed.add(node_name)
+        return {"outputs": outputs, "failed": sorted(failed)}
+
+    kwargs = dict(spec["parameters"])
+    try:
+        for param, path in spec["param_mappings"].items():
+            kwargs[param] = resolve_path(outputs, path)
+    except (KeyError, IndexError) as e:
+        _skip(spec, run_id, node_name, f"Parameter mapping failed: {e}", "FAILURE")
+        failed.add(node_name)
+        return {"outputs": outputs, "failed": sorted(failed)}
+
+    try:
+        result_store.annotate(spec["task_id"], created_at=spec["created_at"],
+                              workflow_run_id=run_id, workflow_node=node_name)
+        eager = current_app.tasks[spec["executor"]].apply(
+            args=spec["args"], kwargs=kwargs, task_id=spec["task_id"]
+        )
+        value = eager.result
+        if eager.state == "IGNORED":
+            # Outcome stored with update_state() before Ignore() (python_v1)
+            state, value = result_store.reported_outcome(current_app.backend, spec["task_id"])
+            succeeded = state == "SUCCESS"
+        else:
+            succeeded = eager.successful() and not (isinstance(value, dict) and "error" in value)
+            if not eager.successful():
+                value = {"error": str(value)}
+    except Exception as e:
+        logging.error(f"Workflow run {run_id} node {node_name} failed: {e}")
+        value, succeeded = {"error": str(e)}, False
+
+    _finish_node_row(spec, 'SUCCESS' if succeeded else 'FAILURE', value)
+    if not succeeded:
+        failed.add(node_name)
+    if spec["keep_output"]:
+        outputs[node_name] = value
+    return {"outputs": outputs, "failed": sorted(failed)}
+
+
+@shared_task(bind=True)
+def finish_run(self, upstream=None, run_id=None):
+    _, failed = _merge(upstream)
+    run = DefAsyncWorkflowRun.query.get(run_id)
+    if run:
+        run.status = 'FAILURE' if failed else 'SUCCESS'
+        run.finished_at = datetime.utcnow()
+        run.last_update_date = datetime.utcnow()
+        db.session.commit()
+    return {"run_id": run_id, "status": 'FAILURE' if failed else 'SUCCESS', "failed": sorted(failed)}
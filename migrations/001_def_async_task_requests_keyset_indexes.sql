@@ -0,0 +1,15 @@
+-- Keyset pagination for def_async_task_requests listings
+-- (view_requests, view_requests/search, view_requests_v3, view_requests_v4).
+--
+-- Pages are read as
+--   WHERE (creation_date, request_id) < (:cursor_date, :cursor_id)
+--   ORDER BY creation_date DESC, request_id DESC
+--   LIMIT :limit + 1
+-- which this index serves directly, without OFFSET scans.
+--
+-- CONCURRENTLY cannot run inside a transaction block: run with psql autocommit.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS def_async_task_requests_creation_keyset_idx
+    ON def_async_task_requests (creation_date DESC, request_id DESC);
+
+ANALYZE def_async_task_requests;
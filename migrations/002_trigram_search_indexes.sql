@@ -0,0 +1,58 @@
+-- pg_trgm GIN indexes for the list/search endpoints (utils/search.py).
+--
+-- Searches are matched as
+--   lower(replace(<column>, '_', ' ')) LIKE '%<normalized term>%'
+-- so each index below is on exactly that expression. Changing the expression
+-- in utils.search.normalized_column() means rebuilding these indexes.
+--
+-- Views (def_action_items_v, def_async_task_schedules_v) are searched through
+-- the index on their base table column.
+--
+-- CONCURRENTLY cannot run inside a transaction block: run with psql autocommit.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS def_tenants_tenant_name_trgm_idx
+    ON apps.def_tenants USING gin (lower(replace(tenant_name, '_', ' ')) gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS def_users_user_name_trgm_idx
+    ON apps.def_users USING gin (lower(replace(user_name, '_', ' ')) gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS def_persons_first_name_trgm_idx
+    ON apps.def_persons USING gin (lower(replace(first_name, '_', ' ')) gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS def_persons_last_name_trgm_idx
+    ON apps.def_persons USING gin (lower(replace(last_name, '_', ' ')) gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS def_access_models_model_name_trgm_idx
+    ON apps.def_access_models USING gin (lower(replace(model_name, '_', ' ')) gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS def_global_conditions_name_trgm_idx
+    ON apps.def_global_conditions USING gin (lower(replace(name, '_', ' ')) gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS def_data_sources_datasource_name_trgm_idx
+    ON apps.def_data_sources USING gin (lower(replace(datasource_name, '_', ' ')) gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS def_access_entitlements_entitlement_name_trgm_idx
+    ON apps.def_access_entitlements USING gin (lower(replace(entitlement_name, '_', ' ')) gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS def_controls_control_name_trgm_idx
+    ON apps.def_controls USING gin (lower(replace(control_name, '_', ' ')) gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS def_action_items_action_item_name_trgm_idx
+    ON apps.def_action_items USING gin (lower(replace(action_item_name, '_', ' ')) gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS def_control_environments_name_trgm_idx
+    ON apps.def_control_environments USING gin (lower(replace(name, '_', ' ')) gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS def_async_execution_methods_internal_execution_method_trgm_idx
+    ON def_async_execution_methods USING gin (lower(replace(internal_execution_method, '_', ' ')) gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS def_async_tasks_user_task_name_trgm_idx
+    ON def_async_tasks USING gin (lower(replace(user_task_name, '_', ' ')) gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS def_async_task_schedules_task_name_trgm_idx
+    ON def_async_task_schedules USING gin (lower(replace(task_name, '_', ' ')) gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS def_async_task_requests_task_name_trgm_idx
+    ON def_async_task_requests USING gin (lower(replace(task_name, '_', ' ')) gin_trgm_ops);
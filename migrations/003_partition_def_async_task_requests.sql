@@ -0,0 +1,116 @@
+-- Monthly range partitioning of def_async_task_requests on creation_date.
+--
+-- Steps:
+--   1. the existing table is renamed to def_async_task_requests_legacy
+--   2. a partitioned def_async_task_requests is created with the same columns
+--      (primary/unique keys must include creation_date on a partitioned table:
+--      PRIMARY KEY (request_id, creation_date), UNIQUE (task_id, creation_date))
+--   3. one partition per month from the oldest legacy row to three months ahead,
+--      plus a DEFAULT partition as a safety net
+--   4. legacy rows are copied month by month, committing after each month
+--   5. indexes from 001/002 are recreated on the partitioned table
+--
+-- Afterwards executors.partition_maintenance.maintain_request_partitions
+-- (daily, from beat) keeps future partitions created and applies retention.
+-- Drop def_async_task_requests_legacy once the copy has been verified.
+--
+-- Run with psql autocommit (no --single-transaction): the copy loop commits.
+-- Stop the workers and beat first so no results are written during the swap.
+
+ALTER TABLE def_async_task_requests RENAME TO def_async_task_requests_legacy;
+ALTER TABLE def_async_task_requests_legacy RENAME CONSTRAINT def_async_task_requests_pkey TO def_async_task_requests_legacy_pkey;
+ALTER INDEX IF EXISTS def_async_task_requests_creation_keyset_idx RENAME TO def_async_task_requests_legacy_creation_keyset_idx;
+ALTER INDEX IF EXISTS def_async_task_requests_task_name_trgm_idx RENAME TO def_async_task_requests_legacy_task_name_trgm_idx;
+ALTER SEQUENCE def_async_task_requests_request_id_seq OWNED BY NONE;
+
+CREATE TABLE def_async_task_requests (
+    request_id            integer      NOT NULL DEFAULT nextval('def_async_task_requests_request_id_seq'),
+    task_id               varchar(200) NOT NULL,
+    status                varchar(50),
+    user_task_name        varchar(200),
+    task_name             varchar(200),
+    executor              varchar(200),
+    user_schedule_name    varchar(200),
+    redbeat_schedule_name varchar(200),
+    schedule_type         varchar(50),
+    schedule              json,
+    args                  json,
+    kwargs                json,
+    parameters            json,
+    result                json,
+    timestamp             timestamp,
+    created_by            integer,
+    creation_date         timestamp    NOT NULL DEFAULT (now() AT TIME ZONE 'utc'),
+    last_updated_by       integer,
+    last_update_date      timestamp,
+    PRIMARY KEY (request_id, creation_date),
+    UNIQUE (task_id, creation_date)
+) PARTITION BY RANGE (creation_date);
+
+ALTER SEQUENCE def_async_task_requests_request_id_seq OWNED BY def_async_task_requests.request_id;
+
+CREATE TABLE def_async_task_requests_default
+    PARTITION OF def_async_task_requests DEFAULT;
+
+DO $$
+DECLARE
+    month_start date;
+    last_month  date := date_trunc('month', now() AT TIME ZONE 'utc') + interval '3 months';
+BEGIN
+    SELECT date_trunc('month', COALESCE(min(COALESCE(creation_date, timestamp)), now() AT TIME ZONE 'utc'))
+      INTO month_start
+      FROM def_async_task_requests_legacy;
+
+    WHILE month_start <= last_month LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF def_async_task_requests FOR VALUES FROM (%L) TO (%L)',
+            'def_async_task_requests_p' || to_char(month_start, 'YYYYMM'),
+            month_start, month_start + interval '1 month'
+        );
+        month_start := month_start + interval '1 month';
+    END LOOP;
+END $$;
+
+DO $$
+DECLARE
+    month_start date;
+    last_month  date;
+BEGIN
+    SELECT date_trunc('month', min(COALESCE(creation_date, timestamp))),
+           date_trunc('month', max(COALESCE(creation_date, timestamp)))
+      INTO month_start, last_month
+      FROM def_async_task_requests_legacy;
+
+    WHILE month_start <= last_month LOOP
+        INSERT INTO def_async_task_requests
+        SELECT request_id, task_id, status, user_task_name, task_name, executor,
+               user_schedule_name, redbeat_schedule_name, schedule_type, schedule,
+               args, kwargs, parameters, result, timestamp, created_by,
+               COALESCE(creation_date, timestamp), last_updated_by, last_update_date
+          FROM def_async_task_requests_legacy
+         WHERE COALESCE(creation_date, timestamp) >= month_start
+           AND COALESCE(creation_date, timestamp) <  month_start + interval '1 month';
+        COMMIT;
+        month_start := month_start + interval '1 month';
+    END LOOP;
+
+    -- Rows with neither date go to the current month
+    INSERT INTO def_async_task_requests
+    SELECT request_id, task_id, status, user_task_name, task_name, executor,
+           user_schedule_name, redbeat_schedule_name, schedule_type, schedule,
+           args, kwargs, parameters, result, timestamp, created_by,
+           now() AT TIME ZONE 'utc', last_updated_by, last_update_date
+      FROM def_async_task_requests_legacy
+     WHERE creation_date IS NULL AND timestamp IS NULL;
+    COMMIT;
+END $$;
+
+-- Partitioned parents cannot be indexed CONCURRENTLY; the new table is not
+-- serving traffic yet, so plain CREATE INDEX is fine here.
+CREATE INDEX IF NOT EXISTS def_async_task_requests_creation_keyset_idx
+    ON def_async_task_requests (creation_date DESC, request_id DESC);
+
+CREATE INDEX IF NOT EXISTS def_async_task_requests_task_name_trgm_idx
+    ON def_async_task_requests USING gin (lower(replace(task_name, '_', ' ')) gin_trgm_ops);
+
+ANALYZE def_async_task_requests;
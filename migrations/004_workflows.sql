@@ -0,0 +1,54 @@
+-- Workflow (DAG) definitions and runs (executors/workflow.py), plus the
+-- per-node columns on def_async_task_requests.
+
+CREATE TABLE IF NOT EXISTS def_async_workflows (
+    workflow_id      serial       PRIMARY KEY,
+    workflow_name    varchar(255) NOT NULL UNIQUE,
+    description      varchar(255),
+    max_concurrency  integer      CHECK (max_concurrency IS NULL OR max_concurrency > 0),
+    cancelled_yn     varchar(1)   DEFAULT 'N',
+    created_by       integer,
+    creation_date    timestamp    DEFAULT (now() AT TIME ZONE 'utc'),
+    last_updated_by  integer,
+    last_update_date timestamp    DEFAULT (now() AT TIME ZONE 'utc')
+);
+
+CREATE TABLE IF NOT EXISTS def_async_workflow_nodes (
+    node_id          serial       PRIMARY KEY,
+    workflow_id      integer      NOT NULL REFERENCES def_async_workflows (workflow_id) ON DELETE CASCADE,
+    node_name        varchar(200) NOT NULL,
+    task_name        varchar(255) NOT NULL,
+    parameters       jsonb,
+    param_mappings   jsonb,
+    depends_on       jsonb,
+    created_by       integer,
+    creation_date    timestamp    DEFAULT (now() AT TIME ZONE 'utc'),
+    last_updated_by  integer,
+    last_update_date timestamp    DEFAULT (now() AT TIME ZONE 'utc'),
+    UNIQUE (workflow_id, node_name)
+);
+
+CREATE TABLE IF NOT EXISTS def_async_workflow_runs (
+    run_id           serial       PRIMARY KEY,
+    workflow_id      integer      NOT NULL REFERENCES def_async_workflows (workflow_id),
+    status           varchar(50),
+    celery_task_id   varchar(200),
+    node_task_ids    jsonb,
+    parameters       jsonb,
+    started_at       timestamp,
+    finished_at      timestamp,
+    created_by       integer,
+    creation_date    timestamp    DEFAULT (now() AT TIME ZONE 'utc'),
+    last_updated_by  integer,
+    last_update_date timestamp    DEFAULT (now() AT TIME ZONE 'utc')
+);
+
+CREATE INDEX IF NOT EXISTS def_async_workflow_runs_workflow_idx
+    ON def_async_workflow_runs (workflow_id, run_id DESC);
+
+ALTER TABLE def_async_task_requests ADD COLUMN IF NOT EXISTS workflow_run_id integer;
+ALTER TABLE def_async_task_requests ADD COLUMN IF NOT EXISTS workflow_node   varchar(200);
+
+CREATE INDEX IF NOT EXISTS def_async_task_requests_workflow_run_idx
+    ON def_async_task_requests (workflow_run_id)
+    WHERE workflow_run_id IS NOT NULL;
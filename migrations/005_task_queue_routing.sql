@@ -0,0 +1,21 @@
+-- Queue routing and priority lanes (executors/routing.py).
+--
+-- def_async_execution_methods.queue/priority route every task of that method;
+-- def_async_tasks.queue/priority override them per task. NULL = default queue
+-- and default priority. Priorities are 0 (highest) to 9.
+--
+-- Only route to a queue once a worker consumes it (celery worker -Q <queue>),
+-- otherwise its tasks wait in the broker. Example lanes:
+--
+--   UPDATE def_async_execution_methods SET queue = 'http', priority = 0
+--    WHERE executor LIKE 'executors.http.%';
+--   UPDATE def_async_execution_methods SET queue = 'db', priority = 5
+--    WHERE executor LIKE 'executors.stored_%';
+
+ALTER TABLE def_async_execution_methods ADD COLUMN IF NOT EXISTS queue    varchar(100);
+ALTER TABLE def_async_execution_methods ADD COLUMN IF NOT EXISTS priority integer
+    CHECK (priority BETWEEN 0 AND 9);
+
+ALTER TABLE def_async_tasks ADD COLUMN IF NOT EXISTS queue    varchar(100);
+ALTER TABLE def_async_tasks ADD COLUMN IF NOT EXISTS priority integer
+    CHECK (priority BETWEEN 0 AND 9);
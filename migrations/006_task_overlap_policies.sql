@@ -0,0 +1,9 @@
+-- Non-overlap policies per task (executors/overlap.py).
+--
+-- overlap_policy: allow (default when NULL), skip, queue_one, allow_n
+-- max_concurrency: runs allowed at once for allow_n
+
+ALTER TABLE def_async_tasks ADD COLUMN IF NOT EXISTS overlap_policy varchar(20)
+    CHECK (overlap_policy IN ('allow', 'skip', 'queue_one', 'allow_n'));
+ALTER TABLE def_async_tasks ADD COLUMN IF NOT EXISTS max_concurrency integer
+    CHECK (max_concurrency IS NULL OR max_concurrency > 0);
@@ -0,0 +1,178 @@
+"""
+RedBeat maintenance without KEYS.
+
+An entry is the hash <key_prefix><name> plus a member of the schedule
+sorted set (<key_prefix>:schedule). delete_entries removes both by exact
+key in one pipeline. sweep_orphans is a periodic, incremental cleanup:
+
+- entry hashes with no active def_async_task_schedules row (and not a
+  static beat_schedule entry) are removed once they have stayed orphaned
+  for REDBEAT_SWEEP_GRACE seconds (a schedule is written to Redis just
+  before its row is committed);
+- schedule-set members whose hash no longer exists are dropped.
+
+Each run walks at most REDBEAT_SWEEP_BATCH keys with SCAN / ZSCAN and
+stores the cursors in Redis, so the next run picks up where it stopped.
+"""
+import os
+import time
+import logging
+
+from celery import shared_task, current_app
+from redbeat.schedulers import get_redis, ensure_conf
+
+logging.basicConfig(level=logging.INFO)
+
+# Keys examined per sweep run, and the COUNT hint per SCAN call
+REDBEAT_SWEEP_BATCH = int(os.getenv("REDBEAT_SWEEP_BATCH", 1000))
+REDBEAT_SWEEP_SCAN_COUNT = int(os.getenv("REDBEAT_SWEEP_SCAN_COUNT", 200))
+# Seconds an entry must stay orphaned before it is deleted
+REDBEAT_SWEEP_GRACE = int(os.getenv("REDBEAT_SWEEP_GRACE", 300))
+
+STATE_PREFIX = "redbeat_maintenance"
+KEYS_CURSOR = f"{STATE_PREFIX}:scan_cursor"
+ZSET_CURSOR = f"{STATE_PREFIX}:zscan_cursor"
+SUSPECTS_KEY = f"{STATE_PREFIX}:suspects"
+
+
+def entry_key(name, celery_app=None):
+    return ensure_conf(celery_app or current_app).key_prefix + name
+
+
+def delete_entries(schedule_names, celery_app=None):
+    """Delete RedBeat entries by exact key and schedule-set member. Returns hashes deleted."""
+    app = celery_app or current_app
+    conf = ensure_conf(app)
+    keys = [conf.key_prefix + name for name in schedule_names]
+    if not keys:
+        return 0
+
+    with get_redis(app).pipeline(transaction=True) as pipe:
+        pipe.zrem(conf.schedule_key, *keys)
+        pipe.delete(*keys)
+        _, deleted = pipe.execute()
+    return deleted
+
+
+def _internal_key(conf, key):
+    # <prefix>:schedule, <prefix>:statics, <prefix>:lock
+    return key.startswith(conf.key_prefix + ":")
+
+
+def scan_batch(client, cursor, match, limit, zset=None):
+    """Up to ~limit keys (or zset members) from cursor; returns (next_cursor, items)."""
+    items = []
+    while True:
+        if zset:
+            cursor, page = client.zscan(zset, cursor=cursor, count=REDBEAT_SWEEP_SCAN_COUNT)
+            page = [member for member, _ in page]
+        else:
+            cursor, page = client.scan(cursor=cursor, match=match, count=REDBEAT_SWEEP_SCAN_COUNT)
+        items.extend(page)
+        if cursor == 0 or len(items) >= limit:
+            return cursor, items
+
+
+def _active_schedule_names(names):
+    from executors.db_pool import pooled_connection
+
+    if not names:
+        return set()
+    with pooled_connection() as (conn, _):
+        with conn.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT redbeat_schedule_name
+                  FROM def_async_task_schedules
+                 WHERE redbeat_schedule_name = ANY(%s)
+                   AND COALESCE(cancelled_yn, 'N') <> 'Y';
+                """,
+                (list(names),)
+            )
+            rows = cursor.fetchall()
+        conn.rollback()
+    return {name for (name,) in rows}
+
+
+def _decode(value):
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def entry_names(client, conf, keys):
+    """Schedule names of a SCAN page, without RedBeat's own keys."""
+    return {key[len(conf.key_prefix):] for key in map(_decode, keys) if not _internal_key(conf, key)}
+
+
+def expire_orphans(client, conf, names, app=None, repair=True):
+    """
+    Of these entry names, delete the ones with no active schedule row that
+    have been orphaned for REDBEAT_SWEEP_GRACE seconds; start the clock for
+    new ones. Returns (orphaned names, deleted names). repair=False only
+    reports.
+    """
+    now = time.time()
+    statics = {_decode(name) for name in client.smembers(conf.statics_key)}
+    candidates = names - statics - _active_schedule_names(names - statics)
+    if not repair:
+        return candidates, []
+
+    deleted = []
+    if candidates:
+        candidates = sorted(candidates)
+        with client.pipeline(transaction=False) as pipe:
+            for name in candidates:
+                pipe.zscore(SUSPECTS_KEY, name)
+            first_seen = pipe.execute()
+        expired = [name for name, seen in zip(candidates, first_seen)
+                   if seen is not None and now - seen >= REDBEAT_SWEEP_GRACE]
+        new = {name: now for name, seen in zip(candidates, first_seen) if seen is None}
+        if new:
+            client.zadd(SUSPECTS_KEY, new)
+        if expired:
+            delete_entries(expired, celery_app=app or current_app)
+            deleted = expired
+    # Suspects that got a row (or were deleted) are no longer suspects
+    cleared = sorted((names - set(candidates)) | set(deleted))
+    if cleared:
+        client.zrem(SUSPECTS_KEY, *cleared)
+    # Suspects removed by other means are never seen again; let them age out
+    client.zremrangebyscore(SUSPECTS_KEY, "-inf", now - REDBEAT_SWEEP_GRACE - 86400)
+    return set(candidates), deleted
+
+
+@shared_task(bind=True)
+def sweep_orphans(self):
+    app = self.app
+    conf = ensure_conf(app)
+    client = get_redis(app)
+
+    # Orphaned entry hashes
+    cursor = int(client.get(KEYS_CURSOR) or 0)
+    cursor, keys = scan_batch(client, cursor, f"{conf.key_prefix}*", REDBEAT_SWEEP_BATCH)
+    names = entry_names(client, conf, keys)
+    _, deleted = expire_orphans(client, conf, names, app=app)
+    client.set(KEYS_CURSOR, cursor)
+
+    # Schedule-set members whose hash is gone
+    zcursor = int(client.get(ZSET_CURSOR) or 0)
+    zcursor, members = scan_batch(client, zcursor, None, REDBEAT_SWEEP_BATCH, zset=conf.schedule_key)
+    dangling = []
+    if members:
+        with client.pipeline(transaction=False) as pipe:
+            for member in members:
+                pipe.exists(member)
+            dangling = [member for member, exists in zip(members, pipe.execute()) if not exists]
+        if dangling:
+            client.zrem(conf.schedule_key, *dangling)
+    client.set(ZSET_CURSOR, zcursor)
+
+    if deleted or dangling:
+        logging.info(f"RedBeat sweep deleted {len(deleted)} orphaned entries, {len(dangling)} dangling members.")
+    return {
+        "scanned": len(names),
+        "deleted": deleted,
+        "dangling_removed": len(dangling),
+        "suspects": client.zcard(SUSPECTS_KEY),
+        "cycle_complete": cursor == 0,
+        "message": "RedBeat sweep completed successfully."
+    }
@@ -0,0 +1,215 @@
+"""
+Reconciliation between def_async_task_schedules and RedBeat.
+
+Update_TaskSchedule, Cancel_TaskSchedule and Reschedule_Task write the DB
+and Redis separately, so a failure halfway leaves them out of step. This
+job walks both sides in batches and repairs the difference:
+
+    missing      active row, no RedBeat entry          -> entry recreated
+    mismatched   entry task/args/kwargs/schedule differ -> entry rewritten
+    unscheduled  entry not in the schedule sorted set   -> re-added
+    ghost        cancelled row, entry still in Redis    -> entry deleted
+    orphaned     entry with no active row at all        -> deleted after
+                                                          REDBEAT_SWEEP_GRACE
+    invalid      active row whose task/schedule can't be built (reported only)
+
+The DB side is read through a server-side cursor and the Redis side with
+SCAN, SCHEDULE_RECONCILE_BATCH at a time. The last report is kept in Redis
+for GET /async_task/schedules/drift_report.
+"""
+import os
+import json
+import logging
+from datetime import datetime
+
+from celery import shared_task
+from redbeat import RedBeatSchedulerEntry
+from redbeat.schedulers import get_redis, ensure_conf
+from redbeat.decoder import RedBeatJSONEncoder, RedBeatJSONDecoder
+
+from redbeat_s.red_functions import entry_definition, queue_definition
+from redbeat_s.schedule_spec import ScheduleSpec
+from redbeat_s.maintenance import delete_entries, entry_names, expire_orphans, scan_batch
+
+logging.basicConfig(level=logging.INFO)
+
+SCHEDULE_RECONCILE_BATCH = int(os.getenv("SCHEDULE_RECONCILE_BATCH", 500))
+# "false" only reports the drift
+SCHEDULE_RECONCILE_REPAIR = os.getenv("SCHEDULE_RECONCILE_REPAIR", "true").lower() == "true"
+# Names kept per category in the report
+SCHEDULE_RECONCILE_SAMPLE = int(os.getenv("SCHEDULE_RECONCILE_SAMPLE", 50))
+
+REPORT_KEY = "schedule_reconcile:report"
+CATEGORIES = ("missing", "mismatched", "unscheduled", "ghost", "orphaned", "invalid")
+COMPARED_FIELDS = ("task", "args", "kwargs", "schedule")
+
+
+def get_report(client):
+    report = client.get(REPORT_KEY)
+    return json.loads(report) if report else None
+
+
+def _comparable(definition):
+    # Round-trip through RedBeat's encoder so crontab/interval compare as stored
+    encoded = json.loads(json.dumps(definition, cls=RedBeatJSONEncoder))
+    return {field: encoded.get(field) for field in COMPARED_FIELDS}
+
+
+def _db_batches(batch_size):
+    from executors.db_pool import pooled_connection
+
+    with pooled_connection() as (conn, _):
+        # Named cursor = server-side; rows arrive batch_size at a time
+        with conn.cursor(name="schedule_reconcile") as cursor:
+            cursor.itersize = batch_size
+            cursor.execute(
+                """
+                SELECT s.redbeat_schedule_name, s.task_name, s.args, s.kwargs,
+                       s.schedule_type, s.schedule, COALESCE(s.cancelled_yn, 'N'), t.executor,
+                       s.creation_date
+                  FROM def_async_task_schedules s
+                  LEFT JOIN def_async_tasks t ON t.task_name = s.task_name
+                 WHERE s.redbeat_schedule_name IS NOT NULL
+                   AND COALESCE(s.schedule_type, '') <> 'IMMEDIATE'
+                 ORDER BY s.redbeat_schedule_name;
+                """
+            )
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
+        conn.rollback()
+
+
+class _Report:
+    def __init__(self, repair):
+        self.repair = repair
+        self.counts = {category: 0 for category in CATEGORIES}
+        self.samples = {category: [] for category in CATEGORIES}
+        self.repaired = 0
+        self.ghosts = set()
+        self.errors = []
+
+    def add(self, category, name, detail=None):
+        self.counts[category] += 1
+        if len(self.samples[category]) < SCHEDULE_RECONCILE_SAMPLE:
+            self.samples[category].append({"name": name, "detail": detail} if detail else {"name": name})
+
+    def json(self, started_at):
+        return {
+            "started_at": started_at.isoformat(),
+            "finished_at": datetime.utcnow().isoformat(),
+            "repair": self.repair,
+            "drift": sum(self.counts.values()),
+            "counts": self.counts,
+            "repaired": self.repaired,
+            "samples": self.samples,
+            "errors": self.errors[:SCHEDULE_RECONCILE_SAMPLE],
+        }
+
+
+def _reconcile_rows(app, client, conf, rows, report):
+    keys = [conf.key_prefix + row[0] for row in rows]
+    with client.pipeline(transaction=False) as pipe:
+        for key in keys:
+            pipe.hget(key, 'definition')
+            pipe.hget(key, 'meta')
+            pipe.zscore(conf.schedule_key, key)
+        replies = pipe.execute()
+
+    to_write, to_schedule, to_delete = [], {}, []
+    for index, (name, task_name, args, kwargs, schedule_type, schedule, cancelled_yn, executor,
+                creation_date) in enumerate(rows):
+        definition, meta, score = replies[index * 3:index * 3 + 3]
+
+        if cancelled_yn == 'Y':
+            if definition:
+                report.add("ghost", name)
+                report.ghosts.add(name)
+                to_delete.append(name)
+            continue
+
+        try:
+            if not executor:
+                raise ValueError(f"No executor for task_name: {task_name}")
+            compiled = ScheduleSpec(schedule_type, schedule).compile(anchor=creation_date)
+        except (ValueError, TypeError, AttributeError) as e:
+            report.add("invalid", name, str(e))
+            continue
+
+        last_run_at = None
+        if meta:
+            last_run_at = json.loads(meta, cls=RedBeatJSONDecoder).get('last_run_at')
+        entry = RedBeatSchedulerEntry(
+            name=name,
+            task=executor,
+            schedule=compiled,
+            args=args or [],
+            kwargs=kwargs or {},
+            last_run_at=last_run_at,
+            app=app
+        )
+
+        if not definition:
+            report.add("missing", name)
+            to_write.append(entry)
+        elif _comparable(json.loads(definition)) != _comparable(entry_definition(entry)):
+            report.add("mismatched", name)
+            to_write.append(entry)
+        elif score is None:
+            report.add("unscheduled", name)
+            to_schedule[entry.key] = entry.score
+
+    if not report.repair:
+        return
+
+    try:
+        if to_write or to_schedule:
+            with client.pipeline(transaction=True) as pipe:
+                for entry in to_write:
+                    queue_definition(pipe, entry)
+                    to_schedule[entry.key] = entry.score
+                pipe.zadd(conf.schedule_key, to_schedule)
+                pipe.execute()
+        if to_delete:
+            delete_entries(to_delete, celery_app=app)
+        report.repaired += len(to_schedule) + len(to_delete)
+    except Exception as e:
+        report.errors.append(str(e))
+        logging.error(f"Schedule reconciliation repair failed: {e}")
+
+
+@shared_task(bind=True)
+def reconcile_schedules(self, repair=None):
+    """Diff def_async_task_schedules against RedBeat, repair it (unless repair=False) and store the report."""
+    app = self.app
+    conf = ensure_conf(app)
+    client = get_redis(app)
+    report = _Report(SCHEDULE_RECONCILE_REPAIR if repair is None else bool(repair))
+    started_at = datetime.utcnow()
+
+    try:
+        # DB -> Redis: missing, mismatched, unscheduled, ghost
+        for rows in _db_batches(SCHEDULE_RECONCILE_BATCH):
+            _reconcile_rows(app, client, conf, rows, report)
+
+        # Redis -> DB: entries without an active row
+        cursor = None
+        while cursor != 0:
+            cursor, keys = scan_batch(client, cursor or 0, f"{conf.key_prefix}*", SCHEDULE_RECONCILE_BATCH)
+            orphaned, deleted = expire_orphans(client, conf, entry_names(client, conf, keys),
+                                               app=app, repair=report.repair)
+            for name in sorted(orphaned - report.ghosts):
+                report.add("orphaned", name, "deleted" if name in deleted else None)
+            report.repaired += len(deleted)
+
+    except Exception as e:
+        report.errors.append(str(e))
+        logging.error(f"Schedule reconciliation failed: {e}")
+
+    result = report.json(started_at)
+    client.set(REPORT_KEY, json.dumps(result))
+    if result["drift"]:
+        logging.info(f"Schedule drift: {result['counts']} (repaired {result['repaired']}).")
+    return result
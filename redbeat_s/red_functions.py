@@ -1,5 +1,10 @@
 # red_functions.py
+import json
+
 from redbeat import RedBeatSchedulerEntry 
+from redbeat.schedulers import get_redis, ensure_conf
+from redbeat.decoder import RedBeatJSONEncoder
+from redbeat_s.maintenance import delete_entries
 from celery import current_app as celery  
 from datetime import timedelta 
 from celery.schedules import schedule as celery_schedule
@@ -41,17 +46,10 @@ def create_redbeat_schedule_old(schedule_name, executor, schedule_minutes=1, arg
     return {"message": "Task scheduled successfully!", "entry_name": entry.name}
 
 
-def create_redbeat_schedule(schedule_name, executor, schedule_minutes=None, cron_schedule=None, args=None, kwargs=None, celery_app=None):
-    # Decide whether to use crontab (cron_schedule) or timedelta (schedule_minutes)
-    if cron_schedule:
-        schedule = cron_schedule  # Cron-based schedule
+def create_redbeat_schedule(schedule_name, executor, schedule_minutes=None, cron_schedule=None, args=None, kwargs=None, celery_app=None, schedule=None):
+    # A compiled ScheduleSpec (schedule) wins; otherwise crontab (cron_schedule) or timedelta (schedule_minutes)
+    schedule = _schedule_for(schedule_minutes, cron_schedule, schedule)
 
-    elif schedule_minutes:
-        schedule = timedelta(minutes=schedule_minutes)  # Time-based schedule
-        
-    else:
-        raise ValueError("Neither cron_schedule nor schedule_minutes provided")
-    
     args = args or []
     kwargs = kwargs or {}
 
@@ -75,6 +73,7 @@ def create_redbeat_schedule(schedule_name, executor, schedule_minutes=None, cron
 
     return {"message": "Task scheduled successfully!", "entry_name": entry.name}
 
+
     args = args or []
     kwargs = kwargs or {}
 
@@ -102,7 +101,7 @@ def create_redbeat_schedule(schedule_name, executor, schedule_minutes=None, cron
         raise
 
 
-def update_redbeat_schedule(schedule_name, task, schedule_minutes=None, cron_schedule=None, args=None, kwargs=None, celery_app=None):
+def update_redbeat_schedule(schedule_name, task, schedule_minutes=None, cron_schedule=None, args=None, kwargs=None, celery_app=None, schedule=None):
    
     # Default values for args and kwargs
     args = args or []
@@ -117,7 +116,9 @@ def update_redbeat_schedule(schedule_name, task, schedule_minutes=None, cron_sch
             raise ValueError(f"Task name mismatch: Expected '{task}', found '{entry.task}'")
 
         # Determine the correct schedule type
-        if cron_schedule:
+        if schedule is not None:
+            entry.schedule = schedule  # Compiled ScheduleSpec
+        elif cron_schedule:
             entry.schedule = cron_schedule  # Use crontab scheduling
         elif schedule_minutes is not None:
             entry.schedule = celery_schedule(schedule_minutes * 60)  # Use interval scheduling
@@ -138,27 +139,82 @@ def update_redbeat_schedule(schedule_name, task, schedule_minutes=None, cron_sch
 
 
 
-def delete_schedule_from_redis(schedule_name):
-    try:
-        # Get Redis client from Celery's broker connection
-        redis_client = celery.broker_connection().default_channel.client
+def _schedule_for(schedule_minutes=None, cron_schedule=None, schedule=None):
+    if schedule is not None:
+        return schedule
+    if cron_schedule:
+        return cron_schedule
+    if schedule_minutes:
+        return timedelta(minutes=schedule_minutes)
+    raise ValueError("Neither cron_schedule nor schedule_minutes provided")
+
+
+def entry_definition(entry):
+    """The 'definition' hash field RedBeatSchedulerEntry.save() writes."""
+    return {
+        'name': entry.name,
+        'task': entry.task,
+        'args': entry.args,
+        'kwargs': entry.kwargs,
+        'options': entry.options,
+        'schedule': entry.schedule,
+        'enabled': entry.enabled,
+    }
+
+
+def queue_definition(pipe, entry):
+    """Queue entry.save()'s hash writes on a pipeline (ZADD is left to the caller)."""
+    meta = {'last_run_at': entry.last_run_at}
+    pipe.hset(entry.key, 'definition', json.dumps(entry_definition(entry), cls=RedBeatJSONEncoder))
+    pipe.hsetnx(entry.key, 'meta', json.dumps(meta, cls=RedBeatJSONEncoder))
+
+
+def create_redbeat_schedules_bulk(entries, celery_app=None):
+    """
+    Save many RedBeat entries in one MULTI/EXEC pipeline, so either all of
+    them land in Redis or none do. Each entry is a dict with the arguments of
+    create_redbeat_schedule (schedule_name, executor, schedule - or
+    schedule_minutes / cron_schedule - args, kwargs). Writes the same keys
+    as entry.save().
+    """
+    conf = ensure_conf(celery_app)
+    built = [
+        RedBeatSchedulerEntry(
+            name=entry["schedule_name"],
+            task=entry["executor"],
+            schedule=_schedule_for(entry.get("schedule_minutes"), entry.get("cron_schedule"), entry.get("schedule")),
+            args=entry.get("args") or [],
+            kwargs=entry.get("kwargs") or {},
+            app=celery_app
+        )
+        for entry in entries
+    ]
 
-        # Define the pattern for the RedBeat keys associated with the schedule name
-        key_pattern = f"redbeat:{schedule_name}"
+    with get_redis(celery_app).pipeline(transaction=True) as pipe:
+        for entry in built:
+            queue_definition(pipe, entry)
+        # One ZADD for the whole batch
+        pipe.zadd(conf.schedule_key, {entry.key: entry.score for entry in built})
+        pipe.execute()
 
-        # Retrieve all keys matching the pattern
-        keys = redis_client.keys(pattern=key_pattern)
+    logger.info(f"RedBeat entries created: {len(built)}")
+    return [entry.name for entry in built]
 
-        if not keys:
-            return {"message": f"Task '{schedule_name}' not found in Redis."}, 404
 
-        # Attempt to delete each key
-        for key in keys:
-            redis_client.delete(key)
+def delete_redbeat_schedules_bulk(schedule_names, celery_app=None):
+    """Remove many RedBeat entries (keys and schedule-set members) in one pipeline."""
+    deleted = delete_entries(schedule_names, celery_app=celery_app)
+    logger.info(f"RedBeat entries deleted: {deleted} of {len(schedule_names)}")
+    return deleted
+
+
+def delete_schedule_from_redis(schedule_name):
+    try:
+        # Exact key + schedule-set member; KEYS would block Redis on a large keyspace
+        if not delete_entries([schedule_name], celery_app=celery):
+            return {"message": f"Task '{schedule_name}' not found in Redis."}, 404
 
         return {"message": f"Task '{schedule_name}' deleted from Redis."}, 200
 
     except Exception as e:
         return {"error": f"Failed to delete schedule from Redis: {str(e)}"}, 500
-
-
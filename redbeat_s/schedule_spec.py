@@ -0,0 +1,181 @@
+"""
+One compiler for schedule_type + schedule JSON.
+
+    WEEKLY_SPECIFIC_DAYS    {"VALUES": ["MON", "WED"], "TIME": "09:30"}
+    MONTHLY_SPECIFIC_DATES  {"VALUES": ["5", "15"], "TIME": "00:00"}
+    MONTHLY_LAST_DAY        {"TIME": "18:00"}
+    BUSINESS_DAYS           {"TIME": "07:00"}                 Monday to Friday
+    MONTHLY_BUSINESS_DAYS   {"VALUES": [1, -1], "TIME": ...}  nth business day (-1 = last)
+    ONCE                    {"VALUES": "2025-03-01 14:30"}
+    PERIODIC                {"FREQUENCY_TYPE": "HOURS", "FREQUENCY": 2}
+
+TIME is optional (default midnight, UTC). compile() returns one Celery
+schedule that RedBeat can store: interval for PERIODIC minutes to weeks,
+crontab where cron can express the rule, and redbeat's rrule for calendar
+months, last day / business-day rules and one-off runs. rrules start at
+the schedule row's creation_date (ONCE at its own date), so compiling the
+same row twice gives the same entry.
+"""
+from datetime import datetime, timedelta
+
+from celery.schedules import crontab, schedule as interval_schedule
+from dateutil import rrule as rr
+from redbeat.schedules import rrule as redbeat_rrule
+
+
+class ScheduleSpecError(ValueError):
+    pass
+
+
+CRON_DAYS = {"SUN": 0, "MON": 1, "TUE": 2, "WED": 3, "THU": 4, "FRI": 5, "SAT": 6}
+RRULE_DAYS = {"SUN": rr.SU, "MON": rr.MO, "TUE": rr.TU, "WED": rr.WE, "THU": rr.TH, "FRI": rr.FR, "SAT": rr.SA}
+BUSINESS_DAYS = (rr.MO, rr.TU, rr.WE, rr.TH, rr.FR)
+INTERVALS = {"MINUTE": timedelta(minutes=1), "HOUR": timedelta(hours=1),
+             "DAY": timedelta(days=1), "WEEK": timedelta(weeks=1)}
+
+SCHEDULE_TYPES = ("WEEKLY_SPECIFIC_DAYS", "MONTHLY_SPECIFIC_DATES", "MONTHLY_LAST_DAY",
+                  "BUSINESS_DAYS", "MONTHLY_BUSINESS_DAYS", "ONCE", "PERIODIC")
+
+
+def _time_of_day(value):
+    try:
+        hour, minute = (int(part) for part in str(value or "00:00").split(":"))
+    except ValueError:
+        raise ScheduleSpecError(f"TIME must be HH:MM, got '{value}'")
+    if not (0 <= hour < 24 and 0 <= minute < 60):
+        raise ScheduleSpecError(f"TIME out of range: '{value}'")
+    return hour, minute
+
+
+def _as_list(values):
+    if values is None:
+        return []
+    return values if isinstance(values, list) else [values]
+
+
+class ScheduleSpec:
+    def __init__(self, schedule_type, schedule=None):
+        self.schedule_type = (schedule_type or "").upper()
+        self.data = schedule or {}
+        if self.schedule_type not in SCHEDULE_TYPES:
+            raise ScheduleSpecError(f"Invalid schedule type: {schedule_type}")
+
+        self.hour, self.minute = _time_of_day(self.data.get('TIME'))
+        self.days, self.dates, self.positions = [], [], []
+        self.every, self.months, self.at = None, None, None
+        values = self.data.get('VALUES')
+
+        if self.schedule_type == "WEEKLY_SPECIFIC_DAYS":
+            # "MON" and "Monday" both work
+            self.days = sorted({str(day).upper()[:3] for day in _as_list(values)} & set(CRON_DAYS),
+                               key=CRON_DAYS.get)
+            if not self.days:
+                raise ScheduleSpecError("At least one valid day is required for WEEKLY_SPECIFIC_DAYS")
+
+        elif self.schedule_type == "MONTHLY_SPECIFIC_DATES":
+            try:
+                self.dates = sorted({int(value) for value in _as_list(values)})
+            except (TypeError, ValueError):
+                raise ScheduleSpecError("MONTHLY_SPECIFIC_DATES values must be day numbers")
+            if not self.dates or not all(1 <= date <= 31 for date in self.dates):
+                raise ScheduleSpecError("MONTHLY_SPECIFIC_DATES needs day numbers between 1 and 31")
+
+        elif self.schedule_type == "MONTHLY_BUSINESS_DAYS":
+            try:
+                self.positions = sorted({int(value) for value in _as_list(values)})
+            except (TypeError, ValueError):
+                raise ScheduleSpecError("MONTHLY_BUSINESS_DAYS values must be positions like 1 or -1")
+            if not self.positions or not all(1 <= abs(pos) <= 23 for pos in self.positions):
+                raise ScheduleSpecError("MONTHLY_BUSINESS_DAYS needs positions between 1 and 23 (or -1 to -23)")
+
+        elif self.schedule_type == "ONCE":
+            if not values:
+                raise ScheduleSpecError("Date is required for one-time execution")
+            try:
+                self.at = datetime.strptime(values, "%Y-%m-%d %H:%M")
+            except (TypeError, ValueError):
+                raise ScheduleSpecError(f"ONCE date must be 'YYYY-MM-DD HH:MM', got '{values}'")
+
+        elif self.schedule_type == "PERIODIC":
+            frequency_type = str(self.data.get('FREQUENCY_TYPE', 'MINUTES')).upper().strip()
+            frequency_type = frequency_type.replace('(', '').replace(')', '').rstrip('S')
+            try:
+                frequency = int(self.data.get('FREQUENCY', 1))
+            except (TypeError, ValueError):
+                raise ScheduleSpecError("FREQUENCY must be a whole number")
+            if frequency < 1:
+                raise ScheduleSpecError("FREQUENCY must be at least 1")
+            if frequency_type == "MONTH":
+                self.months = frequency
+            elif frequency_type in INTERVALS:
+                self.every = INTERVALS[frequency_type] * frequency
+            else:
+                raise ScheduleSpecError(f"Invalid frequency type: {frequency_type}")
+
+    def _rule_args(self, anchor):
+        """(freq, options) of the calendar rule, or None for plain intervals."""
+        at_time = {"byhour": self.hour, "byminute": self.minute, "bysecond": 0}
+        if self.schedule_type == "WEEKLY_SPECIFIC_DAYS":
+            return rr.WEEKLY, dict(byweekday=[RRULE_DAYS[day] for day in self.days], **at_time)
+        if self.schedule_type == "MONTHLY_SPECIFIC_DATES":
+            return rr.MONTHLY, dict(bymonthday=self.dates, **at_time)
+        if self.schedule_type == "MONTHLY_LAST_DAY":
+            return rr.MONTHLY, dict(bymonthday=-1, **at_time)
+        if self.schedule_type == "BUSINESS_DAYS":
+            return rr.DAILY, dict(byweekday=BUSINESS_DAYS, **at_time)
+        if self.schedule_type == "MONTHLY_BUSINESS_DAYS":
+            return rr.MONTHLY, dict(byweekday=BUSINESS_DAYS, bysetpos=self.positions, **at_time)
+        if self.schedule_type == "ONCE":
+            return rr.YEARLY, dict(dtstart=self.at, count=1)
+        if self.months:
+            if anchor.day > 28:
+                # Started on the 29th-31st: clamp to the month's last day instead of skipping short months
+                return rr.MONTHLY, dict(interval=self.months, dtstart=anchor, bymonthday=[anchor.day, -1], bysetpos=1)
+            return rr.MONTHLY, dict(interval=self.months, dtstart=anchor)
+        return None
+
+    def compile(self, anchor=None):
+        """
+        The Celery schedule for a RedBeat entry. anchor is the schedule's
+        creation_date (defaults to now); it only matters for PERIODIC months.
+        """
+        anchor = (anchor or datetime.utcnow()).replace(microsecond=0)
+        if self.every:
+            return interval_schedule(run_every=self.every)
+        if self.schedule_type == "WEEKLY_SPECIFIC_DAYS":
+            return crontab(minute=self.minute, hour=self.hour,
+                           day_of_week=",".join(str(CRON_DAYS[day]) for day in self.days))
+        if self.schedule_type == "MONTHLY_SPECIFIC_DATES":
+            return crontab(minute=self.minute, hour=self.hour,
+                           day_of_month=",".join(str(date) for date in self.dates))
+
+        freq, options = self._rule_args(anchor)
+        options.setdefault("dtstart", anchor)
+        return redbeat_rrule(freq, **options)
+
+    def next_runs(self, n=10, after=None, anchor=None, last_run_at=None):
+        """
+        The next n fire times (naive UTC) after `after` (default now).
+        Intervals count from last_run_at when known; a never-run interval
+        entry fires right away, like RedBeat does.
+        """
+        after = after or datetime.utcnow()
+        anchor = (anchor or after).replace(microsecond=0)
+
+        if self.every:
+            first = last_run_at + self.every if last_run_at else after
+            first = max(first, after)
+            return [first + self.every * i for i in range(n)]
+
+        freq, options = self._rule_args(anchor)
+        # Calendar rules: dtstart only bounds the search, so start just before `after`
+        options.setdefault("dtstart", after.replace(second=0, microsecond=0) - timedelta(minutes=1))
+
+        rule = rr.rrule(freq, **options)
+        runs, current = [], after
+        while len(runs) < n:
+            current = rule.after(current)
+            if current is None:
+                break
+            runs.append(current)
+        return runs
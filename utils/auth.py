@@ -14,82 +14,34 @@ def role_required():
         @wraps(fn)
         def wrapper(*args, **kwargs):
             try:
-                from executors.models import (
-                    DefUserGrantedRole,
-                    DefApiEndpointRole,
-                    DefApiEndpoint,
-                    DefUserGrantedPrivilege
-
-                )
-                
+                from utils.rbac_cache import get_snapshot, parse_rule
+
                 current_user_id = get_jwt_identity()
                 if not current_user_id:
                     return jsonify({"message": "Authentication required"}), 401
 
-
-                #  Extract route pattern
-                rule = request.url_rule.rule        #  "/def_users/<int:user_id>/<status>"
+                #  Extract route pattern (parsed once per rule, then cached)
+                api_endpoint, parameter1, parameter2 = parse_rule(request.url_rule.rule)
                 method = request.method             #  "GET"
 
-                parts = rule.strip("/").split("/")
-
-                api_endpoint = "/" + parts[0]       # "/def_users"
-
-                parameter1 = None
-                parameter2 = None
-
-                if len(parts) > 1:
-                    p1 = parts[1]
-                    if p1.startswith("<") and p1.endswith(">"):
-                        parameter1 = p1[1:-1].split(":")[-1]   # remove int: or string: type
-
-
-                if len(parts) > 2:
-                    p2 = parts[2]
-                    if p2.startswith("<") and p2.endswith(">"):
-                        parameter2 = p2[1:-1].split(":")[-1]
-
+                #  Cached permission snapshot for this user
+                snapshot = get_snapshot(current_user_id)
 
-
-                #  Fetch allowed roles for this user
-                user_roles = DefUserGrantedRole.query.filter_by(user_id=current_user_id).all()
-                role_ids = [ur.role_id for ur in user_roles]
-
-                if not role_ids:
+                if not snapshot["has_roles"]:
                     return jsonify({"message": "No roles assigned"}), 403
 
-                allowed_mappings = DefApiEndpointRole.query.filter(
-                    DefApiEndpointRole.role_id.in_(role_ids)
-                ).all()
-
-                allowed_api_endpoint_ids = [m.api_endpoint_id for m in allowed_mappings]
-
-                if not allowed_api_endpoint_ids:
+                if not snapshot["has_endpoints"]:
                     return jsonify({"message": "User has no API access roles"}), 403
 
-
-                #  Match the stored API endpoint rule in DB
-                endpoint = DefApiEndpoint.query.filter(
-                    DefApiEndpoint.api_endpoint_id.in_(allowed_api_endpoint_ids),
-                    DefApiEndpoint.api_endpoint == api_endpoint,
-                    DefApiEndpoint.method == method,
-                    DefApiEndpoint.parameter1 == parameter1,
-                    DefApiEndpoint.parameter2 == parameter2
-                ).first()
-
-                if not endpoint:
+                #  Match the stored API endpoint rule
+                key = (api_endpoint, method, parameter1, parameter2)
+                if key not in snapshot["endpoints"]:
                     return jsonify({
                         "message": f"Access denied."
                     }), 403
 
                 #  Check privilege
-                user_privileges = DefUserGrantedPrivilege.query.filter_by(
-                    user_id=current_user_id
-                ).all()
-
-                privilege_ids = [up.privilege_id for up in user_privileges]
-
-                if endpoint.privilege_id not in privilege_ids:
+                if snapshot["endpoints"][key] not in snapshot["privileges"]:
                     return jsonify({"message": "Privilege denied"}), 403
 
                 #  Access Granted
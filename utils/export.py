@@ -0,0 +1,55 @@
+import io
+import csv
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _plain(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def _csv_cell(value):
+    # JSON columns go in one cell as JSON text
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    value = _plain(value)
+    return "" if value is None else value
+
+
+def stream_rows(rows, columns, fmt, flush_every=500):
+    """
+    Encode an iterable of row tuples (in `columns` order) as NDJSON or CSV,
+    yielding chunks of about flush_every rows. Nothing is held beyond one
+    chunk, so memory stays flat however many rows the cursor returns.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == "csv" else None
+    if writer:
+        writer.writerow(columns)
+
+    pending = 0
+    for row in rows:
+        if writer:
+            writer.writerow([_csv_cell(value) for value in row])
+        else:
+            buffer.write(json.dumps({name: _plain(value) for name, value in zip(columns, row)}, default=str))
+            buffer.write("\n")
+        pending += 1
+        if pending >= flush_every:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+
+    if buffer.tell():
+        yield buffer.getvalue()
@@ -0,0 +1,80 @@
+"""
+orjson-backed Flask JSON provider.
+
+Produces the same JSON as Flask's DefaultJSONProvider: datetimes and dates
+as HTTP dates, Decimal and UUID as strings, keys sorted, compact outside
+debug. Anything orjson cannot encode (ints over 64 bits, custom dumps
+arguments) falls back to the stdlib encoder.
+"""
+import json
+import uuid
+import decimal
+import dataclasses
+from datetime import date, datetime, timezone
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional; create_app keeps the default provider
+    orjson = None
+
+
+_DAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+
+def http_date(value):
+    """werkzeug.http.http_date for dates/datetimes, without going through email.utils."""
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        hour, minute, second = value.hour, value.minute, value.second
+    else:
+        hour = minute = second = 0
+    return (f"{_DAYS[value.weekday()]}, {value.day:02d} {_MONTHS[value.month - 1]} {value.year:04d} "
+            f"{hour:02d}:{minute:02d}:{second:02d} GMT")
+
+
+def _default(o):
+    if isinstance(o, date):
+        return http_date(o)
+    if isinstance(o, (decimal.Decimal, uuid.UUID)):
+        return str(o)
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    if hasattr(o, "__html__"):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    def _options(self, kwargs):
+        """orjson options for these dumps kwargs, or None if only the stdlib can honour them."""
+        options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        indent = kwargs.pop("indent", None)
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        if kwargs.pop("separators", (",", ":")) != (",", ":") or kwargs:
+            return None
+        return options
+
+    def dumps(self, obj, **kwargs):
+        options = self._options(dict(kwargs))
+        if options is not None:
+            try:
+                return orjson.dumps(obj, default=_default, option=options).decode()
+            except orjson.JSONEncodeError:
+                pass
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        try:
+            return orjson.loads(s)
+        except orjson.JSONDecodeError:
+            # NaN / Infinity and other input only the stdlib accepts
+            return json.loads(s)
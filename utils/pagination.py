@@ -0,0 +1,107 @@
+import json
+import math
+import base64
+from datetime import datetime
+
+from flask import request
+from sqlalchemy import func, select, tuple_
+
+
+class KeysetPage:
+    """Same attributes the views read from a Flask-SQLAlchemy Pagination, plus next_cursor."""
+
+    def __init__(self, items, total, per_page, next_cursor):
+        self.items = items
+        self.total = total
+        self.per_page = per_page
+        self.page = None
+        self.pages = math.ceil(total / per_page) if total is not None and per_page else None
+        self.next_cursor = next_cursor
+
+
+def encode_cursor(sort_value, row_id):
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    raw = json.dumps([sort_value, row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(sort_value), int(row_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def estimate_count(query):
+    """
+    Row estimate from the planner (EXPLAIN) instead of a COUNT(*) scan.
+    Good enough for "about N results" on large, filtered tables.
+    """
+    from executors.extensions import db
+
+    connection = db.session.connection()
+    compiled = query.order_by(None).statement.compile(dialect=connection.dialect)
+    plan = connection.exec_driver_sql(
+        "EXPLAIN (FORMAT JSON) " + str(compiled), compiled.params
+    ).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_rows(query, mode):
+    """mode: 'exact' (COUNT(*)), 'estimate' (planner rows) or 'none'."""
+    if mode == "exact":
+        return query.order_by(None).count()
+    if mode == "estimate":
+        return estimate_count(query)
+    return None
+
+
+def paginate_rows(stmt, page, per_page):
+    """
+    OFFSET page of a Core select, with the attributes of a Flask-SQLAlchemy
+    Pagination; items are Row tuples (see utils.rows.RowSerializer).
+    """
+    from executors.extensions import db
+
+    page = max(page or 1, 1)
+    total = db.session.execute(select(func.count()).select_from(stmt.order_by(None).subquery())).scalar()
+    rows = db.session.execute(stmt.limit(per_page).offset((page - 1) * per_page)).all()
+    result = KeysetPage(rows, total, per_page, None)
+    result.page = page
+    return result
+
+
+def keyset_paginate(query, sort_column, id_column, per_page):
+    """
+    Newest-first keyset pagination on (sort_column, id_column).
+
+    Reads ?cursor= (opaque token from the previous page's next_cursor, empty
+    for the first page) and ?count=none|estimate|exact (default none) from
+    the request. Each page is an index range scan on (sort_column DESC,
+    id_column DESC) instead of OFFSET, so deep pages cost the same as the
+    first. Rows with a NULL sort_column are not reachable this way.
+    """
+    cursor = request.args.get('cursor', '').strip()
+    count_mode = request.args.get('count', 'none').strip().lower()
+
+    total = count_rows(query, count_mode)
+
+    query = query.order_by(sort_column.desc(), id_column.desc())
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor)
+        # Row comparison so Postgres can seek straight into the composite index
+        query = query.filter(tuple_(sort_column, id_column) < tuple_(sort_value, row_id))
+
+    rows = query.limit(per_page + 1).all()
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+
+    return KeysetPage(rows, total, per_page, next_cursor)
@@ -0,0 +1,49 @@
+from flask import request
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only
+from sqlalchemy.orm.attributes import set_committed_value
+
+
+def requested_fields(model, param='fields'):
+    """
+    Column names from ?fields=a,b,c, or None when the parameter is absent
+    (full rows, as before). Unknown names raise ValueError.
+    """
+    raw = request.args.get(param)
+    if raw is None:
+        return None
+    columns = [attr.key for attr in inspect(model).column_attrs]
+    fields = list(dict.fromkeys(name.strip() for name in raw.split(',') if name.strip()))
+    unknown = [name for name in fields if name not in columns]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(columns)}")
+    return fields
+
+
+def project(query, model, fields, always=()):
+    """
+    SELECT only the requested columns, plus the primary key (the ORM needs
+    it for identity) and `always` (columns the view itself reads, e.g. the
+    keyset sort column). The other columns stay unloaded instead of being
+    fetched and decoded for every row.
+    """
+    if fields is None:
+        return query
+    primary_keys = [column.key for column in inspect(model).primary_key]
+    names = list(dict.fromkeys(primary_keys + list(always) + fields))
+    return query.options(load_only(*[getattr(model, name) for name in names]))
+
+
+def projected_json(obj, fields):
+    """
+    obj.json() limited to fields. Columns left out by project() are set to
+    None first (without marking the row dirty), so json() does not go back
+    to the database once per row for each of them.
+    """
+    if fields is None:
+        return obj.json()
+    columns = {attr.key for attr in inspect(type(obj)).column_attrs}
+    for name in inspect(obj).unloaded & columns:
+        set_committed_value(obj, name, None)
+    data = obj.json()
+    return {name: data.get(name) for name in fields}
@@ -0,0 +1,212 @@
+import json
+import time
+import logging
+import threading
+from functools import lru_cache
+
+from config import rbac_cache_ttl, rbac_local_cache_ttl
+
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_KEY_PREFIX = "rbac:snapshot"
+GENERATION_KEY = "rbac:snapshot:generation"
+
+# user_id -> (expires_at, version it was built at, snapshot)
+_local_snapshots = {}
+_local_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1024)
+def parse_rule(rule):
+    """
+    Split a Flask url rule into the (api_endpoint, parameter1, parameter2)
+    triple stored in def_api_endpoints.
+
+    "/def_users/<int:user_id>/<status>" -> ("/def_users", "user_id", "status")
+    """
+    parts = rule.strip("/").split("/")
+
+    api_endpoint = "/" + parts[0]
+
+    parameter1 = None
+    parameter2 = None
+
+    if len(parts) > 1:
+        p1 = parts[1]
+        if p1.startswith("<") and p1.endswith(">"):
+            parameter1 = p1[1:-1].split(":")[-1]   # remove int: or string: type
+
+    if len(parts) > 2:
+        p2 = parts[2]
+        if p2.startswith("<") and p2.endswith(">"):
+            parameter2 = p2[1:-1].split(":")[-1]
+
+    return api_endpoint, parameter1, parameter2
+
+
+def build_snapshot(user_id):
+    """
+    Load everything role_required() needs for one user from the database.
+
+    Returns a dict with:
+        has_roles      - user has at least one granted role
+        has_endpoints  - those roles map to at least one API endpoint
+        endpoints      - {(api_endpoint, method, parameter1, parameter2): privilege_id}
+        privileges     - set of granted privilege ids
+    """
+    from executors.extensions import db
+    from executors.models import (
+        DefUserGrantedRole,
+        DefApiEndpointRole,
+        DefApiEndpoint,
+        DefUserGrantedPrivilege
+    )
+
+    role_ids = [
+        row.role_id for row in
+        db.session.query(DefUserGrantedRole.role_id).filter_by(user_id=user_id).all()
+    ]
+
+    endpoints = {}
+    has_endpoints = False
+    if role_ids:
+        rows = db.session.query(
+            DefApiEndpoint.api_endpoint,
+            DefApiEndpoint.method,
+            DefApiEndpoint.parameter1,
+            DefApiEndpoint.parameter2,
+            DefApiEndpoint.privilege_id
+        ).join(
+            DefApiEndpointRole,
+            DefApiEndpointRole.api_endpoint_id == DefApiEndpoint.api_endpoint_id
+        ).filter(
+            DefApiEndpointRole.role_id.in_(role_ids)
+        ).all()
+
+        has_endpoints = bool(rows)
+
+        for row in rows:
+            key = (row.api_endpoint, row.method, row.parameter1, row.parameter2)
+            endpoints.setdefault(key, row.privilege_id)
+
+    privileges = {
+        row.privilege_id for row in
+        db.session.query(DefUserGrantedPrivilege.privilege_id).filter_by(user_id=user_id).all()
+    }
+
+    return {
+        "has_roles": bool(role_ids),
+        "has_endpoints": has_endpoints,
+        "endpoints": endpoints,
+        "privileges": privileges
+    }
+
+
+def _dump_snapshot(snapshot):
+    return json.dumps({
+        "has_roles": snapshot["has_roles"],
+        "has_endpoints": snapshot["has_endpoints"],
+        "endpoints": [list(key) + [privilege_id] for key, privilege_id in snapshot["endpoints"].items()],
+        "privileges": list(snapshot["privileges"])
+    })
+
+
+def _load_snapshot(raw):
+    data = json.loads(raw)
+    return {
+        "has_roles": data["has_roles"],
+        "has_endpoints": data["has_endpoints"],
+        "endpoints": {tuple(item[:4]): item[4] for item in data["endpoints"]},
+        "privileges": set(data["privileges"])
+    }
+
+
+def _snapshot_key(version, user_id):
+    return f"{SNAPSHOT_KEY_PREFIX}:{version}:{user_id}"
+
+
+def _user_generation_key(user_id):
+    return f"{GENERATION_KEY}:{user_id}"
+
+
+def _redis():
+    from executors.extensions import redis_client
+    return redis_client
+
+
+def _current_version(client, user_id):
+    """"<global generation>.<user generation>": changes on invalidate_all() and invalidate_user(user_id)."""
+    generation, user_generation = client.mget(GENERATION_KEY, _user_generation_key(user_id))
+    return f"{generation or 0}.{user_generation or 0}"
+
+
+def get_snapshot(user_id):
+    """
+    Return the permission snapshot for a user.
+
+    Lookup order: in-process dict -> Redis -> database. Every lookup reads
+    the user's version from Redis (one MGET), so the in-process copy is only
+    served while no invalidation has happened in any process. Redis errors
+    are logged; the in-process copy is then served until it expires, and
+    after that the database is used, so auth never depends on Redis.
+    """
+    user_id = str(user_id)
+    now = time.monotonic()
+
+    cached = _local_snapshots.get(user_id)
+    version = None
+    snapshot = None
+    try:
+        client = _redis()
+        version = _current_version(client, user_id)
+        if cached and cached[0] > now and cached[1] == version:
+            return cached[2]
+        raw = client.get(_snapshot_key(version, user_id))
+        if raw:
+            snapshot = _load_snapshot(raw)
+    except Exception as e:
+        logger.warning(f"RBAC snapshot read from Redis failed: {e}")
+        if cached and cached[0] > now:
+            return cached[2]
+
+    if snapshot is None:
+        snapshot = build_snapshot(user_id)
+        if version is not None:
+            # Keyed by the version read before the build: if an invalidation
+            # landed meanwhile, this copy is never read again
+            try:
+                _redis().set(_snapshot_key(version, user_id), _dump_snapshot(snapshot), ex=rbac_cache_ttl)
+            except Exception as e:
+                logger.warning(f"RBAC snapshot write to Redis failed: {e}")
+
+    with _local_lock:
+        _local_snapshots[user_id] = (now + rbac_local_cache_ttl, version, snapshot)
+
+    return snapshot
+
+
+def invalidate_user(user_id):
+    """Drop one user's snapshot (in every process) after their roles or privileges change."""
+    user_id = str(user_id)
+    with _local_lock:
+        _local_snapshots.pop(user_id, None)
+    try:
+        _redis().incr(_user_generation_key(user_id))
+    except Exception as e:
+        logger.warning(f"RBAC snapshot invalidation failed for user {user_id}: {e}")
+
+
+def invalidate_all():
+    """
+    Drop every snapshot after an endpoint/role mapping, role or privilege changes.
+
+    Bumping the generation orphans all existing Redis snapshots (they expire
+    via their TTL) and makes every process rebuild on its next lookup.
+    """
+    with _local_lock:
+        _local_snapshots.clear()
+    try:
+        _redis().incr(GENERATION_KEY)
+    except Exception as e:
+        logger.warning(f"RBAC snapshot generation bump failed: {e}")
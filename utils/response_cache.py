@@ -0,0 +1,129 @@
+import time
+import hashlib
+import logging
+import threading
+from functools import wraps
+
+from flask import request, make_response
+from flask_jwt_extended import get_jwt_identity
+
+from config import response_cache_enabled, response_cache_ttl
+
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "http_cache"
+
+# user_id -> (expires_at, tenant_id)
+_tenants = {}
+_tenants_lock = threading.Lock()
+
+
+def _redis():
+    from executors.extensions import redis_client
+    return redis_client
+
+
+def _version_key(resource):
+    return f"{KEY_PREFIX}:version:{resource}"
+
+
+def _caller_tenant():
+    """tenant_id of the JWT user (cached in-process for response_cache_ttl)."""
+    try:
+        user_id = get_jwt_identity()
+    except RuntimeError:
+        # View without @jwt_required()
+        user_id = None
+    if not user_id:
+        return "-"
+    now = time.monotonic()
+    cached = _tenants.get(user_id)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    from executors.extensions import db
+    from executors.models import DefUser
+
+    tenant_id = db.session.query(DefUser.tenant_id).filter_by(user_id=user_id).scalar()
+    with _tenants_lock:
+        _tenants[user_id] = (now + response_cache_ttl, tenant_id)
+    return tenant_id
+
+
+def _request_digest():
+    parts = [request.endpoint or request.path]
+    parts += [f"{name}={value}" for name, value in sorted((request.view_args or {}).items())]
+    parts += [f"{name}={value}" for name, value in sorted(request.args.items(multi=True))]
+    return hashlib.sha1("&".join(map(str, parts)).encode()).hexdigest()
+
+
+def _conditional(response, etag):
+    # Clients keep the body but revalidate it with If-None-Match every time
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+def cached_response(resource, ttl=None):
+    """
+    Cache successful GET responses in Redis, per endpoint, arguments and
+    caller tenant, with an ETag. A matching If-None-Match gets a 304.
+
+    resource names the version counter that invalidate_responses() bumps
+    from the write handlers; entries of older versions are never read
+    again and expire with their TTL. Goes under @jwt_required(). Redis
+    errors fall through to the view.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not response_cache_enabled or request.method != "GET":
+                return fn(*args, **kwargs)
+
+            key = None
+            try:
+                client = _redis()
+                # Read the version before running the view: a write that lands in between
+                # bumps it, so a body built from old data goes under a key nobody reads
+                version = client.get(_version_key(resource)) or "0"
+                key = f"{KEY_PREFIX}:{resource}:{version}:{_caller_tenant()}:{_request_digest()}"
+                cached = client.hgetall(key)
+                if cached:
+                    response = make_response(cached["body"], int(cached["status"]))
+                    response.mimetype = cached["mimetype"]
+                    return _conditional(response, cached["etag"])
+            except Exception as e:
+                logger.warning(f"Response cache read failed for {resource}: {e}")
+
+            response = make_response(fn(*args, **kwargs))
+            if key is None or response.status_code != 200 or response.is_streamed:
+                return response
+
+            body = response.get_data(as_text=True)
+            etag = hashlib.sha1(response.get_data()).hexdigest()
+            try:
+                with _redis().pipeline(transaction=True) as pipe:
+                    pipe.hset(key, mapping={"body": body, "status": response.status_code,
+                                            "mimetype": response.mimetype, "etag": etag})
+                    pipe.expire(key, ttl or response_cache_ttl)
+                    pipe.execute()
+            except Exception as e:
+                logger.warning(f"Response cache write failed for {resource}: {e}")
+
+            return _conditional(response, etag)
+
+        return wrapper
+    return decorator
+
+
+def invalidate_responses(*resources):
+    """Drop the cached responses of these resources after a write."""
+    try:
+        with _redis().pipeline(transaction=False) as pipe:
+            for resource in resources:
+                pipe.incr(_version_key(resource))
+            pipe.execute()
+    except Exception as e:
+        logger.warning(f"Response cache invalidation failed for {', '.join(resources)}: {e}")
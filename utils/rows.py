@@ -0,0 +1,37 @@
+"""
+Core select() serialization for read-only, view-backed list endpoints.
+
+A RowSerializer is built once per model (module level, next to the
+endpoints). select() is a Core statement over the model's columns and
+dicts() turns the resulting Row tuples straight into the dicts model.json()
+returns, without creating ORM instances or filling the identity map.
+
+    USERS_VIEW_ROWS = RowSerializer(DefUsersView, isoformat=("date_of_birth",))
+    stmt = USERS_VIEW_ROWS.select().order_by(DefUsersView.user_id.desc())
+    items = USERS_VIEW_ROWS.dicts(db.session.execute(stmt))
+"""
+from sqlalchemy import inspect, select
+
+
+class RowSerializer:
+    def __init__(self, model, isoformat=()):
+        """isoformat: columns json() returns as value.isoformat() rather than the raw date/datetime."""
+        attrs = inspect(model).column_attrs
+        self.model = model
+        self.keys = tuple(attr.key for attr in attrs)
+        self.columns = {attr.key: getattr(model, attr.key) for attr in attrs}
+        self.isoformat = frozenset(isoformat)
+
+    def select(self, fields=None):
+        """Core select of the model's columns, or only `fields` (see utils.projection.requested_fields)."""
+        return select(*[self.columns[key] for key in (fields or self.keys)])
+
+    def dicts(self, rows, fields=None):
+        """Rows of select(fields) as dicts; pass the same fields."""
+        keys = tuple(fields or self.keys)
+        items = [dict(zip(keys, row)) for row in rows]
+        for key in self.isoformat.intersection(keys):
+            for item in items:
+                if item[key] is not None:
+                    item[key] = item[key].isoformat()
+        return items
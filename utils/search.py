@@ -0,0 +1,48 @@
+from sqlalchemy import func, or_
+
+
+def normalize_search(term):
+    """
+    Lower-case the search term and treat '_' and ' ' as the same character,
+    the same way normalized_column() folds the column. LIKE wildcards typed
+    by the user are escaped so they match literally.
+    """
+    term = (term or '').strip().lower().replace('_', ' ')
+    return term.replace('\\', '\\\\').replace('%', '\\%')
+
+
+def normalized_column(column):
+    """
+    lower(replace(column, '_', ' ')) — must stay identical to the expression
+    in migrations/002_trigram_search_indexes.sql or the GIN index is not used.
+    """
+    return func.lower(func.replace(column, '_', ' '))
+
+
+def search_filter(term, *columns):
+    """
+    Single substring match per column against the pg_trgm-indexed normalized
+    expression, replacing the old ilike(q) / ilike(q_underscored) /
+    ilike(q spaced) trio. Returns None for an empty term so callers can skip
+    the filter.
+
+        condition = search_filter(request.args.get('task_name'), DefAsyncTask.user_task_name)
+        if condition is not None:
+            query = query.filter(condition)
+
+    Terms shorter than three characters have no trigrams and fall back to a
+    scan, which is fine for that selectivity.
+    """
+    normalized = normalize_search(term)
+    if not normalized:
+        return None
+
+    pattern = f'%{normalized}%'
+    conditions = [normalized_column(column).like(pattern, escape='\\') for column in columns]
+    return conditions[0] if len(conditions) == 1 else or_(*conditions)
+
+
+def apply_search(query, term, *columns):
+    """query.filter(search_filter(...)) when a term was given, else query unchanged."""
+    condition = search_filter(term, *columns)
+    return query if condition is None else query.filter(condition)